@@ -35,11 +35,84 @@ GLOBAL_CONFIG = {
     'file_system_poll_wait_seconds': float(
         os.getenv('FILE_SYSTEM_POLL_WAIT_SECONDS', 1)),
     'mapping_config_filename': 'mapping_config.json',
+    'warmup_data_filename': 'warmup_data.npz',
     'rest_requests_queue_size': os.getenv('REST_REQUESTS_QUEUE_SIZE', 100),
     'engine_requests_queue_size': os.getenv('ENGINE_REQUESTS_QUEUE_SIZE',
                                             None),
     'engine_requests_queue_timeout': os.getenv(
         'ENGINE_REQUESTS_QUEUE_TIMEOUT', 5),
+    # Number of executable networks, loaded for different input shapes,
+    # kept in memory by each model version and their memory budget in MB
+    # (0 - unlimited)
+    'network_cache_size': int(os.getenv('NETWORK_CACHE_SIZE', 1)),
+    'network_cache_memory_budget': int(os.getenv(
+        'NETWORK_CACHE_MEMORY_BUDGET_MB', 0)) * 1024 ** 2,
+    # Number of priority lanes in engine requests queues, their scheduling
+    # policy (strict or weighted), comma separated lanes weights and
+    # priority of requests without priority specified (0 - the highest)
+    'requests_priority_lanes': int(os.getenv('REQUESTS_PRIORITY_LANES', 1)),
+    'requests_priority_scheduling': os.getenv(
+        'REQUESTS_PRIORITY_SCHEDULING', 'strict'),
+    'requests_priority_weights': os.getenv('REQUESTS_PRIORITY_WEIGHTS',
+                                           None),
+    'requests_default_priority': int(os.getenv('REQUESTS_DEFAULT_PRIORITY',
+                                               0)),
+    # Path of the json file, where results of nireq and CPU streams
+    # autotuning are stored for later starts (None - not stored)
+    'autotune_results_path': os.getenv('AUTOTUNE_RESULTS_PATH', None),
+    # Directory where compiled networks are exported and imported from on
+    # the following loads of the same model (None - cache disabled)
+    'compiled_network_cache_dir': os.getenv('COMPILED_NETWORK_CACHE_DIR',
+                                            None),
+    # Number of inference engines of all models and versions loaded in
+    # parallel and minimal available memory in MB required to start loading
+    # another engine (0 - no limit)
+    'engines_loading_workers': int(os.getenv('ENGINES_LOADING_WORKERS', 4)),
+    'engines_loading_min_free_memory': int(os.getenv(
+        'ENGINES_LOADING_MIN_FREE_MEMORY_MB', 0)) * 1024 ** 2,
+    # Estimated memory in MB available for inference engines of all models.
+    # Least recently used idle versions are unloaded when it's exceeded
+    # and loaded again on the next request (0 - unlimited)
+    'engines_memory_budget': int(os.getenv(
+        'ENGINES_MEMORY_BUDGET_MB', 0)) * 1024 ** 2,
+    # Number of models updated in parallel, random jitter of update
+    # intervals as a fraction of the interval and maximal interval in
+    # seconds after consecutive update failures
+    'models_update_workers': int(os.getenv('MODELS_UPDATE_WORKERS', 4)),
+    'models_update_jitter': float(os.getenv('MODELS_UPDATE_JITTER', 0.1)),
+    'models_update_max_backoff_seconds': float(os.getenv(
+        'MODELS_UPDATE_MAX_BACKOFF_SECONDS', 300)),
+    # Local model directories are watched with inotify (0 - polled).
+    # Watching is enabled only on request, since changes on network file
+    # systems like NFS are not reported.
+    # Changes are detected when no more events come for debounce seconds.
+    # Watched models are listed in full every rescan seconds, to catch
+    # changes not reported by the file system, e.g. made on other NFS
+    # clients (0 - never).
+    'local_models_watch': bool(int(os.getenv('LOCAL_MODELS_WATCH', 0))),
+    'local_models_watch_debounce_seconds': float(os.getenv(
+        'LOCAL_MODELS_WATCH_DEBOUNCE_SECONDS', 1)),
+    'local_models_rescan_seconds': float(os.getenv(
+        'LOCAL_MODELS_RESCAN_SECONDS', 60)),
+    # Directory where files of S3 and GCS models are cached between loads
+    # and restarts (None - cache disabled) and its size limit in MB. Least
+    # recently used files are removed when it's exceeded (0 - unlimited).
+    'artifact_cache_dir': os.getenv('ARTIFACT_CACHE_DIR', None),
+    'artifact_cache_size': int(os.getenv(
+        'ARTIFACT_CACHE_SIZE_MB', 0)) * 1024 ** 2,
+    # Files of S3 and GCS models are downloaded in parts of that size in MB
+    # with the number of concurrent requests per file
+    'download_part_size': int(os.getenv(
+        'DOWNLOAD_PART_SIZE_MB', 16)) * 1024 ** 2,
+    'download_concurrency': int(os.getenv('DOWNLOAD_CONCURRENCY', 8)),
+    # Name of the manifest file at the root of S3 and GCS models, read
+    # instead of listing the model directory when it's found (None -
+    # directories are always listed)
+    'models_manifest_filename': os.getenv('MODELS_MANIFEST_FILENAME', None),
+    # Maximal time in seconds to wait for inferences in progress before
+    # unloading model version (None - no limit)
+    'engine_suppress_timeout': float(os.getenv('ENGINE_SUPPRESS_TIMEOUT'))
+    if os.getenv('ENGINE_SUPPRESS_TIMEOUT') else None,
 
     # SERIALIZATION_FUNCTION option indicates which function should be
     # used to serialize the inference results
@@ -57,4 +130,12 @@ S3_CONFIG = {
     'signature': os.environ.get('S3_SIGNATURE', None),
     'access_key_id': os.environ.get('AWS_ACCESS_KEY_ID', 'default'),
     'secret_access_key': os.environ.get('AWS_SECRET_ACCESS_KEY', 'default'),
+    # Maximal number of connections to the endpoint kept open
+    'max_pool_connections': int(os.environ.get('S3_MAX_POOL_CONNECTIONS',
+                                               10)),
+    # Enables verification of downloaded files with ETags of objects
+    # uploaded in a single part as MD5 checksums. Disabled by default,
+    # ETags of objects encrypted with SSE-KMS or SSE-C are not checksums.
+    'verify_etag_checksum': bool(int(os.environ.get(
+        'S3_VERIFY_ETAG_CHECKSUM', 0))),
 }
@@ -16,12 +16,22 @@
 
 import argparse
 import json
+import signal
 import sys
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 
 from ie_serving.config import GLOBAL_CONFIG
+from ie_serving.models.loading_model import LoadingModel
+from ie_serving.models.local_repository_watcher import \
+    local_repository_watcher
 from ie_serving.models.model_builder import ModelBuilder
-from ie_serving.schemas import models_config_schema
+from ie_serving.models.update_scheduler import update_scheduler
+from ie_serving.schemas import models_config_schema, \
+    dynamic_batching_schema, shape_buckets_schema, batch_size_pool_schema, \
+    batch_sharding_schema, admission_control_schema, autotune_schema, \
+    lazy_loading_schema, warmup_schema
 from ie_serving.server.constants import CONFLICTING_PARAMS_WARNING
 from ie_serving.server.start import serve as start_server
 from ie_serving.logger import get_logger, LOGGER_LVL
@@ -67,6 +77,14 @@ def get_model_spec(config):
 
     target_device = config.get('target_device', 'CPU')
     plugin_config = config.get('plugin_config', None)
+    dynamic_batching = config.get('dynamic_batching', None)
+    shape_buckets = config.get('shape_buckets', None)
+    batch_size_pool = config.get('batch_size_pool', None)
+    batch_sharding = config.get('batch_sharding', None)
+    admission_control = config.get('admission_control', None)
+    autotune = config.get('autotune', None)
+    lazy_loading = config.get('lazy_loading', None)
+    warmup = config.get('warmup', None)
 
     model_spec = {
         'model_name': model_name,
@@ -76,36 +94,97 @@ def get_model_spec(config):
         'model_version_policy': model_ver_policy,
         'num_ireq': num_ireq,
         'target_device': target_device,
-        'plugin_config': plugin_config
+        'plugin_config': plugin_config,
+        'dynamic_batching': dynamic_batching,
+        'shape_buckets': shape_buckets,
+        'batch_size_pool': batch_size_pool,
+        'batch_sharding': batch_sharding,
+        'admission_control': admission_control,
+        'autotune': autotune,
+        'lazy_loading': lazy_loading,
+        'warmup': warmup
     }
     return model_spec
 
 
+def watch_local_model(model_name, model_directory):
+    # Local models are updated when changes in their directories are
+    # reported, instead of listing them periodically
+    if GLOBAL_CONFIG['local_models_watch'] and \
+            urlparse(model_directory).scheme == '' and \
+            local_repository_watcher.watch(model_name, model_directory):
+        update_scheduler.set_watched(model_name)
+
+
+def build_model(models, config):
+    # Replaces the placeholder of the loading model with the built model,
+    # so it's served as soon as it's ready
+    model_name = config['config']['name']
+    model = None
+    try:
+        model_spec = get_model_spec(config['config'])
+        model = ModelBuilder.build(**model_spec)
+    except ValidationError as e_val:
+        logger.warning("Model version policy or plugin config "
+                       "for model {} is invalid. "
+                       "Exception: {}".format(model_name, e_val))
+    except Exception as e:
+        logger.warning("Unexpected error occurred in {} model. "
+                       "Exception: {}".format(model_name, e))
+    if model is not None:
+        models[model_name] = model
+        watch_local_model(model_name, config['config']['base_path'])
+        logger.info("Model {} is ready to serve".format(model_name))
+    else:
+        models.pop(model_name, None)
+
+
+def load_models(models, model_configs):
+    # Models are loaded in groups of the same load priority, starting from
+    # the highest one (0). Models in the group are built in parallel,
+    # their versions are loaded on the engines loading pool, which limits
+    # the number of concurrent loads.
+    load_priorities = sorted(set(config['config'].get('load_priority', 0)
+                                 for config in model_configs))
+    for load_priority in load_priorities:
+        group_configs = [config for config in model_configs if
+                         config['config'].get('load_priority', 0) ==
+                         load_priority]
+        logger.info("Loading models with load priority {}: {}".format(
+            load_priority, [config['config']['name'] for config in
+                            group_configs]))
+        with ThreadPoolExecutor(max_workers=len(group_configs)) as executor:
+            for config in group_configs:
+                executor.submit(build_model, models, config)
+    if not models:
+        logger.info("Could not access any of provided models. Server will "
+                    "exit now.")
+        # Interrupts the main thread, which is serving the requests
+        os.kill(os.getpid(), signal.SIGINT)
+
+
 def parse_config(args):
     set_engine_requests_queue_size(args)
     configs = open_config(path=args.config_path)
     validate(configs, models_config_schema)
-    models = {}
-    for config in configs['model_config_list']:
-        try:
-            model_spec = get_model_spec(config['config'])
-
-            model = ModelBuilder.build(**model_spec)
-            if model is not None:
-                models[config['config']['name']] = model
-        except ValidationError as e_val:
-            logger.warning("Model version policy or plugin config "
-                           "for model {} is invalid. "
-                           "Exception: {}".format(config['config']['name'],
-                                                  e_val))
-        except Exception as e:
-            logger.warning("Unexpected error occurred in {} model. "
-                           "Exception: {}".format(config['config']['name'],
-                                                  e))
-    if not models:
+    model_configs = configs['model_config_list']
+    if not model_configs:
         logger.info("Could not access any of provided models. Server will "
                     "exit now.")
         sys.exit()
+    # Servers are started before the models are loaded. Models are
+    # represented by placeholders reporting LOADING status until they're
+    # ready, models which fail to load are removed.
+    models = {config['config']['name']: LoadingModel(config['config']['name'])
+              for config in model_configs}
+    for config in model_configs:
+        update_scheduler.set_interval(
+            config['config']['name'],
+            config['config'].get('update_interval_s', None))
+    loading_thread = threading.Thread(target=load_models,
+                                      args=[models, model_configs])
+    loading_thread.setDaemon(True)
+    loading_thread.start()
     if args.rest_port > 0:
         process_thread = threading.Thread(target=start_web_rest_server,
                                           args=[models, args.rest_port,
@@ -121,17 +200,45 @@ def parse_one_model(args):
         args.model_version_policy = json.loads(args.model_version_policy)
         if args.plugin_config is not None:
             args.plugin_config = json.loads(args.plugin_config)
+        if args.dynamic_batching is not None:
+            args.dynamic_batching = json.loads(args.dynamic_batching)
+            validate(args.dynamic_batching, dynamic_batching_schema)
+        if args.shape_buckets is not None:
+            args.shape_buckets = json.loads(args.shape_buckets)
+            validate(args.shape_buckets, shape_buckets_schema)
+        if args.batch_size_pool is not None:
+            args.batch_size_pool = json.loads(args.batch_size_pool)
+            validate(args.batch_size_pool, batch_size_pool_schema)
+        if args.batch_sharding is not None:
+            args.batch_sharding = json.loads(args.batch_sharding)
+            validate(args.batch_sharding, batch_sharding_schema)
+        if args.admission_control is not None:
+            args.admission_control = json.loads(args.admission_control)
+            validate(args.admission_control, admission_control_schema)
+        if args.autotune is not None:
+            args.autotune = json.loads(args.autotune)
+            validate(args.autotune, autotune_schema)
+        if args.lazy_loading is not None:
+            args.lazy_loading = json.loads(args.lazy_loading)
+            validate(args.lazy_loading, lazy_loading_schema)
+        if args.warmup is not None:
+            args.warmup = json.loads(args.warmup)
+            validate(args.warmup, warmup_schema)
 
         model_spec = get_model_spec(vars(args))
 
         model = ModelBuilder.build(**model_spec)
     except ValidationError as e_val:
-        logger.error("Model version policy or plugin config is invalid. "
+        logger.error("Model version policy, plugin config or other "
+                     "model parameters are invalid. "
                      "Exception: {}".format(e_val))
         sys.exit()
     except json.decoder.JSONDecodeError as e_json:
-        logger.error("model_version_policy and plugin_config fields must be "
-                     "in json format. "
+        logger.error("model_version_policy, plugin_config, "
+                     "dynamic_batching, shape_buckets, batch_size_pool, "
+                     "batch_sharding, admission_control, autotune, "
+                     "lazy_loading and warmup fields must be in json "
+                     "format. "
                      "Exception: {}".format(e_json))
         sys.exit()
     except Exception as e:
@@ -141,6 +248,7 @@ def parse_one_model(args):
     models = {}
     if model is not None:
         models[args.model_name] = model
+        watch_local_model(args.model_name, args.model_path)
     else:
         logger.info("Could not access provided model. Server will exit now.")
         sys.exit()
@@ -234,6 +342,59 @@ def main():
                                ' their values',
                           required=False,
                           default=None)
+    parser_b.add_argument('--dynamic_batching', type=str,
+                          help='Enables merging of concurrent requests into '
+                               'a single inference. A dictionary with '
+                               'max_batch_size and max_delay_ms keys',
+                          required=False,
+                          default=None)
+    parser_b.add_argument('--shape_buckets', type=str,
+                          help='List of shapes the network is loaded with '
+                               'at start. With shape set to auto, inputs '
+                               'are padded to the smallest matching shape',
+                          required=False,
+                          default=None)
+    parser_b.add_argument('--batch_size_pool', type=str,
+                          help='List of batch sizes the network is loaded '
+                               'with at start. With batch_size set to auto, '
+                               'requests are padded to the smallest matching '
+                               'batch size or split',
+                          required=False,
+                          default=None)
+    parser_b.add_argument('--batch_sharding', type=str,
+                          help='Enables splitting of large batches across '
+                               'parallel inference requests. A dictionary '
+                               'with max_shards and min_shard_size keys',
+                          required=False,
+                          default=None)
+    parser_b.add_argument('--admission_control', type=str,
+                          help='Enables rejecting requests when the model '
+                               'is overloaded. A dictionary with '
+                               'max_queue_depth and max_estimated_wait_ms '
+                               'keys',
+                          required=False,
+                          default=None)
+    parser_b.add_argument('--autotune', type=str,
+                          help='Enables selection of nireq and CPU streams '
+                               'with a benchmark at model load. A '
+                               'dictionary with objective, nireq, streams '
+                               'and duration_ms keys',
+                          required=False,
+                          default=None)
+
+    parser_b.add_argument('--lazy_loading', type=str,
+                          help='Enables loading of model versions on the '
+                               'first request and unloading them when '
+                               'idle. A dictionary with idle_timeout_s key',
+                          required=False,
+                          default=None)
+
+    parser_b.add_argument('--warmup', type=str,
+                          help='Enables warmup inferences before the model '
+                               'version becomes available. A dictionary '
+                               'with data and iterations keys',
+                          required=False,
+                          default=None)
 
     parser_b.set_defaults(func=parse_one_model)
     args = parser.parse_args()
@@ -0,0 +1,83 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import math
+
+# Weight of the latest observation in the inference time moving average
+INFERENCE_TIME_SMOOTHING = 0.1
+
+
+class AdmissionControl:
+
+    def __init__(self, admission_control_param, num_ireq=1):
+        # admission_control_param is either None (all requests admitted) or
+        # a dictionary with max_queue_depth and max_estimated_wait_ms keys
+        self.max_queue_depth = None
+        self.max_estimated_wait = None
+        if admission_control_param is not None:
+            self.max_queue_depth = admission_control_param.get(
+                'max_queue_depth', None)
+            max_estimated_wait_ms = admission_control_param.get(
+                'max_estimated_wait_ms', None)
+            if max_estimated_wait_ms is not None:
+                # Wait is stored in seconds, as the inference time
+                self.max_estimated_wait = float(max_estimated_wait_ms) / 1000
+        self.num_ireq = num_ireq
+        # Exponential moving average of inference execution time in seconds
+        self.inference_time = None
+
+    @property
+    def enabled(self):
+        return self.max_queue_depth is not None or \
+            self.max_estimated_wait is not None
+
+    def record_inference_time(self, duration: float):
+        if self.inference_time is None:
+            self.inference_time = duration
+        else:
+            self.inference_time += INFERENCE_TIME_SMOOTHING * (
+                duration - self.inference_time)
+
+    def estimate_wait(self, queue_depth: int):
+        # Estimated time before the new request is taken for execution,
+        # assuming queued requests are executed on all infer requests
+        if self.inference_time is None:
+            return 0.0
+        return queue_depth / self.num_ireq * self.inference_time
+
+    def check(self, queue_depth: int):
+        # Returns error message and retry after hint in seconds if the
+        # request should be rejected, None, None otherwise
+        if self.max_queue_depth is not None and \
+                queue_depth >= self.max_queue_depth:
+            excess_wait = self.estimate_wait(
+                queue_depth - self.max_queue_depth + 1)
+            return "Requests queue depth {} reached the limit of {}".format(
+                queue_depth, self.max_queue_depth), \
+                self.get_retry_after(excess_wait)
+        estimated_wait = self.estimate_wait(queue_depth)
+        if self.max_estimated_wait is not None and \
+                estimated_wait > self.max_estimated_wait:
+            return "Estimated queue wait {:.0f} ms exceeds the limit of " \
+                   "{:.0f} ms".format(estimated_wait * 1000,
+                                      self.max_estimated_wait * 1000), \
+                self.get_retry_after(estimated_wait -
+                                     self.max_estimated_wait)
+        return None, None
+
+    @staticmethod
+    def get_retry_after(excess_wait: float):
+        # Retry after hint is rounded up to full seconds
+        return max(int(math.ceil(excess_wait)), 1)
@@ -0,0 +1,211 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ie_serving.config import GLOBAL_CONFIG
+from ie_serving.logger import get_logger
+
+logger = get_logger(__name__)
+
+PARTIAL_DOWNLOAD_SUFFIX = '.part'
+# Partial downloads not modified for that long are left by interrupted
+# downloads, e.g. after the server was killed, and are removed
+STALE_DOWNLOAD_SECONDS = 3600
+
+
+class ArtifactCache:
+    # Keeps files of remote models downloaded to the local disk, so that
+    # the following loads of unchanged objects, also after a restart of the
+    # server, read them from the disk. Files are identified by the object
+    # path and ETag, least recently used ones are removed when the size
+    # limit is exceeded. Shared by S3 and GCS models.
+    def __init__(self, cache_dir, max_size):
+        self.enabled = cache_dir is not None
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        # Each object is downloaded once when loaded by many versions
+        # in parallel, files in use are never evicted
+        self.download_locks = {}
+        self.in_use = {}
+        # Directories of files which are not cached, removed on release
+        self.temporary_directories = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.download_time = 0.0
+
+    def get_path(self, path, etag):
+        # File name ends with the object name, so its extension is kept
+        key = hashlib.sha256(json.dumps([path, etag]).encode()).hexdigest()
+        return os.path.join(self.cache_dir,
+                            key + '-' + os.path.basename(path))
+
+    def fetch(self, path, etag, download):
+        # Returns local path of the remote object, download(path, local_path)
+        # is called when it's not cached. Objects without ETag or with the
+        # cache disabled are downloaded to unique temporary directories.
+        # Each fetched path has to be released after use.
+        if path is None:
+            return None
+        if not self.enabled or etag is None:
+            temporary_directory = tempfile.mkdtemp()
+            with self.lock:
+                self.temporary_directories.add(temporary_directory)
+            local_path = os.path.join(temporary_directory,
+                                      os.path.basename(path))
+            try:
+                download(path, local_path)
+            except Exception:
+                self.release(local_path)
+                raise
+            return local_path
+
+        local_path = self.get_path(path, etag)
+        with self.lock:
+            download_lock = self.download_locks.setdefault(
+                local_path, threading.Lock())
+            self.in_use[local_path] = self.in_use.get(local_path, 0) + 1
+        try:
+            with download_lock:
+                if os.path.isfile(local_path):
+                    # Modification time orders files for the eviction
+                    os.utime(local_path)
+                    with self.lock:
+                        self.hits += 1
+                    logger.info("Using cached file of {}".format(path))
+                else:
+                    self._download(path, local_path, download)
+            self.evict()
+        except Exception:
+            self.release(local_path)
+            raise
+        return local_path
+
+    def fetch_all(self, objects, download):
+        # Fetches (path, etag) objects concurrently and returns their local
+        # paths. When any of them fails, all fetched paths are released.
+        with ThreadPoolExecutor(max_workers=len(objects)) as executor:
+            futures = [executor.submit(self.fetch, path, etag, download)
+                       for path, etag in objects]
+        local_paths = []
+        error = None
+        for future in futures:
+            try:
+                local_paths.append(future.result())
+            except Exception as e:
+                error = e
+        if error is not None:
+            for local_path in local_paths:
+                self.release(local_path)
+            raise error
+        return local_paths
+
+    def _download(self, path, local_path, download):
+        # Download is done to a temporary file, so a partially downloaded
+        # object is never used, also after a restart
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = "{}.{}{}".format(local_path, threading.get_ident(),
+                                    PARTIAL_DOWNLOAD_SUFFIX)
+        start_time = time.time()
+        try:
+            download(path, tmp_path)
+            os.replace(tmp_path, local_path)
+        finally:
+            if os.path.isfile(tmp_path):
+                os.remove(tmp_path)
+        download_time = time.time() - start_time
+        with self.lock:
+            self.misses += 1
+            self.download_time += download_time
+        logger.info("Downloaded {} to the cache in {:.3f} s".format(
+            path, download_time))
+
+    def release(self, local_path):
+        # Cached files are kept, temporary directories are removed. Paths
+        # which are not in use, e.g. released already, are ignored.
+        if local_path is None:
+            return
+        temporary_directory = os.path.dirname(local_path)
+        with self.lock:
+            if local_path in self.in_use:
+                self.in_use[local_path] -= 1
+                if self.in_use[local_path] == 0:
+                    del self.in_use[local_path]
+                return
+            if temporary_directory not in self.temporary_directories:
+                return
+            self.temporary_directories.discard(temporary_directory)
+        shutil.rmtree(temporary_directory, ignore_errors=True)
+
+    def evict(self):
+        # Removes least recently used files, which are not in use, until
+        # the cache fits in the size limit (0 - unlimited)
+        with self.lock:
+            files = []
+            size = 0
+            for entry in os.scandir(self.cache_dir):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # Partial download renamed in the meantime
+                    continue
+                if entry.name.endswith(PARTIAL_DOWNLOAD_SUFFIX):
+                    if time.time() - stat.st_mtime > STALE_DOWNLOAD_SECONDS:
+                        self._remove(entry.path)
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+                size += stat.st_size
+            if not self.max_size or size <= self.max_size:
+                return
+            for _, file_size, file_path in sorted(files):
+                if file_path in self.in_use:
+                    continue
+                if self._remove(file_path):
+                    size -= file_size
+                    self.evictions += 1
+                    self.download_locks.pop(file_path, None)
+                    logger.info("Evicted {} from the cache".format(
+                        file_path))
+                if size <= self.max_size:
+                    break
+
+    @staticmethod
+    def _remove(file_path):
+        try:
+            os.remove(file_path)
+            return True
+        except OSError as e:
+            logger.warning("Error occurred while removing {} from the "
+                           "cache: {}".format(file_path, e))
+            return False
+
+    def get_stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions,
+                    'download_time': self.download_time}
+
+
+artifact_cache = ArtifactCache(GLOBAL_CONFIG['artifact_cache_dir'],
+                               GLOBAL_CONFIG['artifact_cache_size'])
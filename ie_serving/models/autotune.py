@@ -0,0 +1,190 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from ie_serving.config import GLOBAL_CONFIG
+from ie_serving.logger import get_logger
+from ie_serving.models.executable_network_cache import get_shape_signature
+from ie_serving.models.warmup import generate_inputs, RANDOM
+
+logger = get_logger(__name__)
+
+LATENCY = 'latency'
+THROUGHPUT = 'throughput'
+STREAMS_KEY = 'CPU_THROUGHPUT_STREAMS'
+DEFAULT_NIREQ_VALUES = [1, 2, 4, 8]
+DEFAULT_STREAMS_VALUES = [1, 2, 4]
+
+# Results file is shared by all models, which can be loaded in parallel
+results_file_lock = threading.Lock()
+
+
+class AutotuneInfo:
+    def __init__(self, autotune_param, target_device):
+        # autotune_param is either None (feature disabled) or a dictionary
+        # with objective, nireq, streams and duration_ms keys. Streams are
+        # tuned only on CPU device.
+        self.enabled = autotune_param is not None
+        self.objective = THROUGHPUT
+        self.nireq_values = DEFAULT_NIREQ_VALUES
+        self.streams_values = [None]
+        self.duration = 1.0
+        if autotune_param is not None:
+            self.objective = autotune_param.get('objective', THROUGHPUT)
+            self.nireq_values = autotune_param.get('nireq',
+                                                   DEFAULT_NIREQ_VALUES)
+            if target_device == 'CPU':
+                self.streams_values = autotune_param.get(
+                    'streams', DEFAULT_STREAMS_VALUES)
+            # Duration is stored in seconds
+            self.duration = float(autotune_param.get('duration_ms',
+                                                     1000)) / 1000
+
+    def get_configurations(self):
+        return [{'nireq': nireq, 'streams': streams} for nireq in
+                self.nireq_values for streams in self.streams_values]
+
+    def select_best(self, results: list):
+        # Results are dictionaries with configuration, throughput and
+        # latency. The other metric is used to resolve ties.
+        if self.objective == LATENCY:
+            return min(results, key=lambda result: (result['latency'],
+                                                    -result['throughput']))
+        return max(results, key=lambda result: (result['throughput'],
+                                                -result['latency']))
+
+
+def get_plugin_config(plugin_config, streams):
+    if streams is None:
+        return plugin_config
+    plugin_config = dict(plugin_config or {})
+    plugin_config[STREAMS_KEY] = str(streams)
+    return plugin_config
+
+
+def run_benchmark(exec_net, inference_input, num_ireq, duration):
+    # Keeps all infer requests busy for the given duration. Returns
+    # throughput in inferences per second and median latency in ms.
+    latencies = []
+    start_time = time.time()
+    while time.time() - start_time < duration or not latencies:
+        round_start_time = time.time()
+        for ireq_index in range(num_ireq):
+            exec_net.requests[ireq_index].async_infer(inference_input)
+        for ireq_index in range(num_ireq):
+            exec_net.requests[ireq_index].wait(-1)
+            latencies.append((time.time() - round_start_time) * 1000)
+    throughput = len(latencies) / (time.time() - start_time)
+    return throughput, float(np.median(latencies))
+
+
+def get_autotune_key(ir_hash, net, target_device, plugin_config,
+                     autotune_info):
+    key_data = [ir_hash, get_shape_signature(net), target_device,
+                plugin_config, autotune_info.objective,
+                autotune_info.nireq_values, autotune_info.streams_values]
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()). \
+        hexdigest()
+
+
+def load_autotune_result(key):
+    results_path = GLOBAL_CONFIG['autotune_results_path']
+    if results_path is None or not os.path.isfile(results_path):
+        return None
+    try:
+        with results_file_lock, open(results_path, 'r') as f:
+            return json.load(f).get(key)
+    except Exception as e:
+        logger.warning("Error occurred while reading autotune results from "
+                       "{}: {}".format(results_path, e))
+    return None
+
+
+def save_autotune_result(key, result):
+    results_path = GLOBAL_CONFIG['autotune_results_path']
+    if results_path is None:
+        return
+    try:
+        with results_file_lock:
+            results = {}
+            if os.path.isfile(results_path):
+                with open(results_path, 'r') as f:
+                    results = json.load(f)
+            results[key] = result
+            tmp_path = results_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(results, f, indent=2)
+            os.replace(tmp_path, results_path)
+    except Exception as e:
+        logger.warning("Error occurred while saving autotune results to "
+                       "{}: {}".format(results_path, e))
+
+
+def run_autotune(model_name, model_version, plugin, net, ir_hash, num_ireq,
+                 target_device, plugin_config, autotune_info):
+    # Returns num_ireq and plugin_config of the best configuration for
+    # the objective. Results are reused for the same IR, shapes and device.
+    key = get_autotune_key(ir_hash, net, target_device, plugin_config,
+                           autotune_info)
+    result = load_autotune_result(key)
+    if result is not None:
+        logger.info("[Model: {}, version: {}] --- Using stored autotune "
+                    "result: {}".format(model_name, model_version, result))
+        return result['nireq'], get_plugin_config(plugin_config,
+                                                  result['streams'])
+    inference_input = generate_inputs(net, RANDOM)
+    results = []
+    for configuration in autotune_info.get_configurations():
+        try:
+            exec_net = plugin.load(
+                network=net, num_requests=configuration['nireq'],
+                config=get_plugin_config(plugin_config,
+                                         configuration['streams']))
+            throughput, latency = run_benchmark(
+                exec_net, inference_input, configuration['nireq'],
+                autotune_info.duration)
+            del exec_net
+        except Exception as e:
+            logger.warning("[Model: {}, version: {}] --- Autotune "
+                           "configuration {} failed: {}".format(
+                               model_name, model_version, configuration, e))
+            continue
+        logger.info("[Model: {}, version: {}] --- Autotune: nireq {}, "
+                    "streams {} - throughput {:.1f} inferences/s, latency "
+                    "{:.1f} ms".format(model_name, model_version,
+                                       configuration['nireq'],
+                                       configuration['streams'],
+                                       throughput, latency))
+        results.append(dict(configuration, throughput=throughput,
+                            latency=latency))
+    if not results:
+        logger.warning("[Model: {}, version: {}] --- Autotune failed, using "
+                       "configured nireq and plugin config".format(
+                           model_name, model_version))
+        return num_ireq, plugin_config
+    result = autotune_info.select_best(results)
+    logger.info("[Model: {}, version: {}] --- Autotune selected for {}: "
+                "{}".format(model_name, model_version,
+                            autotune_info.objective, result))
+    save_autotune_result(key, result)
+    return result['nireq'], get_plugin_config(plugin_config,
+                                              result['streams'])
@@ -0,0 +1,106 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import hashlib
+import json
+import os
+import threading
+
+from ie_serving.config import GLOBAL_CONFIG
+from ie_serving.logger import get_logger
+
+logger = get_logger(__name__)
+
+BLOB_EXTENSION = '.blob'
+
+
+class CompiledNetworkCache:
+    # Keeps executable networks exported to files, so that the following
+    # loads of the same network import them instead of compiling the IR.
+    # Shared by all models, statistics are collected for the whole server.
+    def __init__(self, cache_dir):
+        self.enabled = cache_dir is not None
+        self.cache_dir = cache_dir
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.import_time = 0.0
+        self.compile_time = 0.0
+        # Devices which do not support export of executable networks
+        self.export_unsupported_devices = set()
+
+    def get_blob_path(self, ir_hash, target_device, plugin_config,
+                      shape_signature):
+        # Shape signature includes the batch size, number of infer requests
+        # is passed on import so it's not a part of the key
+        key_data = [ir_hash, target_device, plugin_config,
+                    [list(input_shape) for input_shape in shape_signature]]
+        key = hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()). \
+            hexdigest()
+        return os.path.join(self.cache_dir, key + BLOB_EXTENSION)
+
+    def find(self, blob_path):
+        if self.enabled and os.path.isfile(blob_path):
+            return blob_path
+        return None
+
+    def is_export_supported(self, target_device):
+        return self.enabled and \
+            target_device not in self.export_unsupported_devices
+
+    def record_hit(self, load_time):
+        with self.lock:
+            self.hits += 1
+            self.import_time += load_time
+
+    def record_miss(self, load_time):
+        with self.lock:
+            self.misses += 1
+            self.compile_time += load_time
+
+    def invalidate(self, blob_path):
+        # Removes the file which failed to import, e.g. exported by
+        # a different OpenVINO version
+        try:
+            os.remove(blob_path)
+        except OSError as e:
+            logger.warning("Error occurred while removing compiled network "
+                           "{} from the cache: {}".format(blob_path, e))
+
+    def save(self, exec_net, blob_path, target_device):
+        # Export is done to a temporary file, so a partially written file
+        # is never imported by other models or server instances
+        tmp_path = "{}.{}.tmp".format(blob_path, threading.get_ident())
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            exec_net.export(tmp_path)
+            os.replace(tmp_path, blob_path)
+        except Exception as e:
+            logger.warning("Exporting compiled network for {} device is not "
+                           "possible, the cache will not be used for this "
+                           "device: {}".format(target_device, e))
+            self.export_unsupported_devices.add(target_device)
+            if os.path.isfile(tmp_path):
+                os.remove(tmp_path)
+
+    def get_stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'import_time': self.import_time,
+                    'compile_time': self.compile_time}
+
+
+compiled_network_cache = CompiledNetworkCache(
+    GLOBAL_CONFIG['compiled_network_cache_dir'])
@@ -0,0 +1,83 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ie_serving.config import GLOBAL_CONFIG
+from ie_serving.logger import get_logger
+
+logger = get_logger(__name__)
+
+MEMINFO_PATH = '/proc/meminfo'
+MEMORY_CHECK_INTERVAL = 1.0
+
+
+def get_available_memory():
+    # Returns memory available for new processes in bytes or None if it
+    # cannot be determined
+    try:
+        with open(MEMINFO_PATH, 'r') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class EnginesLoadingPool:
+    # Bounded pool of workers loading inference engines of all models and
+    # versions in parallel. New loads are not started while available
+    # memory is below min_free_memory, unless no other load is in progress.
+    def __init__(self, max_workers, min_free_memory=0):
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='engines_loading')
+        self.min_free_memory = min_free_memory
+        self.loads_in_progress = 0
+        self.loads_condition = threading.Condition()
+
+    def submit(self, fn, *args, **kwargs):
+        return self.executor.submit(self._run, fn, *args, **kwargs)
+
+    def _run(self, fn, *args, **kwargs):
+        with self.loads_condition:
+            while not self._is_memory_available():
+                self.loads_condition.wait(MEMORY_CHECK_INTERVAL)
+            self.loads_in_progress += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self.loads_condition:
+                self.loads_in_progress -= 1
+                self.loads_condition.notify_all()
+
+    def _is_memory_available(self):
+        if not self.min_free_memory or self.loads_in_progress == 0:
+            return True
+        available_memory = get_available_memory()
+        if available_memory is None or \
+                available_memory >= self.min_free_memory:
+            return True
+        logger.debug("Loading of inference engine is postponed, available "
+                     "memory {} MB is below {} MB".format(
+                         available_memory // 1024 ** 2,
+                         self.min_free_memory // 1024 ** 2))
+        return False
+
+
+engines_loading_pool = EnginesLoadingPool(
+    max_workers=GLOBAL_CONFIG['engines_loading_workers'],
+    min_free_memory=GLOBAL_CONFIG['engines_loading_min_free_memory'])
@@ -0,0 +1,138 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import functools
+import threading
+import time
+from collections import OrderedDict, deque
+
+from ie_serving.config import GLOBAL_CONFIG
+from ie_serving.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Number of the most recent evictions reported in the registry stats
+EVICTIONS_HISTORY_SIZE = 20
+
+
+class EnginesRegistry:
+    # Process-wide registry of loaded inference engines of all models.
+    # Accounts estimated memory usage of the engines and unloads the least
+    # recently used idle versions when memory_budget (in bytes, 0 means
+    # unlimited) is exceeded. Versions are unloaded with callbacks provided
+    # on registration, which return True if the version was idle and has
+    # been unloaded. Last use of the versions is read from the callbacks
+    # provided on registration, so requests don't take the registry lock.
+    def __init__(self, memory_budget: int = 0):
+        self.memory_budget = memory_budget
+        self.engines = OrderedDict()
+        # Memory usage of unloaded versions, used to estimate memory needed
+        # to load them again
+        self.last_memory_usage = {}
+        self.evictions = deque(maxlen=EVICTIONS_HISTORY_SIZE)
+        self.evictions_count = 0
+        self.lock = threading.Lock()
+
+    def register(self, model_name, version, engine, unload_callback,
+                 last_used=None):
+        # last_used returns the time of the last use of the version,
+        # versions without it count as used at the registration
+        if last_used is None:
+            last_used = functools.partial(float, time.time())
+        with self.lock:
+            self.engines[(model_name, version)] = (engine, unload_callback,
+                                                   last_used)
+            self.engines.move_to_end((model_name, version))
+
+    def unregister(self, model_name, version):
+        with self.lock:
+            registered = self.engines.pop((model_name, version), None)
+            if registered is not None:
+                self.last_memory_usage[(model_name, version)] = \
+                    self._get_engine_memory_usage(registered[0])
+
+    def _get_least_recently_used(self):
+        # Returns keys and entries of the registered versions, the least
+        # recently used first
+        return sorted(self.engines.items(), key=lambda item: item[1][2]())
+
+    def estimate_memory_usage(self, model_name, version, default=0):
+        return self.last_memory_usage.get((model_name, version), default)
+
+    @staticmethod
+    def _get_engine_memory_usage(engine):
+        return engine.network_cache.get_memory_usage()
+
+    def get_memory_usage(self):
+        with self.lock:
+            return sum(self._get_engine_memory_usage(engine) for engine, _, _
+                       in self.engines.values())
+
+    def make_room(self, required_memory=0, exclude=None):
+        # Unloads the least recently used idle versions until the memory
+        # usage with required_memory fits in the budget. Callbacks are
+        # invoked without holding the lock, as they wait for the update
+        # lock of the version.
+        if not self.memory_budget:
+            return []
+        evicted = []
+        skipped = {exclude}
+        while self.get_memory_usage() + required_memory > \
+                self.memory_budget:
+            with self.lock:
+                candidates = [(key, unload_callback) for
+                              key, (_, unload_callback, _) in
+                              self._get_least_recently_used()
+                              if key not in skipped]
+            if not candidates:
+                logger.warning("Memory usage of inference engines {} MB "
+                               "with {} MB required exceeds the budget {} "
+                               "MB, no idle versions to unload".format(
+                                   self.get_memory_usage() // 1024 ** 2,
+                                   required_memory // 1024 ** 2,
+                                   self.memory_budget // 1024 ** 2))
+                break
+            key, unload_callback = candidates[0]
+            skipped.add(key)
+            if unload_callback():
+                self._record_eviction(key)
+                evicted.append(key)
+        return evicted
+
+    def _record_eviction(self, key):
+        model_name, version = key
+        logger.info("Version {} of the {} model has been unloaded to free "
+                    "memory for other versions".format(version, model_name))
+        with self.lock:
+            self.evictions_count += 1
+            self.evictions.append({'model_name': model_name,
+                                   'version': version,
+                                   'timestamp': time.time()})
+
+    def get_stats(self):
+        with self.lock:
+            engines = [{'model_name': model_name, 'version': version,
+                        'memory_usage': self._get_engine_memory_usage(engine)}
+                       for (model_name, version), (engine, _, _) in
+                       self._get_least_recently_used()]
+            return {'memory_budget': self.memory_budget,
+                    'memory_usage': sum(engine['memory_usage'] for engine
+                                        in engines),
+                    'engines': engines,
+                    'evictions_count': self.evictions_count,
+                    'recent_evictions': list(self.evictions)}
+
+
+engines_registry = EnginesRegistry(GLOBAL_CONFIG['engines_memory_budget'])
@@ -0,0 +1,128 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from ie_serving.logger import get_logger
+
+logger = get_logger(__name__)
+
+PRECISION_SIZE = {
+    'FP32': 4,
+    'FP16': 2,
+    'I32': 4,
+    'I16': 2,
+    'I8': 1,
+    'U32': 4,
+    'U16': 2,
+    'U8': 1,
+}
+
+
+def get_shape_signature(net):
+    # Executable networks are identified by shapes of all network inputs
+    return tuple(sorted((input_name, tuple(input_info.shape)) for
+                        input_name, input_info in net.inputs.items()))
+
+
+def get_ir_hash(model_xml, model_bin):
+    # Identifies the model by the content of IR files, so it doesn't depend
+    # on their location, e.g. temporary copies of cloud storage models
+    ir_hash = hashlib.sha256()
+    for file_path in [model_xml, model_bin]:
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 ** 2), b''):
+                ir_hash.update(chunk)
+    return ir_hash.hexdigest()
+
+
+def estimate_network_memory(net, num_ireq, weights_size):
+    # Inference Engine does not report memory allocated by executable
+    # networks. It is estimated as the size of weights and input/output
+    # blobs allocated for every infer request.
+    blobs_size = 0
+    for layer in list(net.inputs.values()) + list(net.outputs.values()):
+        blobs_size += int(np.prod(layer.shape)) * \
+            PRECISION_SIZE.get(layer.precision, 4)
+    return weights_size + blobs_size * num_ireq
+
+
+class ExecutableNetworkCache:
+    # LRU cache of executable networks loaded for different input shapes.
+    # Capacity limits number of stored networks, memory_budget (in bytes,
+    # 0 means unlimited) limits their estimated total memory usage.
+    # The most recently added network and pinned networks are never
+    # evicted. Pinned networks are not counted into the capacity.
+
+    def __init__(self, capacity: int, memory_budget: int = 0):
+        self.capacity = max(capacity, 1)
+        self.memory_budget = memory_budget
+        self.networks = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, shape_signature):
+        if shape_signature not in self.networks:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.networks.move_to_end(shape_signature)
+        exec_net, _, _ = self.networks[shape_signature]
+        return exec_net
+
+    def put(self, shape_signature, exec_net, memory_usage: int,
+            pinned=False):
+        self.networks[shape_signature] = (exec_net, memory_usage, pinned)
+        self.networks.move_to_end(shape_signature)
+        evicted = []
+        while self._over_limits():
+            evicted_signature = self._get_eviction_candidate(
+                shape_signature)
+            if evicted_signature is None:
+                break
+            evicted_net, _, _ = self.networks.pop(evicted_signature)
+            self.evictions += 1
+            logger.debug("Executable network for shapes {} evicted from "
+                         "cache".format(evicted_signature))
+            evicted.append(evicted_net)
+        return evicted
+
+    def _get_eviction_candidate(self, newest_signature):
+        for shape_signature, (_, _, pinned) in self.networks.items():
+            if not pinned and shape_signature != newest_signature:
+                return shape_signature
+        return None
+
+    def _over_limits(self):
+        unpinned_networks = [network for network in self.networks.values()
+                             if not network[2]]
+        if len(unpinned_networks) > self.capacity:
+            return True
+        return 0 < self.memory_budget < self.get_memory_usage()
+
+    def get_memory_usage(self):
+        return sum(memory_usage for _, memory_usage, _ in
+                   self.networks.values())
+
+    def get_stats(self):
+        return {'networks': len(self.networks),
+                'memory_usage': self.get_memory_usage(),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions}
@@ -15,11 +15,17 @@
 #
 from ie_serving.config import GLOBAL_CONFIG
 from ie_serving.logger import get_logger
+from ie_serving.models.artifact_cache import artifact_cache
 from ie_serving.models.ir_engine import IrEngine
 from ie_serving.models.model import Model
+from ie_serving.models.ranged_download import ranged_downloader
+from ie_serving.models.remote_index import RemoteIndex, \
+    get_model_directory, load_manifest, remote_indexes
+from ie_serving.models.storage_clients import storage_clients
+import base64
 import os
-import re
-from urllib.parse import urlparse, urlunparse
+import time
+from urllib.parse import urlparse
 from google.auth import exceptions
 from google.cloud import storage
 
@@ -29,118 +35,171 @@ logger = get_logger(__name__)
 class GSModel(Model):
 
     @staticmethod
-    def gs_list_content(path):
+    def get_gs_bucket(bucket_name):
+        # Clients are reused by each thread, so their HTTP sessions keep
+        # connections alive. When default credentials are not found, the
+        # anonymous client is used for all the following calls.
+        if not storage_clients.is_anonymous('gs'):
+            try:
+                gs_client = storage_clients.get(('gs', False),
+                                                storage.Client,
+                                                per_thread=True)
+                return gs_client.bucket(bucket_name)
+            except exceptions.DefaultCredentialsError:
+                logger.info('Switching to anonymous google storage client')
+                storage_clients.set_anonymous('gs')
+        gs_client = storage_clients.get(
+            ('gs', True), storage.Client.create_anonymous_client,
+            per_thread=True)
+        return gs_client.bucket(bucket_name, user_project=None)
+
+    @staticmethod
+    def gs_list_objects(path):
+        # Returns (name, etag, size, md5) tuples of blobs with the path
+        # prefix and the number of API calls made. Composite objects have
+        # no MD5 checksum.
         parsed_path = urlparse(path)
-        bucket_name = parsed_path.netloc
         model_directory = parsed_path.path[1:]
-        try:
-            gs_client = storage.Client()
-            bucket = gs_client.get_bucket(bucket_name)
-        except exceptions.DefaultCredentialsError:
-            gs_client = storage.Client.create_anonymous_client()
-            bucket = gs_client.bucket(bucket_name, user_project=None)
-        blobs = bucket.list_blobs(prefix=model_directory)
-        contents_list = []
-        for blob in blobs:
-            contents_list.append(blob.name)
-        return contents_list
+        bucket = GSModel.get_gs_bucket(parsed_path.netloc)
+        api_calls = 0
+        objects = []
+        for page in bucket.list_blobs(prefix=model_directory).pages:
+            api_calls += 1
+            for blob in page:
+                md5 = None if blob.md5_hash is None else \
+                    base64.b64decode(blob.md5_hash).hex()
+                objects.append((blob.name, blob.etag, blob.size, md5))
+        return objects, api_calls
 
     @staticmethod
-    def gs_download_file(path):
-        if path is None:
-            return None
+    def gs_download_file(path, local_path):
         parsed_path = urlparse(path)
-        bucket_name = parsed_path.netloc
         file_path = parsed_path.path[1:]
-        try:
-            gs_client = storage.Client()
-            bucket = gs_client.get_bucket(bucket_name)
-        except exceptions.DefaultCredentialsError:
-            logger.info('Switching to anonymous google storage client')
-            gs_client = storage.Client.create_anonymous_client()
-            bucket = gs_client.bucket(bucket_name, user_project=None)
-        blob = bucket.blob(file_path)
-        tmp_path = os.path.join('/tmp', file_path.split(os.sep)[-1])
-        blob.download_to_filename(tmp_path)
-        return tmp_path
+        remote_object = remote_indexes.get_object(path)
+        if remote_object is None:
+            # Size of objects not found in the listing is not known
+            blob = GSModel.get_gs_bucket(parsed_path.netloc).blob(file_path)
+            blob.download_to_filename(local_path)
+            return
+
+        def read_range(start, end):
+            # Buckets are taken in the download thread, so that each thread
+            # uses its own client
+            blob = GSModel.get_gs_bucket(parsed_path.netloc).blob(file_path)
+            return blob.download_as_string(start=start, end=end)
+        ranged_downloader.download(path, local_path, remote_object['size'],
+                                   read_range, remote_object['md5'])
 
     @classmethod
     def get_versions(cls, model_directory):
+        # Model directory is listed once per update, unless it has
+        # a manifest, version files are looked up in the published index
         if model_directory[-1] != os.sep:
             model_directory += os.sep
-        parsed_model_dir = urlparse(model_directory)
-        content_list = cls.gs_list_content(model_directory)
-        pattern = re.compile('(' + parsed_model_dir.path[1:-1] + r'/\d+/).*$')
-        versions = set([m.group(1) for m in (pattern.match(element) for
-                                             element in content_list) if m])
-
-        return [urlunparse((parsed_model_dir.scheme, parsed_model_dir.netloc,
-                            version, parsed_model_dir.params,
-                            parsed_model_dir.query,
-                            parsed_model_dir.fragment))
-                for version in versions]
+        index = cls._read_manifest_index(model_directory)
+        if index is None:
+            index = cls._list_index(model_directory, model_directory)
+        remote_indexes.publish(index)
+        return index.get_versions()
+
+    @classmethod
+    def _read_manifest_index(cls, model_directory):
+        # Manifest is downloaded again only when its generation has
+        # changed, so an unchanged model costs a single metadata request
+        manifest_name = GLOBAL_CONFIG['models_manifest_filename']
+        if manifest_name is None:
+            return None
+        parsed_path = urlparse(model_directory + manifest_name)
+        previous = remote_indexes.get(model_directory)
+        start_time = time.time()
+        blob = GSModel.get_gs_bucket(parsed_path.netloc).get_blob(
+            parsed_path.path[1:])
+        if blob is None:
+            logger.debug("Manifest of {} not found, the model directory is "
+                         "listed".format(model_directory))
+            return None
+        if previous is not None and \
+                previous.manifest_version == blob.generation:
+            return previous.get_unchanged(1, time.time() - start_time)
+        # Blob has its generation set, so exactly this generation is
+        # downloaded
+        content = blob.download_as_string()
+        return load_manifest(model_directory, content, blob.generation, 2,
+                             time.time() - start_time)
+
+    @classmethod
+    def _list_index(cls, path, model_directory):
+        start_time = time.time()
+        objects, api_calls = cls.gs_list_objects(path)
+        return RemoteIndex(model_directory, objects, api_calls,
+                           time.time() - start_time)
+
+    @classmethod
+    def _get_index(cls, version):
+        # Version is listed if its model has not been listed yet
+        index = remote_indexes.get_for_version(version)
+        if index is None:
+            index = cls._list_index(version, get_model_directory(version))
+        return index
+
+    @classmethod
+    def get_listing_stats(cls, model_directory):
+        return remote_indexes.get_stats(model_directory)
 
     @classmethod
     def get_version_files(cls, version):
-        parsed_version_path = urlparse(version)
-        content_list = cls.gs_list_content(version)
-        xml_pattern = re.compile(
-            parsed_version_path.path[1:-1] + r'/[^/]+\.xml$')
-        bin_pattern = re.compile(
-            parsed_version_path.path[1:-1] + r'/[^/]+\.bin$')
-        xml_file = list(filter(xml_pattern.match, content_list))
-        bin_file = list(filter(bin_pattern.match, content_list))
-        if len(xml_file) != 0 and len(bin_file) != 0:
-            if os.path.splitext(xml_file[0])[0] == \
-                    os.path.splitext(bin_file[0])[0]:
-                xml_file[0] = urlunparse(
-                    (parsed_version_path.scheme, parsed_version_path.netloc,
-                     xml_file[0], parsed_version_path.params,
-                     parsed_version_path.query, parsed_version_path.fragment))
-                bin_file[0] = urlunparse(
-                    (parsed_version_path.scheme, parsed_version_path.netloc,
-                     bin_file[0], parsed_version_path.params,
-                     parsed_version_path.query, parsed_version_path.fragment))
-                mapping_config = cls._get_mapping_config(version)
-                return xml_file[0], bin_file[0], mapping_config
-        return None, None, None
+        xml_file, bin_file = cls._get_index(version).get_version_files(
+            version)
+        if xml_file is None or bin_file is None:
+            return None, None, None
+        return xml_file, bin_file, cls._get_mapping_config(version)
 
     @classmethod
     def _get_mapping_config(cls, version):
-        content_list = cls.gs_list_content(version)
-        mapping_config = urlparse(version).path[1:] + GLOBAL_CONFIG[
-            'mapping_config_filename']
-        if mapping_config in content_list:
-            return version + GLOBAL_CONFIG['mapping_config_filename']
-        else:
-            return None
+        return cls._get_index(version).get_file(
+            version, GLOBAL_CONFIG['mapping_config_filename'])
+
+    @classmethod
+    def _get_warmup_file(cls, version):
+        return cls._get_index(version).get_file(
+            version, GLOBAL_CONFIG['warmup_data_filename'])
 
     @classmethod
     def get_engine_for_version(cls, model_name, version_attributes):
-        version_attributes['xml_file'], version_attributes['bin_file'], \
-            version_attributes['mapping_config'] = cls.create_local_mirror(
-            version_attributes)
+        # Attributes are copied, so the version can be loaded again from
+        # the remote paths, e.g. on demand after it's unloaded
+        local_attributes = dict(version_attributes)
+        local_attributes['xml_file'], local_attributes['bin_file'], \
+            local_attributes['mapping_config'], \
+            local_attributes['warmup_file'] = cls.create_local_mirror(
+                version_attributes)
         logger.info('Downloaded files from GCS')
 
-        engine_spec = cls._get_engine_spec(model_name, version_attributes)
-        engine = IrEngine.build(**engine_spec)
-
-        cls.delete_local_mirror([version_attributes['xml_file'],
-                                 version_attributes['bin_file'],
-                                 version_attributes['mapping_config']])
-        logger.info('Deleted temporary files')
+        try:
+            engine_spec = cls._get_engine_spec(model_name, local_attributes)
+            engine = IrEngine.build(**engine_spec)
+        finally:
+            cls.delete_local_mirror([local_attributes['xml_file'],
+                                     local_attributes['bin_file'],
+                                     local_attributes['mapping_config'],
+                                     local_attributes['warmup_file']])
+        logger.info('Released local files')
         return engine
 
     @classmethod
     def create_local_mirror(cls, version_attributes):
-        local_xml_file = cls.gs_download_file(version_attributes['xml_file'])
-        local_bin_file = cls.gs_download_file(version_attributes['bin_file'])
-        local_mapping_config = cls.gs_download_file(
-            version_attributes['mapping_config'])
-        return local_xml_file, local_bin_file, local_mapping_config
+        # Objects with ETags from the model listing are taken from the
+        # artifact cache and downloaded only when they are not cached.
+        # All files are fetched concurrently.
+        paths = [version_attributes.get(file_key) for file_key in
+                 ['xml_file', 'bin_file', 'mapping_config', 'warmup_file']]
+        return tuple(artifact_cache.fetch_all(
+            [(path, None if path is None else remote_indexes.get_etag(path))
+             for path in paths], cls.gs_download_file))
 
     @classmethod
     def delete_local_mirror(cls, files_paths):
+        # Cached files are kept for the following loads, temporary files
+        # are removed
         for file_path in files_paths:
-            if file_path is not None:
-                os.remove(file_path)
+            artifact_cache.release(file_path)
@@ -14,33 +14,58 @@
 # limitations under the License.
 #
 import datetime
+import functools
 import json
+import os
 import queue
-from threading import Thread
+import time
+from threading import Condition, Thread
 
-from openvino.inference_engine import IENetwork, IEPlugin
+from openvino.inference_engine import IECore, IENetwork, IEPlugin
 
 from ie_serving.config import GLOBAL_CONFIG
 from ie_serving.logger import get_logger
 from ie_serving.models import InferenceStatus
+from ie_serving.models.admission_control import AdmissionControl
+from ie_serving.models.autotune import AutotuneInfo, run_autotune
+from ie_serving.models.compiled_network_cache import \
+    compiled_network_cache
+from ie_serving.models.executable_network_cache import \
+    ExecutableNetworkCache, get_ir_hash, get_shape_signature, \
+    estimate_network_memory
+from ie_serving.models.requests_batch import RequestsBatch, \
+    ShardedRequest, get_batch_size, are_inputs_compatible
+from ie_serving.models.requests_queue import RequestsQueue, \
+    parse_lanes_weights
+from ie_serving.models.shape_management.batch_sharding_info import \
+    BatchShardingInfo
+from ie_serving.models.shape_management.batch_size_pool import \
+    BatchSizePool
 from ie_serving.models.shape_management.batching_info import BatchingInfo
+from ie_serving.models.shape_management.dynamic_batching_info import \
+    DynamicBatchingInfo
+from ie_serving.models.shape_management.shape_buckets import ShapeBuckets
 from ie_serving.models.shape_management.shape_info import ShapeInfo
 from ie_serving.models.shape_management.utils import BatchingMode, ShapeMode
+from ie_serving.models.warmup import FILE, WarmupInfo, get_warmup_inputs, \
+    load_inputs, run_warmup
+from ie_serving.server.constants import DEADLINE_EXCEEDED
 
 logger = get_logger(__name__)
 
 
 def inference_callback(status, py_data):
     ir_engine = py_data['ir_engine']
+    exec_net = py_data['exec_net']
     request = py_data['request']
     ireq_index = py_data['ireq_index']
     start_time = py_data['start_time']
     duration = (datetime.datetime.now() - start_time).total_seconds() * 1000
+    ir_engine.admission_control.record_inference_time(duration / 1000)
 
     if status == InferenceStatus.OK:
         request.set_result(ireq_index=ireq_index,
-                           result=ir_engine.exec_net.requests[ireq_index].
-                           outputs)
+                           result=exec_net.requests[ireq_index].outputs)
     else:
         request.set_result(ireq_index=ireq_index,
                            result="Error occurred during inference execution")
@@ -54,13 +79,34 @@ class IrEngine():
     def __init__(self, model_name, model_version, net, plugin,
                  mapping_config, exec_net, batching_info, shape_info,
                  free_ireq_index_queue, num_ireq, requests_queue,
-                 target_device, plugin_config):
+                 target_device, plugin_config, dynamic_batching_info=None,
+                 network_cache=None, weights_size=0, shape_buckets=None,
+                 batch_size_pool=None, batch_sharding_info=None,
+                 admission_control=None, ir_hash=None):
         self.model_name = model_name
         self.model_version = model_version
         self.exec_net = exec_net
         self.net = net
         self.batching_info = batching_info
         self.shape_info = shape_info
+        if dynamic_batching_info is None:
+            dynamic_batching_info = DynamicBatchingInfo(None)
+        self.dynamic_batching_info = dynamic_batching_info
+        if shape_buckets is None:
+            shape_buckets = ShapeBuckets(None, net.inputs)
+        self.shape_buckets = shape_buckets
+        if batch_size_pool is None:
+            batch_size_pool = BatchSizePool(None)
+        self.batch_size_pool = batch_size_pool
+        if batch_sharding_info is None:
+            batch_sharding_info = BatchShardingInfo(None)
+        self.batch_sharding_info = batch_sharding_info
+        if admission_control is None:
+            admission_control = AdmissionControl(None, num_ireq)
+        self.admission_control = admission_control
+        # Request fetched from the queue, which could not be merged into
+        # the previous batch. It is processed first in the next iteration.
+        self.pending_request = None
         self.plugin = plugin
         self.input_tensor_names = list(net.inputs.keys())
         self.output_tensor_names = list(net.outputs.keys())
@@ -70,10 +116,29 @@ class IrEngine():
         self.free_ireq_index_queue = free_ireq_index_queue
         self.num_ireq = num_ireq
         self.requests_queue = requests_queue
+        # Indexes of infer requests in progress mapped to executable networks
+        # they run on. Condition is notified on each infer request release
+        # and each active request release.
+        self.in_progress_ireqs = {}
+        self.ireq_released = Condition()
+        # Number of requests which acquired the engine and have not
+        # finished yet. Draining engine doesn't accept new requests.
+        self.active_requests = 0
+        self.draining = False
 
         self.target_device = target_device
         self.plugin_config = plugin_config
 
+        if network_cache is None:
+            network_cache = ExecutableNetworkCache(
+                capacity=GLOBAL_CONFIG['network_cache_size'],
+                memory_budget=GLOBAL_CONFIG['network_cache_memory_budget'])
+        self.network_cache = network_cache
+        self.weights_size = weights_size
+        self.ir_hash = ir_hash
+        self.reshape_count = 0
+        self.load_count = 0
+
         logger.info("Matched keys for model: {}".format(self.model_keys))
 
         self.engine_active = True
@@ -84,7 +149,10 @@ class IrEngine():
     @classmethod
     def build(cls, model_name, model_version, model_xml, model_bin,
               mapping_config, batch_size_param, shape_param, num_ireq,
-              target_device, plugin_config):
+              target_device, plugin_config, dynamic_batching=None,
+              shape_buckets=None, batch_size_pool=None,
+              batch_sharding=None, admission_control=None, autotune=None,
+              warmup=None, warmup_file=None):
         plugin = IEPlugin(device=target_device,
                           plugin_dirs=GLOBAL_CONFIG['plugin_dir'])
         if GLOBAL_CONFIG['cpu_extension'] is not None \
@@ -116,16 +184,124 @@ class IrEngine():
             logger.debug("[Model: {}, version: {}] --- Setting shape to "
                          "default".format(model_name, model_version))
         ###############################
+        # Shape buckets setup
+        shape_buckets_info = ShapeBuckets(shape_buckets, net.inputs)
+        if shape_buckets_info.enabled and shape_info.mode != ShapeMode.AUTO:
+            logger.warning("[Model: {}, version: {}] --- Shape buckets are "
+                           "ignored, shape parameter is not set to auto"
+                           .format(model_name, model_version))
+            shape_buckets_info = ShapeBuckets(None, net.inputs)
+        ###############################
+        # Batch size pool setup
+        batch_size_pool_info = BatchSizePool(batch_size_pool)
+        if batch_size_pool_info.enabled and \
+                batching_info.mode != BatchingMode.AUTO:
+            logger.warning("[Model: {}, version: {}] --- Batch size pool is "
+                           "ignored, batch_size parameter is not set to auto"
+                           .format(model_name, model_version))
+            batch_size_pool_info = BatchSizePool(None)
+        ###############################
+        # Dynamic batching setup
+        dynamic_batching_info = DynamicBatchingInfo(dynamic_batching)
+        if dynamic_batching_info.enabled:
+            cls._prepare_dynamic_batching(model_name, model_version, net,
+                                          batching_info, shape_info,
+                                          dynamic_batching_info)
+        ###############################
+        # Autotune of infer requests number and CPU streams
+        autotune_info = AutotuneInfo(autotune, target_device)
+        # IR files hash identifies the model in autotune results and
+        # compiled networks cache
+        ir_hash = None
+        if autotune_info.enabled or compiled_network_cache.enabled:
+            ir_hash = get_ir_hash(model_xml, model_bin)
+        if autotune_info.enabled:
+            num_ireq, plugin_config = run_autotune(
+                model_name, model_version, plugin, net, ir_hash, num_ireq,
+                target_device, plugin_config, autotune_info)
+        ###############################
+        # Batch sharding setup
+        batch_sharding_info = BatchShardingInfo(batch_sharding, num_ireq)
+        if batch_sharding_info.enabled:
+            if batching_info.mode != BatchingMode.AUTO and \
+                    shape_info.mode != ShapeMode.AUTO:
+                batch_sharding_info.disable(
+                    "[Model: {}, version: {}] batch_size or shape parameter "
+                    "is not set to auto".format(model_name, model_version))
+            elif shape_buckets_info.enabled:
+                batch_sharding_info.disable(
+                    "[Model: {}, version: {}] shape buckets are "
+                    "used".format(model_name, model_version))
+        ###############################
         # Creating free infer requests indexes queue
         free_ireq_index_queue = queue.Queue(maxsize=num_ireq)
         for ireq_index in range(num_ireq):
             free_ireq_index_queue.put(ireq_index)
         ###############################
-        requests_queue = queue.Queue(maxsize=GLOBAL_CONFIG[
-            'engine_requests_queue_size'])
-
-        exec_net = plugin.load(network=net, num_requests=num_ireq,
-                               config=plugin_config)
+        priority_lanes = GLOBAL_CONFIG['requests_priority_lanes']
+        requests_queue = RequestsQueue(
+            maxsize=GLOBAL_CONFIG['engine_requests_queue_size'],
+            lanes=priority_lanes,
+            scheduling=GLOBAL_CONFIG['requests_priority_scheduling'],
+            weights=parse_lanes_weights(
+                GLOBAL_CONFIG['requests_priority_weights'], priority_lanes))
+
+        weights_size = os.path.getsize(model_bin)
+        network_cache = ExecutableNetworkCache(
+            capacity=GLOBAL_CONFIG['network_cache_size'],
+            memory_budget=GLOBAL_CONFIG['network_cache_memory_budget'])
+        # Networks for shape buckets and batch size pool are loaded
+        # upfront and kept in the cache for the whole engine lifetime
+        if shape_buckets_info.enabled:
+            networks_params = shape_buckets_info.buckets
+        elif batch_size_pool_info.enabled:
+            networks_params = batch_size_pool_info.batch_sizes
+        else:
+            networks_params = [None]
+        ###############################
+        # Warmup setup
+        warmup_info = WarmupInfo(warmup)
+        recorded_inputs = None
+        if warmup_info.data == FILE and warmup_file is not None:
+            try:
+                recorded_inputs = load_inputs(warmup_file)
+            except Exception as e:
+                logger.warning("[Model: {}, version: {}] --- Error while "
+                               "reading warmup data file {}: {}".format(
+                                   model_name, model_version, warmup_file,
+                                   str(e)))
+        for network_param in networks_params:
+            if type(network_param) is dict:
+                logger.debug("[Model: {}, version: {}] --- Loading network "
+                             "for shape bucket: {}".format(
+                                 model_name, model_version, network_param))
+                net.reshape(network_param)
+            elif type(network_param) is int:
+                logger.debug("[Model: {}, version: {}] --- Loading network "
+                             "for batch size: {}".format(
+                                 model_name, model_version, network_param))
+                net.batch_size = network_param
+            exec_net = cls._load_executable_network(
+                model_name, model_version, plugin, net, num_ireq,
+                target_device, plugin_config, ir_hash)
+            network_cache.put(get_shape_signature(net), exec_net,
+                              estimate_network_memory(net, num_ireq,
+                                                      weights_size),
+                              pinned=network_param is not None)
+            # Each network is warmed up before the version is marked as
+            # available, so the first requests don't pay for lazy
+            # allocations on the device
+            if warmup_info.enabled:
+                try:
+                    run_warmup(model_name, model_version, exec_net, num_ireq,
+                               get_warmup_inputs(model_name, model_version,
+                                                 net, warmup_info,
+                                                 recorded_inputs),
+                               warmup_info.iterations)
+                except Exception as e:
+                    logger.warning("[Model: {}, version: {}] --- Warmup "
+                                   "failed: {}".format(model_name,
+                                                       model_version, str(e)))
         ir_engine = cls(model_name=model_name, model_version=model_version,
                         mapping_config=mapping_config, net=net, plugin=plugin,
                         exec_net=exec_net, batching_info=batching_info,
@@ -133,9 +309,94 @@ class IrEngine():
                         free_ireq_index_queue=free_ireq_index_queue,
                         num_ireq=num_ireq, requests_queue=requests_queue,
                         target_device=target_device,
-                        plugin_config=plugin_config)
+                        plugin_config=plugin_config,
+                        dynamic_batching_info=dynamic_batching_info,
+                        network_cache=network_cache,
+                        weights_size=weights_size,
+                        shape_buckets=shape_buckets_info,
+                        batch_size_pool=batch_size_pool_info,
+                        batch_sharding_info=batch_sharding_info,
+                        admission_control=AdmissionControl(admission_control,
+                                                           num_ireq),
+                        ir_hash=ir_hash)
+        ir_engine.load_count += len(networks_params)
         return ir_engine
 
+    @staticmethod
+    def _load_executable_network(model_name, model_version, plugin, net,
+                                 num_ireq, target_device, plugin_config,
+                                 ir_hash):
+        # Imports the network compiled earlier if it's available in the
+        # compiled networks cache, otherwise compiles it and exports to
+        # the cache
+        if not compiled_network_cache.enabled or ir_hash is None:
+            return plugin.load(network=net, num_requests=num_ireq,
+                               config=plugin_config)
+        shape_signature = get_shape_signature(net)
+        blob_path = compiled_network_cache.get_blob_path(
+            ir_hash, target_device, plugin_config, shape_signature)
+        if compiled_network_cache.find(blob_path) is not None:
+            start_time = time.time()
+            try:
+                exec_net = IECore().import_network(
+                    model_file=blob_path, device_name=target_device,
+                    config=plugin_config, num_requests=num_ireq)
+                load_time = time.time() - start_time
+                compiled_network_cache.record_hit(load_time)
+                logger.info("[Model: {}, version: {}] --- Compiled network "
+                            "cache hit for shapes {}, imported in {:.3f} s; "
+                            "cache stats: {}".format(
+                                model_name, model_version, shape_signature,
+                                load_time, compiled_network_cache.get_stats()))
+                return exec_net
+            except Exception as e:
+                logger.warning("[Model: {}, version: {}] --- Error occurred "
+                               "while importing compiled network {}: {}"
+                               .format(model_name, model_version, blob_path,
+                                       e))
+                compiled_network_cache.invalidate(blob_path)
+        start_time = time.time()
+        exec_net = plugin.load(network=net, num_requests=num_ireq,
+                               config=plugin_config)
+        load_time = time.time() - start_time
+        compiled_network_cache.record_miss(load_time)
+        logger.info("[Model: {}, version: {}] --- Compiled network cache "
+                    "miss for shapes {}, compiled in {:.3f} s; cache stats: "
+                    "{}".format(model_name, model_version, shape_signature,
+                                load_time, compiled_network_cache.get_stats()))
+        if compiled_network_cache.is_export_supported(target_device):
+            compiled_network_cache.save(exec_net, blob_path, target_device)
+        return exec_net
+
+    @staticmethod
+    def _prepare_dynamic_batching(model_name, model_version, net,
+                                  batching_info, shape_info,
+                                  dynamic_batching_info):
+        # In automatic modes merged batches are handled by regular network
+        # reshaping. Otherwise, the network is loaded with the maximal batch
+        # size and merged batches are padded to it. The batch size is
+        # restored if an output does not represent the batch.
+        if batching_info.mode == BatchingMode.AUTO or \
+                shape_info.mode == ShapeMode.AUTO:
+            return
+        max_batch_size = dynamic_batching_info.max_batch_size
+        logger.debug("[Model: {}, version: {}] --- Setting batch size to "
+                     "dynamic batching maximum: {}".format(
+                         model_name, model_version, max_batch_size))
+        net_batch_size = net.batch_size
+        batch_size = batching_info.batch_size
+        net.batch_size = max_batch_size
+        batching_info.batch_size = max_batch_size
+        for output_name, output in net.outputs.items():
+            if output.shape[0] != max_batch_size:
+                net.batch_size = net_batch_size
+                batching_info.batch_size = batch_size
+                dynamic_batching_info.disable(
+                    "[Model: {}, version: {}] output {} first dimension "
+                    "does not represent the batch size".format(
+                        model_name, model_version, output_name))
+                return
+
     def _get_mapping_data_if_exists(self, mapping_config):
         if mapping_config is not None:
             try:
@@ -193,52 +454,273 @@ class IrEngine():
                      .format(self.model_name, self.model_version))
         while self.engine_active:
             try:
-                request = self.requests_queue.get(timeout=GLOBAL_CONFIG[
+                request = self._get_next_request(timeout=GLOBAL_CONFIG[
                     'engine_requests_queue_timeout'])
             except queue.Empty:
                 continue
-            error_message = self.adjust_network_inputs_if_needed(
-                request.inference_input)
-            if error_message is not None:
-                request.result = error_message
+            if request is None:
                 continue
-            ireq_index = self.free_ireq_index_queue.get()
-            py_data = {
-                'ir_engine': self,
-                'ireq_index': ireq_index,
-                'request': request,
-                'start_time': datetime.datetime.now()
-            }
-            self.exec_net.requests[ireq_index].set_completion_callback(
-                py_callback=inference_callback, py_data=py_data)
-            self.exec_net.requests[ireq_index].async_infer(
-                request.inference_input)
+            if self.dynamic_batching_info.enabled:
+                request = self._collect_requests_batch(request)
+            for inference_request in self._split_request(request):
+                self._start_inference(inference_request)
         logger.debug("Stopping inference service for model {} version {}"
                      .format(self.model_name, self.model_version))
 
+    def _start_inference(self, request):
+        error_message = self.adjust_network_inputs_if_needed(
+            request.inference_input)
+        if error_message is not None:
+            request.set_result(ireq_index=None, result=error_message)
+            return
+        ireq_index = self.free_ireq_index_queue.get()
+        exec_net = self.exec_net
+        with self.ireq_released:
+            self.in_progress_ireqs[ireq_index] = exec_net
+        py_data = {
+            'ir_engine': self,
+            'exec_net': exec_net,
+            'ireq_index': ireq_index,
+            'request': request,
+            'start_time': datetime.datetime.now()
+        }
+        exec_net.requests[ireq_index].set_completion_callback(
+            py_callback=inference_callback, py_data=py_data)
+        exec_net.requests[ireq_index].async_infer(request.inference_input)
+
+    def enqueue_request(self, request):
+        # Puts request to the queue unless it is rejected by admission
+        # control or the queue is full. Returns error message and retry
+        # after hint in seconds on rejection, None, None otherwise.
+        error_message, retry_after = self.admission_control.check(
+            self.requests_queue.qsize())
+        if error_message is None:
+            try:
+                self.requests_queue.put_nowait(request)
+            except queue.Full:
+                error_message = "Requests queue is full"
+                retry_after = self.admission_control.get_retry_after(
+                    self.admission_control.estimate_wait(1))
+        if error_message is not None:
+            logger.debug("[Model: {}, version: {}] --- Request rejected: {}"
+                         .format(self.model_name, self.model_version,
+                                 error_message))
+        return error_message, retry_after
+
+    def _get_next_request(self, timeout):
+        if self.pending_request is not None:
+            request = self.pending_request
+            self.pending_request = None
+            return request
+        return self._get_queued_request(timeout)
+
+    def _get_queued_request(self, timeout):
+        # Takes request from the queue and prepares its inputs. Requests
+        # which can't be served are answered immediately and None is
+        # returned.
+        request = self.requests_queue.get(timeout=timeout)
+        if request.queue_wait is not None:
+            logger.debug("[Model: {}, version: {}] --- Request with priority "
+                         "{} waited in queue {} ms".format(
+                             self.model_name, self.model_version,
+                             request.priority, request.queue_wait * 1000))
+        if request.is_expired():
+            logger.debug("[Model: {}, version: {}] --- Request dropped, "
+                         "deadline exceeded in queue".format(
+                             self.model_name, self.model_version))
+            request.set_result(ireq_index=None, result=DEADLINE_EXCEEDED)
+            return None
+        if self.shape_buckets.enabled:
+            error_message = self._fit_to_shape_bucket(request)
+            if error_message is not None:
+                request.set_result(ireq_index=None, result=error_message)
+                return None
+        return request
+
+    def _fit_to_shape_bucket(self, request):
+        bucket = self.shape_buckets.find_bucket(request.inference_input)
+        if bucket is None:
+            return "Input shapes {} exceed all configured shape " \
+                   "buckets".format({input_name: input_data.shape for
+                                     input_name, input_data in
+                                     request.inference_input.items()})
+        first_input_name = list(request.inference_input.keys())[0]
+        request.process_result = functools.partial(
+            ShapeBuckets.crop_outputs,
+            shape=request.inference_input[first_input_name].shape,
+            bucket_shape=bucket[first_input_name])
+        request.inference_input = ShapeBuckets.pad_inputs(
+            request.inference_input, bucket)
+        return None
+
+    def _collect_requests_batch(self, first_request):
+        # Merges requests waiting in the queue with the first one until
+        # max_batch_size is reached or max_delay elapses. The first
+        # incompatible request is kept for the next iteration.
+        max_batch_size = self.dynamic_batching_info.max_batch_size
+        requests = [first_request]
+        batch_size = get_batch_size(first_request.inference_input)
+        deadline = time.time() + self.dynamic_batching_info.max_delay
+        while batch_size < max_batch_size:
+            timeout = deadline - time.time()
+            if timeout <= 0:
+                break
+            try:
+                request = self._get_queued_request(timeout)
+            except queue.Empty:
+                break
+            if request is None:
+                continue
+            request_batch_size = get_batch_size(request.inference_input)
+            if batch_size + request_batch_size > max_batch_size or \
+                    not are_inputs_compatible(first_request.inference_input,
+                                              request.inference_input):
+                self.pending_request = request
+                break
+            requests.append(request)
+            batch_size += request_batch_size
+
+        target_batch_size = batch_size
+        if self.batching_info.mode != BatchingMode.AUTO and \
+                self.shape_info.mode != ShapeMode.AUTO:
+            target_batch_size = max_batch_size
+        if len(requests) == 1 and batch_size == target_batch_size:
+            return first_request
+        logger.debug("[Model: {}, version: {}] --- Dynamic batching merged "
+                     "{} requests into batch of size {}".format(
+                         self.model_name, self.model_version, len(requests),
+                         target_batch_size))
+        return RequestsBatch(requests=requests,
+                             target_batch_size=target_batch_size,
+                             release_ireq=self.release_ireq)
+
+    def _split_request(self, request):
+        # Returns requests executed as separate inferences for the given
+        # one. With batch sharding enabled, the batch is split across
+        # parallel infer requests. With batch size pool enabled, each part
+        # is padded to the smallest fitting network or split further.
+        if not self.batch_sharding_info.enabled and \
+                not self.batch_size_pool.enabled:
+            return [request]
+        batch_size = get_batch_size(request.inference_input)
+        shards = [(batch_size, batch_size)]
+        if self.batch_sharding_info.enabled:
+            shards = self.batch_sharding_info.split(batch_size)
+        if self.batch_size_pool.enabled:
+            shards = [pool_shard for shard_size, _ in shards for pool_shard
+                      in self.batch_size_pool.split(shard_size)]
+        if len(shards) == 1:
+            shard_size, network_batch_size = shards[0]
+            if shard_size == network_batch_size:
+                return [request]
+            requests = [request]
+        else:
+            requests = ShardedRequest(request, [
+                shard_size for shard_size, _ in shards]).shards
+            logger.debug("[Model: {}, version: {}] --- Request split into "
+                         "shards: {}".format(self.model_name,
+                                             self.model_version, shards))
+        return [RequestsBatch(requests=[shard_request],
+                              target_batch_size=network_batch_size,
+                              release_ireq=self.release_ireq)
+                for shard_request, (_, network_batch_size) in
+                zip(requests, shards)]
+
+    def release_ireq(self, ireq_index):
+        # Returns infer request to the pool of free requests. Requests
+        # which never reached inference execution have no ireq assigned.
+        if ireq_index is None:
+            return
+        with self.ireq_released:
+            self.in_progress_ireqs.pop(ireq_index, None)
+            self.ireq_released.notify_all()
+        self.free_ireq_index_queue.put(ireq_index)
+
+    def get_stats(self):
+        # Depth and wait times of the requests queue lanes, number of
+        # reshapes and network loads and executable networks cache usage
+        return {'requests_queue': self.requests_queue.get_stats(),
+                'reshape_count': self.reshape_count,
+                'load_count': self.load_count,
+                'network_cache': self.network_cache.get_stats()}
+
+    def acquire(self):
+        # Registers the request as active, so the engine is not released
+        # before the request finishes. Returns False if engine is draining.
+        with self.ireq_released:
+            if self.draining:
+                return False
+            self.active_requests += 1
+            return True
+
+    def release(self):
+        with self.ireq_released:
+            self.active_requests -= 1
+            self.ireq_released.notify_all()
+
+    def is_idle(self):
+        # No active or queued requests and no inferences in progress.
+        # Checked under the lock, as the inference thread changes them.
+        with self.ireq_released:
+            return not self.active_requests and \
+                self.requests_queue.empty() and \
+                not self.get_in_progress_ireqs()
+
+    def drain(self, timeout=None):
+        # Stops accepting new requests and waits for the active ones and
+        # inferences in progress to finish. Returns False if they have not
+        # finished within timeout.
+        logger.debug("[Model: {} version: {}] --- Draining {} active "
+                     "requests...".format(self.model_name,
+                                          self.model_version,
+                                          self.active_requests))
+        with self.ireq_released:
+            self.draining = True
+            engine_drained = self.ireq_released.wait_for(
+                lambda: not self.active_requests and
+                not self.get_in_progress_ireqs(), timeout=timeout)
+        if not engine_drained:
+            logger.warning("[Model: {} version: {}] --- Active requests "
+                           "have not finished within {} s".format(
+                               self.model_name, self.model_version, timeout))
+        return engine_drained
+
     def stop_inference_service(self):
         self.engine_active = False
         self.inference_thread.join()
 
-    def suppress_inference(self):
-        # Wait for all inferences executed on deleted engines to end
+    def suppress_inference(self, timeout=None, exec_nets=None):
+        # Wait for inferences in progress to end. If exec_nets are given,
+        # only infer requests running on these networks are awaited.
+        # Returns False if inferences have not ended within timeout.
         logger.debug("[Model: {} version: {}] --- Waiting for in progress "
                      "inferences to finish...".
                      format(self.model_name, self.model_version))
-        engine_suppressed = False
-        while not engine_suppressed:
-            if self.free_ireq_index_queue.full():
-                engine_suppressed = True
+        with self.ireq_released:
+            engine_suppressed = self.ireq_released.wait_for(
+                lambda: not self.get_in_progress_ireqs(exec_nets),
+                timeout=timeout)
+        if not engine_suppressed:
+            logger.warning("[Model: {} version: {}] --- In progress "
+                           "inferences have not finished within {} s".
+                           format(self.model_name, self.model_version,
+                                  timeout))
+            return engine_suppressed
         logger.debug("[Model: {} version: {}] --- In progress inferences "
                      "has been finalized...".
                      format(self.model_name, self.model_version))
+        return engine_suppressed
+
+    def get_in_progress_ireqs(self, exec_nets=None):
+        return [ireq_index for ireq_index, exec_net in
+                self.in_progress_ireqs.items() if exec_nets is None or
+                any(exec_net is net for net in exec_nets)]
 
     def adjust_network_inputs_if_needed(self, inference_input):
         error_message = None
         reshape_param = self.detect_shapes_incompatibility(
             inference_input)
         if reshape_param is not None:
-            self.suppress_inference()
             error_message = self.reshape(reshape_param)
         return error_message
 
@@ -282,6 +764,7 @@ class IrEngine():
 
     def reshape(self, reshape_param):
         reshape_start_time = datetime.datetime.now()
+        self.reshape_count += 1
         if type(reshape_param) is dict:
             error_message = self._reshape(reshape_param)
         elif type(reshape_param) is int:
@@ -299,6 +782,11 @@ class IrEngine():
         logger.debug(
             "IR_ENGINE; network reshape completed; {}; {}; {}ms".format(
                 self.model_name, self.model_version, duration))
+        logger.debug("[Model: {}, version: {}] --- Reshapes: {}, network "
+                     "loads: {}, network cache: {}".format(
+                         self.model_name, self.model_version,
+                         self.reshape_count, self.load_count,
+                         self.network_cache.get_stats()))
         return None
 
     def _reshape(self, inputs_shapes: dict):
@@ -321,9 +809,7 @@ class IrEngine():
         logger.debug("[Model: {}, version: {}] --- Loading network...".
                      format(self.model_name, self.model_version))
         try:
-            self.exec_net = self.plugin.load(network=self.net,
-                                             num_requests=self.num_ireq,
-                                             config=self.plugin_config)
+            self._load_network()
         except Exception as e:
             message = "Error occurred while loading network: {}".format(
                 str(e))
@@ -346,9 +832,7 @@ class IrEngine():
         self.net.batch_size = batch_size
 
         try:
-            self.exec_net = self.plugin.load(network=self.net,
-                                             num_requests=self.num_ireq,
-                                             config=self.plugin_config)
+            self._load_network()
         except Exception as e:
             message = "Error occurred while loading network: {}".format(
                 str(e))
@@ -361,3 +845,30 @@ class IrEngine():
                      "successfully. Batch size changed.".
                      format(self.model_name, self.model_version))
         return message
+
+    def _load_network(self):
+        # Switches to executable network matching current network shapes.
+        # Network is loaded to the device only if it is not cached.
+        # Inferences in progress on other networks are not interrupted,
+        # only networks evicted from the cache are awaited before release.
+        shape_signature = get_shape_signature(self.net)
+        exec_net = self.network_cache.get(shape_signature)
+        if exec_net is not None:
+            logger.debug("[Model: {}, version: {}] --- Using cached "
+                         "network for shapes {}".format(
+                             self.model_name, self.model_version,
+                             shape_signature))
+            self.exec_net = exec_net
+            return
+        exec_net = self._load_executable_network(
+            self.model_name, self.model_version, self.plugin, self.net,
+            self.num_ireq, self.target_device, self.plugin_config,
+            self.ir_hash)
+        self.load_count += 1
+        evicted_exec_nets = self.network_cache.put(
+            shape_signature, exec_net,
+            estimate_network_memory(self.net, self.num_ireq,
+                                    self.weights_size))
+        self.exec_net = exec_net
+        if evicted_exec_nets:
+            self.suppress_inference(exec_nets=evicted_exec_nets)
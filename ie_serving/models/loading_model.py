@@ -0,0 +1,46 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from ie_serving.models.model_version_status import ModelVersionStatus
+from ie_serving.models.routing_table import RoutingTable
+
+# Version number reported in the status of the model which is loading,
+# its versions are not known until the model is built
+LOADING_MODEL_VERSION = 0
+
+
+class LoadingModel:
+    # Placeholder registered in the models dictionary until the model is
+    # built. It has no versions to serve and reports LOADING status.
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.versions = []
+        self.default_version = -1
+        self.engines = {}
+        self.routing_table = RoutingTable(self.versions, self.engines)
+        self.listing_duration = None
+        self.listing_api_calls = None
+        loading_status = ModelVersionStatus(model_name, LOADING_MODEL_VERSION)
+        loading_status.set_loading()
+        self.versions_statuses = {LOADING_MODEL_VERSION: loading_status}
+
+    def is_ready(self):
+        return False
+
+    def update(self, list_versions=True):
+        pass
+
+    def unload_idle_engines(self):
+        pass
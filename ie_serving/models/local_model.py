@@ -51,6 +51,14 @@ class LocalModel(Model):
             return mapping_config[0]
         return None
 
+    @classmethod
+    def _get_warmup_file(cls, version):
+        warmup_file = glob.glob(version + GLOBAL_CONFIG[
+            'warmup_data_filename'])
+        if len(warmup_file) == 1:
+            return warmup_file[0]
+        return None
+
     @classmethod
     def get_engine_for_version(cls, model_name, version_attributes):
         engine_spec = cls._get_engine_spec(model_name, version_attributes)
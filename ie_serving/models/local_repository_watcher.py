@@ -0,0 +1,237 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+
+from ie_serving.config import GLOBAL_CONFIG
+from ie_serving.logger import get_logger
+from ie_serving.models.update_scheduler import update_scheduler
+
+logger = get_logger(__name__)
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | \
+    IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+
+EVENT_HEADER = struct.Struct('iIII')
+READ_BUFFER_SIZE = 64 * 1024
+# Interval in seconds of checking which changed models have settled
+SETTLE_CHECK_INTERVAL = 0.1
+
+
+def parse_events(data):
+    # Returns (wd, mask, name) tuples of inotify_event structures
+    events = []
+    offset = 0
+    while offset + EVENT_HEADER.size <= len(data):
+        wd, mask, _, name_length = EVENT_HEADER.unpack_from(data, offset)
+        offset += EVENT_HEADER.size
+        name = data[offset:offset + name_length].rstrip(b'\0').decode(
+            errors='replace')
+        offset += name_length
+        events.append((wd, mask, name))
+    return events
+
+
+class Inotify:
+    # Minimal inotify binding using libc, available on Linux only
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p,
+                                    ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path, mask):
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        return wd
+
+    def read_events(self, timeout):
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            return parse_events(os.read(self.fd, READ_BUFFER_SIZE))
+        except BlockingIOError:
+            return []
+
+
+class LocalRepositoryWatcher:
+    # Watches directories of local models and their versions with inotify
+    # and calls on_change with the model name once no further changes have
+    # been seen for debounce seconds, so versions being copied are not
+    # picked up half-written. Models which cannot be watched are left to
+    # the periodic polling. Watches of model directories which were
+    # removed are added again when the directories are created again.
+    def __init__(self, debounce, on_change):
+        self.debounce = debounce
+        self.on_change = on_change
+        self.inotify = None
+        self.inotify_unavailable = False
+        # Watch descriptors mapped to model names and watched directories
+        self.watches = {}
+        self.models_directories = {}
+        # Removed model directories mapped to model names
+        self.removed_directories = {}
+        self.last_events = {}
+        self.lock = threading.Lock()
+        self.watch_thread = None
+
+    def watch(self, model_name, model_directory):
+        # Returns True if the model directory is watched
+        with self.lock:
+            if not self._start():
+                return False
+            try:
+                self._add_model_watch(model_name, model_directory)
+            except OSError as e:
+                logger.warning("Model directory {} cannot be watched for "
+                               "changes, it will be polled instead: "
+                               "{}".format(model_directory, str(e)))
+                return False
+        logger.info("Model directory {} is watched for changes".format(
+            model_directory))
+        return True
+
+    def _start(self):
+        if self.inotify is not None:
+            return True
+        if self.inotify_unavailable:
+            return False
+        try:
+            self.inotify = Inotify()
+        except (OSError, AttributeError, TypeError) as e:
+            logger.warning("Inotify is not available, local models will be "
+                           "polled for changes: {}".format(str(e)))
+            self.inotify_unavailable = True
+            return False
+        self.watch_thread = threading.Thread(target=self._run)
+        self.watch_thread.setDaemon(True)
+        self.watch_thread.start()
+        return True
+
+    def _add_model_watch(self, model_name, model_directory):
+        wd = self.inotify.add_watch(model_directory, WATCH_MASK)
+        self.watches[wd] = (model_name, model_directory)
+        self.models_directories[model_directory] = wd
+        for entry in os.scandir(model_directory):
+            if entry.is_dir():
+                self._add_version_watch(model_name, entry.path)
+
+    def _add_version_watch(self, model_name, version_directory):
+        wd = self.inotify.add_watch(version_directory, WATCH_MASK)
+        self.watches[wd] = (model_name, version_directory)
+
+    def _run(self):
+        while True:
+            try:
+                events = self.inotify.read_events(SETTLE_CHECK_INTERVAL)
+            except OSError as e:
+                logger.error("Error while reading inotify events: "
+                             "{}".format(str(e)))
+                time.sleep(SETTLE_CHECK_INTERVAL)
+                continue
+            with self.lock:
+                self._handle_events(events)
+                self._restore_removed_watches()
+                settled_models = self._pop_settled_models(time.time())
+            for model_name in settled_models:
+                logger.debug("Change detected in the directory of model "
+                             "{}".format(model_name))
+                self.on_change(model_name)
+
+    def _handle_events(self, events):
+        now = time.time()
+        for wd, mask, name in events:
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost, all watched models are checked
+                for model_name, _ in self.watches.values():
+                    self.last_events[model_name] = now
+                continue
+            watch = self.watches.get(wd)
+            if watch is None:
+                continue
+            model_name, directory = watch
+            self.last_events[model_name] = now
+            if mask & IN_IGNORED:
+                del self.watches[wd]
+                if self.models_directories.get(directory) == wd:
+                    # Model directory was removed, it's watched again when
+                    # it's created
+                    del self.models_directories[directory]
+                    self.removed_directories[directory] = model_name
+            elif mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and \
+                    self.models_directories.get(directory) == wd:
+                try:
+                    self._add_version_watch(model_name,
+                                            os.path.join(directory, name))
+                except OSError as e:
+                    logger.warning("Version directory {} cannot be watched "
+                                   "for changes: {}".format(name, str(e)))
+
+    def _restore_removed_watches(self):
+        for model_directory, model_name in list(
+                self.removed_directories.items()):
+            if not os.path.isdir(model_directory):
+                continue
+            try:
+                self._add_model_watch(model_name, model_directory)
+            except OSError as e:
+                logger.warning("Model directory {} cannot be watched for "
+                               "changes: {}".format(model_directory, str(e)))
+                continue
+            del self.removed_directories[model_directory]
+            # Versions might have been copied before the watch was added
+            self.last_events[model_name] = time.time()
+            logger.info("Model directory {} is watched for changes "
+                        "again".format(model_directory))
+
+    def _pop_settled_models(self, now):
+        settled_models = [model_name for model_name, last_event in
+                          self.last_events.items()
+                          if now - last_event >= self.debounce]
+        for model_name in settled_models:
+            del self.last_events[model_name]
+        return settled_models
+
+
+local_repository_watcher = LocalRepositoryWatcher(
+    debounce=GLOBAL_CONFIG['local_models_watch_debounce_seconds'],
+    on_change=update_scheduler.request_update)
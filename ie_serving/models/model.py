@@ -13,16 +13,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import functools
+import os
 import re
 import threading
+import time
 from abc import ABC, abstractmethod
 
 from jsonschema import validate
 from jsonschema.exceptions import ValidationError
 
+from ie_serving.config import GLOBAL_CONFIG
 from ie_serving.logger import get_logger
+from ie_serving.models.engines_loading_pool import engines_loading_pool
+from ie_serving.models.engines_registry import engines_registry
 from ie_serving.models.model_version_status import ModelVersionStatus
-from ie_serving.models.models_utils import ErrorCode
+from ie_serving.models.models_utils import ErrorCode, ModelVersionState
+from ie_serving.models.routing_table import RoutingTable
 from ie_serving.schemas import latest_schema, all_schema, versions_schema
 
 logger = get_logger(__name__)
@@ -34,7 +41,11 @@ class Model(ABC):
                  batch_size_param, shape_param, available_versions: list,
                  engines: dict, version_policy_filter,
                  versions_statuses: dict, update_locks: dict,
-                 num_ireq: int, target_device: str, plugin_config):
+                 num_ireq: int, target_device: str, plugin_config,
+                 dynamic_batching=None, shape_buckets=None,
+                 batch_size_pool=None, batch_sharding=None,
+                 admission_control=None, autotune=None, lazy_loading=None,
+                 versions_attributes=None, warmup=None):
         self.model_name = model_name
         self.model_directory = model_directory
         self.versions = available_versions
@@ -48,11 +59,36 @@ class Model(ABC):
 
         self.target_device = target_device
         self.plugin_config = plugin_config
+        self.dynamic_batching = dynamic_batching
+        self.shape_buckets = shape_buckets
+        self.batch_size_pool = batch_size_pool
+        self.batch_sharding = batch_sharding
+        self.admission_control = admission_control
+        self.autotune = autotune
+        self.warmup = warmup
+        # With lazy loading, versions are loaded on the first request and
+        # unloaded back to START state after idle_timeout_s seconds without
+        # requests (0 - never unloaded)
+        self.lazy_loading = lazy_loading is not None
+        self.idle_timeout = (lazy_loading or {}).get('idle_timeout_s', 0)
+        self.versions_attributes = {
+            version_attributes['version_number']: version_attributes for
+            version_attributes in versions_attributes or []}
+        self.engines_last_used = {}
+        # Duration in seconds and number of storage API calls (for remote
+        # storage) of reading versions during the last update
+        self.listing_duration = None
+        self.listing_api_calls = None
 
         [self.versions_statuses[version].set_available() for version in
          self.versions if version in self.engines.keys()]
 
         self.update_locks = update_locks
+        for version in self.versions:
+            self.update_locks.setdefault(version, threading.Lock())
+        self.routing_lock = threading.Lock()
+        self._publish_routing_table()
+        self._register_engines(self.engines)
 
         logger.info("List of available versions "
                     "for {} model: {}".format(self.model_name, self.versions))
@@ -63,7 +99,11 @@ class Model(ABC):
     @classmethod
     def build(cls, model_name: str, model_directory: str, batch_size_param,
               shape_param, model_version_policy: dict = None,
-              num_ireq: int = 1, target_device='CPU', plugin_config=None):
+              num_ireq: int = 1, target_device='CPU', plugin_config=None,
+              dynamic_batching=None, shape_buckets=None,
+              batch_size_pool=None, batch_sharding=None,
+              admission_control=None, autotune=None, lazy_loading=None,
+              warmup=None):
 
         logger.info("Server start loading model: {}".format(model_name))
         version_policy_filter = cls.get_model_version_policy_filter(
@@ -72,7 +112,9 @@ class Model(ABC):
         try:
             versions_attributes, available_versions = cls.get_version_metadata(
                 model_directory, batch_size_param, shape_param,
-                version_policy_filter, num_ireq, target_device, plugin_config)
+                version_policy_filter, num_ireq, target_device, plugin_config,
+                dynamic_batching, shape_buckets, batch_size_pool,
+                batch_sharding, admission_control, autotune, warmup)
         except Exception as error:
             logger.error("Error occurred while getting versions "
                          "of the model {}".format(model_name))
@@ -90,10 +132,15 @@ class Model(ABC):
 
         update_locks = {}
 
-        engines = cls.get_engines_for_model(model_name,
-                                            versions_attributes,
-                                            versions_statuses,
-                                            update_locks)
+        if lazy_loading is None:
+            engines = cls.get_engines_for_model(model_name,
+                                                versions_attributes,
+                                                versions_statuses,
+                                                update_locks)
+        else:
+            engines = {}
+            for version in available_versions:
+                update_locks[version] = threading.Lock()
 
         available_versions = [version_attributes['version_number'] for
                               version_attributes in versions_attributes]
@@ -107,27 +154,178 @@ class Model(ABC):
                     versions_statuses=versions_statuses,
                     update_locks=update_locks,
                     num_ireq=num_ireq, target_device=target_device,
-                    plugin_config=plugin_config)
+                    plugin_config=plugin_config,
+                    dynamic_batching=dynamic_batching,
+                    shape_buckets=shape_buckets,
+                    batch_size_pool=batch_size_pool,
+                    batch_sharding=batch_sharding,
+                    admission_control=admission_control,
+                    autotune=autotune, lazy_loading=lazy_loading,
+                    versions_attributes=versions_attributes, warmup=warmup)
         return model
 
-    def update(self):
+    def is_ready(self):
+        # Model is ready when at least one of its versions is available or
+        # can be loaded on demand - versions of lazy loading model and
+        # versions unloaded to free memory are in START state
+        return any(self.versions_statuses[version].state in
+                   [ModelVersionState.START, ModelVersionState.AVAILABLE]
+                   for version in self.versions)
+
+    def resolve_engine(self, requested_version, acquire=False):
+        # Returns the version serving the request and its engine, both
+        # taken from a single routing table snapshot. If the default version
+        # is requested and its engine is being drained, a newer version has
+        # been published, so the request is resolved again from the current
+        # snapshot. Returns (None, None) if the version is not served.
+        while True:
+            routing_table = self.routing_table
+            version = routing_table.resolve_version(requested_version)
+            if version is None:
+                return None, None
+            engine = self.get_engine(version, acquire, routing_table)
+            if engine is not None or requested_version != 0 or \
+                    self.routing_table is routing_table:
+                return version, engine
+
+    def get_engine(self, version, acquire=False, routing_table=None):
+        # Returns the engine of available version. Versions of lazy loading
+        # model and versions unloaded to free memory are loaded on the first
+        # request. Returns None if the version could not be loaded.
+        # Acquired engine is not released until engine.release() is called.
+        # Last use is recorded without locking, the engines registry reads
+        # it when it looks for versions to unload.
+        if routing_table is None:
+            routing_table = self.routing_table
+        engine = routing_table.engines.get(version)
+        if engine is not None and (not acquire or engine.acquire()):
+            self.engines_last_used[version] = time.time()
+            return engine
+        # Versions which are not loaded or engines which are being drained
+        # are handled under the update lock of the version
+        update_lock = self.update_locks.get(version)
+        if update_lock is None:
+            return None
+        with update_lock:
+            engine = self.engines.get(version)
+            if engine is None and version in self.versions:
+                engine = self._load_engine_on_demand(version)
+            if engine is not None and acquire and not engine.acquire():
+                engine = None
+            if engine is not None:
+                self.engines_last_used[version] = time.time()
+        return engine
+
+    def _load_engine_on_demand(self, version):
+        logger.info("Loading version {} of the {} model on demand".format(
+            version, self.model_name))
+        self.versions_statuses[version].set_loading()
+        self._make_room_for_version(self.model_name,
+                                    self.versions_attributes[version])
+        try:
+            engine = engines_loading_pool.submit(
+                self.get_engine_for_version, self.model_name,
+                self.versions_attributes[version]).result()
+        except Exception as e:
+            logger.error("Error occurred while loading model "
+                         "version: {}".format(self.versions_attributes.get(
+                             version)))
+            logger.error("Content error: {}".format(str(e).rstrip()))
+            self.versions_statuses[version].set_loading(ErrorCode.UNKNOWN)
+            return None
+        self.engines[version] = engine
+        self.versions_statuses[version].set_available()
+        self._publish_routing_table()
+        self._register_engines({version: engine})
+        return engine
+
+    def _publish_routing_table(self):
+        # Routing table is rebuilt from the current versions and engines
+        # and replaced in one step. Lock keeps concurrent updates of
+        # different versions from publishing outdated tables.
+        with self.routing_lock:
+            self.routing_table = RoutingTable(self.versions, self.engines)
+
+    def _register_engines(self, engines):
+        # Registered versions can be unloaded to free memory for other
+        # versions when they're idle. They're loaded again on demand.
+        # Versions not used yet count as used at the registration.
+        for version, engine in engines.items():
+            engines_registry.register(
+                self.model_name, version, engine,
+                functools.partial(self._delete_engine, version,
+                                  self.update_locks, 0,
+                                  ErrorCode.RESOURCE_EXHAUSTED),
+                functools.partial(self.engines_last_used.get, version,
+                                  time.time()))
+        for version in engines:
+            engines_registry.make_room(exclude=(self.model_name, version))
+
+    @classmethod
+    def _make_room_for_version(cls, model_name, version_attributes):
+        # Memory needed for the version is estimated from its previous load
+        # or the size of weights file, if it's available locally
+        version = version_attributes['version_number']
+        weights_size = 0
+        bin_file = version_attributes.get('bin_file')
+        if bin_file and os.path.isfile(bin_file):
+            weights_size = os.path.getsize(bin_file)
+        engines_registry.make_room(
+            engines_registry.estimate_memory_usage(model_name, version,
+                                                   weights_size),
+            exclude=(model_name, version))
+
+    def _is_engine_idle(self, version, idle_timeout):
+        engine = self.engines.get(version)
+        if engine is None:
+            return False
+        idle_time = time.time() - self.engines_last_used.get(version, 0)
+        return idle_time >= idle_timeout and engine.is_idle()
+
+    def unload_idle_engines(self):
+        # Called periodically by the update scheduler, independently of
+        # the model updates
+        if not self.lazy_loading or not self.idle_timeout:
+            return
+        for version in list(self.engines.keys()):
+            if self._is_engine_idle(version, self.idle_timeout):
+                logger.info("Version {} of the {} model is idle and will be "
+                            "unloaded".format(version, self.model_name))
+                process_thread = threading.Thread(
+                    target=self._delete_engine,
+                    args=[version, self.update_locks, self.idle_timeout])
+                process_thread.start()
+
+    def update(self, list_versions=True):
+        # Returns False if versions could not be read from the storage.
+        # Without list_versions, the storage is not read.
+        if not list_versions:
+            return True
+        listing_start_time = time.time()
         try:
             versions_attributes, available_versions = \
                 self.get_version_metadata(
                     self.model_directory,
                     self.batch_size_param, self.shape_param,
                     self.version_policy_filter, self.num_ireq,
-                    self.target_device, self.plugin_config)
+                    self.target_device, self.plugin_config,
+                    self.dynamic_batching, self.shape_buckets,
+                    self.batch_size_pool, self.batch_sharding,
+                    self.admission_control, self.autotune, self.warmup)
         except Exception as error:
             logger.error("Error occurred while getting versions "
                          "of the model {}".format(self.model_name))
             logger.error("Failed reading model versions from path: {} "
                          "with error {}".format(self.model_directory,
                                                 str(error)))
-            return
+            return False
+        finally:
+            self.listing_duration = time.time() - listing_start_time
+            self.listing_api_calls = self.get_listing_stats(
+                self.model_directory).get('last_api_calls')
 
         if set(available_versions) == set(self.versions):
-            return
+            return True
 
         logger.info("Server will start updating model: {}".format(
             self.model_name))
@@ -139,20 +337,30 @@ class Model(ABC):
             attribute for attribute in versions_attributes if
             attribute['version_number'] in to_create]
 
-        created_engines = self.get_engines_for_model(self.model_name,
-                                                     new_versions_attributes,
-                                                     self.versions_statuses,
-                                                     self.update_locks)
+        # New versions are loaded and warmed up while the current ones are
+        # still serving. Requests are switched to them in one step and only
+        # then the removed versions are drained and released.
+        if self.lazy_loading:
+            created_engines = {}
+            for version in to_create:
+                self.update_locks[version] = threading.Lock()
+        else:
+            created_engines = self.get_engines_for_model(
+                self.model_name, new_versions_attributes,
+                self.versions_statuses, self.update_locks)
+        self.versions_attributes.update({
+            version_attributes['version_number']: version_attributes for
+            version_attributes in new_versions_attributes})
         created_versions = [attributes_to_create['version_number'] for
                             attributes_to_create in new_versions_attributes]
         self.engines.update(created_engines)
-        self.versions.extend(created_versions)
-        self.versions = [x for x in self.versions if x not in to_delete]
-        self.versions.sort()
-        self.default_version = max(self.versions, default=-1)
-
+        self._register_engines(created_engines)
         [self.versions_statuses[version].set_available() for version in
-         created_versions]
+         created_versions if version in created_engines]
+        self.versions = sorted([version for version in self.versions if
+                                version not in to_delete] + created_versions)
+        self.default_version = max(self.versions, default=-1)
+        self._publish_routing_table()
 
         logger.info("List of available versions after update "
                     "for {} model: {}".format(self.model_name, self.versions))
@@ -160,11 +368,13 @@ class Model(ABC):
                     "for {} model is {}".format(self.model_name,
                                                 self.default_version))
         for version in to_delete:
+            self.versions_statuses[version].set_unloading()
             process_thread = threading.Thread(
                     target=self._delete_engine,
                     args=[version, self.update_locks])
 
             process_thread.start()
+        return True
 
     def _mark_differences(self, new_versions):
         to_delete = []
@@ -173,7 +383,6 @@ class Model(ABC):
         for version in self.versions:
             if version not in new_versions:
                 to_delete.append(version)
-                self.versions_statuses[version].set_unloading()
 
         for version in new_versions:
             if version not in self.versions:
@@ -183,28 +392,57 @@ class Model(ABC):
 
         return to_create, to_delete
 
-    def _delete_engine(self, version, update_locks):
+    def _delete_engine(self, version, update_locks, idle_timeout=None,
+                       error_code=ErrorCode.OK):
+        # With idle_timeout, the engine is unloaded only if it has been idle
+        # for idle_timeout seconds and the version goes back to START state
+        # to be loaded on demand. Returns True if the engine was removed.
         update_locks[version].acquire()
         try:
-            self.engines[version].suppress_inference()
-            self.engines[version].stop_inference_service()
-            del self.engines[version]
-            logger.debug("Version {} of the {} model has been removed".format(
-                version, self.model_name))
-            self.versions_statuses[version].set_end()
+            if idle_timeout is not None and \
+                    not self._is_engine_idle(version, idle_timeout):
+                return False
+            if version in self.engines:
+                engines_registry.unregister(self.model_name, version)
+                self.engines[version].drain(
+                    timeout=GLOBAL_CONFIG['engine_suppress_timeout'])
+                self.engines[version].stop_inference_service()
+                del self.engines[version]
+                self._publish_routing_table()
+            if idle_timeout is not None:
+                logger.debug("Version {} of the {} model has been "
+                             "unloaded".format(version, self.model_name))
+                self.versions_statuses[version].set_start(error_code)
+            else:
+                self.versions_attributes.pop(version, None)
+                logger.debug("Version {} of the {} model has been "
+                             "removed".format(version, self.model_name))
+                self.versions_statuses[version].set_end(error_code)
+            return True
         finally:
             update_locks[version].release()
 
     @classmethod
     def get_version_metadata(cls, model_directory, batch_size_param,
                              shape_param, version_policy_filter, num_ireq,
-                             target_device, plugin_config):
+                             target_device, plugin_config,
+                             dynamic_batching=None, shape_buckets=None,
+                             batch_size_pool=None, batch_sharding=None,
+                             admission_control=None, autotune=None,
+                             warmup=None):
         versions_attributes = cls.get_versions_attributes(model_directory,
                                                           batch_size_param,
                                                           shape_param,
                                                           num_ireq,
                                                           target_device,
-                                                          plugin_config)
+                                                          plugin_config,
+                                                          dynamic_batching,
+                                                          shape_buckets,
+                                                          batch_size_pool,
+                                                          batch_sharding,
+                                                          admission_control,
+                                                          autotune,
+                                                          warmup)
         available_versions = [version_attributes['version_number'] for
                               version_attributes in versions_attributes]
         available_versions.sort()
@@ -214,7 +452,10 @@ class Model(ABC):
     @classmethod
     def get_versions_attributes(cls, model_directory, batch_size_param,
                                 shape_param, num_ireq, target_device,
-                                plugin_config):
+                                plugin_config, dynamic_batching=None,
+                                shape_buckets=None, batch_size_pool=None,
+                                batch_sharding=None, admission_control=None,
+                                autotune=None, warmup=None):
         versions = cls.get_versions(model_directory)
         logger.debug(versions)
         versions_attributes = []
@@ -232,7 +473,21 @@ class Model(ABC):
                                           'shape_param': shape_param,
                                           'num_ireq': num_ireq,
                                           'target_device': target_device,
-                                          'plugin_config': plugin_config
+                                          'plugin_config': plugin_config,
+                                          'dynamic_batching':
+                                              dynamic_batching,
+                                          'shape_buckets': shape_buckets,
+                                          'batch_size_pool': batch_size_pool,
+                                          'batch_sharding': batch_sharding,
+                                          'admission_control':
+                                              admission_control,
+                                          'autotune': autotune,
+                                          'warmup': warmup,
+                                          'warmup_file':
+                                              cls._get_warmup_file(version)
+                                              if warmup is not None and
+                                              warmup.get('data') == 'file'
+                                              else None
                                           }
                     versions_attributes.append(version_attributes)
         return versions_attributes
@@ -268,38 +523,57 @@ class Model(ABC):
     @classmethod
     def get_engines_for_model(cls, model_name, versions_attributes,
                               versions_statuses, update_locks):
+        # Versions are loaded in parallel on the pool shared by all models.
+        # Update locks are acquired before submitting, so the versions are
+        # locked until their loading is finished.
+        loading_futures = {}
+        for version_attributes in versions_attributes:
+            version_number = version_attributes['version_number']
+            if version_number not in update_locks:
+                update_locks[version_number] = threading.Lock()
+            update_locks[version_number].acquire()
+            loading_futures[version_number] = engines_loading_pool.submit(
+                cls._load_engine_for_version, model_name, version_attributes,
+                versions_statuses, update_locks)
+
         inference_engines = {}
         failures = []
         for version_attributes in versions_attributes:
             version_number = version_attributes['version_number']
-            try:
-                if version_number not in update_locks:
-                    update_locks[version_number] = threading.Lock()
-                update_locks[version_number].acquire()
-                logger.info("Creating inference engine object "
-                            "for version: {}".format(version_number))
-
-                versions_statuses[version_number].set_loading()
-
-                inference_engines[version_number] = \
-                    cls.get_engine_for_version(model_name, version_attributes)
-            except Exception as e:
-                logger.error("Error occurred while loading model "
-                             "version: {}".format(version_attributes))
-                logger.error("Content error: {}".format(str(e).rstrip()))
-
-                versions_statuses[version_number].set_loading(
-                    ErrorCode.UNKNOWN)
-
+            engine = loading_futures[version_number].result()
+            if engine is None:
                 failures.append(version_attributes)
-            finally:
-                update_locks[version_number].release()
+            else:
+                inference_engines[version_number] = engine
 
         for failure in failures:
             versions_attributes.remove(failure)
 
         return inference_engines
 
+    @classmethod
+    def _load_engine_for_version(cls, model_name, version_attributes,
+                                 versions_statuses, update_locks):
+        version_number = version_attributes['version_number']
+        try:
+            logger.info("Creating inference engine object "
+                        "for version: {}".format(version_number))
+
+            versions_statuses[version_number].set_loading()
+            cls._make_room_for_version(model_name, version_attributes)
+
+            return cls.get_engine_for_version(model_name, version_attributes)
+        except Exception as e:
+            logger.error("Error occurred while loading model "
+                         "version: {}".format(version_attributes))
+            logger.error("Content error: {}".format(str(e).rstrip()))
+
+            versions_statuses[version_number].set_loading(
+                ErrorCode.UNKNOWN)
+            return None
+        finally:
+            update_locks[version_number].release()
+
     @classmethod
     def _get_engine_spec(cls, model_name, version_attributes):
         return {
@@ -312,7 +586,15 @@ class Model(ABC):
             'shape_param': version_attributes['shape_param'],
             'num_ireq': version_attributes['num_ireq'],
             'target_device': version_attributes['target_device'],
-            'plugin_config': version_attributes['plugin_config']
+            'plugin_config': version_attributes['plugin_config'],
+            'dynamic_batching': version_attributes['dynamic_batching'],
+            'shape_buckets': version_attributes['shape_buckets'],
+            'batch_size_pool': version_attributes['batch_size_pool'],
+            'batch_sharding': version_attributes['batch_sharding'],
+            'admission_control': version_attributes['admission_control'],
+            'autotune': version_attributes['autotune'],
+            'warmup': version_attributes['warmup'],
+            'warmup_file': version_attributes['warmup_file']
         }
 
     #   Subclass interface
@@ -321,6 +603,10 @@ class Model(ABC):
     def get_versions(cls, model_directory):
         pass
 
+    @classmethod
+    def get_listing_stats(cls, model_directory):
+        return {}
+
     @classmethod
     @abstractmethod
     def get_version_files(cls, version):
@@ -331,6 +617,11 @@ class Model(ABC):
     def _get_mapping_config(cls, version):
         pass
 
+    @classmethod
+    @abstractmethod
+    def _get_warmup_file(cls, version):
+        pass
+
     @classmethod
     @abstractmethod
     def get_engine_for_version(cls, model_name, version_attributes):
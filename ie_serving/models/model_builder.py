@@ -24,18 +24,33 @@ class ModelBuilder:
     @staticmethod
     def build(model_name: str, model_directory: str,
               model_version_policy: dict, batch_size, shape, num_ireq: int,
-              target_device, plugin_config):
+              target_device, plugin_config, dynamic_batching=None,
+              shape_buckets=None, batch_size_pool=None, batch_sharding=None,
+              admission_control=None, autotune=None, lazy_loading=None,
+              warmup=None):
         parsed_path = urlparse(model_directory)
         if parsed_path.scheme == '':
             return LocalModel.build(model_name, model_directory,
                                     batch_size, shape,
                                     model_version_policy, num_ireq,
-                                    target_device, plugin_config)
+                                    target_device, plugin_config,
+                                    dynamic_batching, shape_buckets,
+                                    batch_size_pool, batch_sharding,
+                                    admission_control, autotune, lazy_loading,
+                                    warmup)
         elif parsed_path.scheme == 'gs':
             return GSModel.build(model_name, model_directory, batch_size,
                                  shape, model_version_policy, num_ireq,
-                                 target_device, plugin_config)
+                                 target_device, plugin_config,
+                                 dynamic_batching, shape_buckets,
+                                 batch_size_pool, batch_sharding,
+                                 admission_control, autotune, lazy_loading,
+                                 warmup)
         elif parsed_path.scheme == 's3':
             return S3Model.build(model_name, model_directory, batch_size,
                                  shape, model_version_policy, num_ireq,
-                                 target_device, plugin_config)
+                                 target_device, plugin_config,
+                                 dynamic_batching, shape_buckets,
+                                 batch_size_pool, batch_sharding,
+                                 admission_control, autotune, lazy_loading,
+                                 warmup)
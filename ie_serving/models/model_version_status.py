@@ -32,6 +32,13 @@ class ModelVersionStatus:
                            ModelVersionState.START][ErrorCode.OK]}
         self.log_status()
 
+    def set_start(self, error_code=ErrorCode.OK):
+        self.state = ModelVersionState.START
+        self.status["error_code"] = error_code
+        self.status["error_message"] = _ERROR_MESSAGE[
+            ModelVersionState.START][error_code]
+        self.log_status()
+
     def set_loading(self, error_code=ErrorCode.OK):
         self.state = ModelVersionState.LOADING
         self.status["error_code"] = error_code
@@ -24,7 +24,7 @@ class ErrorCode:
     # ALREADY_EXISTS = 6
     # PERMISSION_DENIED = 7
     # UNAUTHENTICATED = 16
-    # RESOURCE_EXHAUSTED = 8
+    RESOURCE_EXHAUSTED = 8
     # FAILED_PRECONDITION = 9
     # ABORTED = 10
     # OUT_OF_RANGE = 11
@@ -48,6 +48,8 @@ class ModelVersionState:
 _ERROR_MESSAGE = {
     ModelVersionState.START: {
         ErrorCode.OK: "",  # "Version detected"
+        ErrorCode.RESOURCE_EXHAUSTED: "Version unloaded to free memory for "
+                                      "other versions"
     },
     ModelVersionState.LOADING: {
         ErrorCode.OK: "",  # "Version is being loaded",
@@ -83,7 +85,7 @@ _ERROR_CODE_NAME = {
     # ErrorCode.ALREADY_EXISTS: "ALREADY_EXISTS",
     # ErrorCode.PERMISSION_DENIED: "PERMISSION_DENIED",
     # ErrorCode.UNAUTHENTICATED: "UNAUTHENTICATED",
-    # ErrorCode.RESOURCE_EXHAUSTED: "RESOURCE_EXHAUSTED",
+    ErrorCode.RESOURCE_EXHAUSTED: "RESOURCE_EXHAUSTED",
     # ErrorCode.FAILED_PRECONDITION: "FAILED_PRECONDITION",
     # ErrorCode.ABORTED: "ABORTED",
     # ErrorCode.OUT_OF_RANGE: "OUT_OF_RANGE",
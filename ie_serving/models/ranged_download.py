@@ -0,0 +1,114 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ie_serving.config import GLOBAL_CONFIG
+from ie_serving.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Size of blocks read to compute checksum of downloaded files
+CHECKSUM_BLOCK_SIZE = 1024 ** 2
+
+
+class RangedDownloader:
+    # Downloads remote objects with concurrent ranged requests, each part
+    # written at its offset of the local file, and verifies their size and
+    # MD5 checksum when it's known. Shared by S3 and GCS models,
+    # statistics are collected for the whole server.
+    def __init__(self, part_size, concurrency):
+        self.part_size = part_size
+        self.concurrency = concurrency
+        self.lock = threading.Lock()
+        self.files_count = 0
+        self.bytes_count = 0
+        self.download_time = 0.0
+        self.last_throughput = 0.0
+
+    def get_parts(self, size):
+        # Returns (start, end) byte ranges with inclusive ends
+        return [(start, min(start + self.part_size, size) - 1)
+                for start in range(0, size, self.part_size)]
+
+    def download(self, path, local_path, size, read_range, md5=None):
+        # read_range(start, end) returns bytes of the object in the range
+        parts = self.get_parts(size)
+        start_time = time.time()
+        fd = os.open(local_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+        try:
+            os.ftruncate(fd, size)
+
+            def download_part(part):
+                data = read_range(*part)
+                if len(data) != part[1] - part[0] + 1:
+                    raise ValueError("Received {} bytes of {} in range "
+                                     "{}-{}".format(len(data), path, *part))
+                os.pwrite(fd, data, part[0])
+
+            if len(parts) > 1 and self.concurrency > 1:
+                with ThreadPoolExecutor(max_workers=min(
+                        self.concurrency, len(parts))) as executor:
+                    for _ in executor.map(download_part, parts):
+                        pass
+            else:
+                for part in parts:
+                    download_part(part)
+        finally:
+            os.close(fd)
+        if md5 is not None:
+            self.verify_checksum(path, local_path, md5)
+        self.record_download(path, size, time.time() - start_time,
+                             len(parts))
+
+    @staticmethod
+    def verify_checksum(path, local_path, md5):
+        file_hash = hashlib.md5()
+        with open(local_path, 'rb') as f:
+            for block in iter(lambda: f.read(CHECKSUM_BLOCK_SIZE), b''):
+                file_hash.update(block)
+        if file_hash.hexdigest() != md5:
+            raise ValueError("Checksum of downloaded {} does not match: "
+                             "{} != {}".format(path, file_hash.hexdigest(),
+                                               md5))
+
+    def record_download(self, path, size, download_time, parts_count):
+        throughput = size / 1024 ** 2 / max(download_time, 1e-6)
+        with self.lock:
+            self.files_count += 1
+            self.bytes_count += size
+            self.download_time += download_time
+            self.last_throughput = throughput
+        logger.info("Downloaded {} ({:.1f} MB in {} parts) in {:.3f} s, "
+                    "{:.1f} MB/s".format(path, size / 1024 ** 2,
+                                         parts_count, download_time,
+                                         throughput))
+
+    def get_stats(self):
+        with self.lock:
+            return {'files_count': self.files_count,
+                    'bytes_count': self.bytes_count,
+                    'download_time': self.download_time,
+                    'last_throughput_mbps': self.last_throughput,
+                    'throughput_mbps': self.bytes_count / 1024 ** 2 /
+                    self.download_time if self.download_time else 0.0}
+
+
+ranged_downloader = RangedDownloader(GLOBAL_CONFIG['download_part_size'],
+                                     GLOBAL_CONFIG['download_concurrency'])
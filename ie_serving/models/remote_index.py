@@ -0,0 +1,183 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import copy
+import json
+import os
+import re
+import threading
+from urllib.parse import urlparse
+
+from jsonschema import validate
+from jsonschema.exceptions import ValidationError
+
+from ie_serving.logger import get_logger
+from ie_serving.schemas import manifest_schema
+
+logger = get_logger(__name__)
+
+
+def get_model_directory(version):
+    # Returns path of the model directory with trailing separator for path
+    # of its version directory
+    return version.rstrip(os.sep).rsplit(os.sep, 1)[0] + os.sep
+
+
+class RemoteIndex:
+    # Objects of the remote model storage from a single listing, grouped by
+    # version directories. Each version path is mapped to the files stored
+    # directly in it with their ETags, sizes and MD5 checksums.
+    def __init__(self, model_directory, objects, api_calls=0, latency=0.0,
+                 manifest_version=None):
+        # objects are (key, etag, size, md5) tuples, md5 is a hex digest or
+        # None when it's not known, model_directory ends with the separator.
+        # Indexes read from manifests keep their ETag or generation.
+        self.model_directory = model_directory
+        self.manifest_version = manifest_version
+        self.api_calls = api_calls
+        self.latency = latency
+        self.objects_count = 0
+        self.versions = {}
+        prefix = urlparse(model_directory).path[1:]
+        pattern = re.compile(re.escape(prefix) + r'(\d+)/(.*)$')
+        for key, etag, size, md5 in objects:
+            self.objects_count += 1
+            match = pattern.match(key)
+            if match is None:
+                continue
+            files = self.versions.setdefault(
+                model_directory + match.group(1) + os.sep, {})
+            file_name = match.group(2)
+            if file_name and os.sep not in file_name:
+                files[file_name] = {'etag': etag, 'size': size, 'md5': md5}
+
+    def get_versions(self):
+        return list(self.versions.keys())
+
+    def get_unchanged(self, api_calls, latency):
+        # Returns the index again for the manifest which has not changed
+        # since it was read
+        index = copy.copy(self)
+        index.api_calls = api_calls
+        index.latency = latency
+        return index
+
+    def get_version_files(self, version):
+        files = self.versions.get(version, {})
+        xml_files = sorted(name for name in files if name.endswith('.xml'))
+        bin_files = sorted(name for name in files if name.endswith('.bin'))
+        if xml_files and bin_files and os.path.splitext(xml_files[0])[0] == \
+                os.path.splitext(bin_files[0])[0]:
+            return version + xml_files[0], version + bin_files[0]
+        return None, None
+
+    def get_file(self, version, file_name):
+        if file_name in self.versions.get(version, {}):
+            return version + file_name
+        return None
+
+    def diff(self, previous):
+        # Returns versions added, removed and with files modified since the
+        # previous index
+        previous_versions = {} if previous is None else previous.versions
+        return {
+            'added': sorted(set(self.versions) - set(previous_versions)),
+            'removed': sorted(set(previous_versions) - set(self.versions)),
+            'modified': sorted(
+                version for version, files in self.versions.items() if
+                version in previous_versions and
+                files != previous_versions[version]),
+        }
+
+
+def load_manifest(model_directory, content, manifest_version, api_calls=0,
+                  latency=0.0):
+    # Returns index of versions and files listed in the manifest of the
+    # model, None when it's not valid. MD5 checksums of files are used as
+    # their ETags.
+    try:
+        manifest = json.loads(content)
+        validate(manifest, manifest_schema)
+    except (ValueError, ValidationError) as e:
+        logger.warning("Manifest of {} is not valid, the model directory is "
+                       "listed instead: {}".format(model_directory, e))
+        return None
+    prefix = urlparse(model_directory).path[1:]
+    objects = [(prefix + version + os.sep + file_name, file['md5'],
+                file['size'], file['md5'])
+               for version, files in manifest['versions'].items()
+               for file_name, file in files.items()]
+    return RemoteIndex(model_directory, objects, api_calls, latency,
+                       manifest_version)
+
+
+class RemoteIndexes:
+    # The latest indexes of remote models, used by all lookups of version
+    # files until the next listing, and listing statistics
+    def __init__(self):
+        self.indexes = {}
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def publish(self, index):
+        with self.lock:
+            previous = self.indexes.get(index.model_directory)
+            self.indexes[index.model_directory] = index
+            changes = index.diff(previous)
+            stats = self.stats.setdefault(index.model_directory, {
+                'listings_count': 0, 'api_calls': 0})
+            stats['listings_count'] += 1
+            stats['api_calls'] += index.api_calls
+            stats['last_api_calls'] = index.api_calls
+            stats['last_latency_ms'] = index.latency * 1000
+            stats['objects_count'] = index.objects_count
+            stats['manifest'] = index.manifest_version is not None
+        if previous is not None and any(changes.values()):
+            logger.info("Changes detected in {}: {}".format(
+                index.model_directory, changes))
+        for version in changes['modified']:
+            logger.warning("Files of version {} have been modified, the "
+                           "version is not reloaded".format(version))
+        return changes
+
+    def get(self, model_directory):
+        if model_directory[-1] != os.sep:
+            model_directory += os.sep
+        with self.lock:
+            return self.indexes.get(model_directory)
+
+    def get_for_version(self, version):
+        return self.get(get_model_directory(version))
+
+    def get_object(self, path):
+        # Returns ETag, size and MD5 of the object from the latest listing
+        # of its model, None if it has not been listed
+        version, file_name = path.rsplit(os.sep, 1)
+        index = self.get_for_version(version + os.sep)
+        if index is None:
+            return None
+        return index.versions.get(version + os.sep, {}).get(file_name)
+
+    def get_etag(self, path):
+        return (self.get_object(path) or {}).get('etag')
+
+    def get_stats(self, model_directory):
+        if model_directory[-1] != os.sep:
+            model_directory += os.sep
+        with self.lock:
+            return dict(self.stats.get(model_directory, {}))
+
+
+remote_indexes = RemoteIndexes()
@@ -0,0 +1,141 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from threading import Lock
+
+import numpy as np
+
+
+def get_batch_size(inference_input: dict):
+    # Batch size is determined by the first dimension of the first input,
+    # the same way as for batch_size=auto
+    first_input = inference_input[list(inference_input.keys())[0]]
+    return first_input.shape[0]
+
+
+def are_inputs_compatible(first_input: dict, second_input: dict):
+    # Inputs can be merged along dimension 0 when they feed the same
+    # tensors with the same data types and per-sample shapes
+    if first_input.keys() != second_input.keys():
+        return False
+    for input_name, input_data in first_input.items():
+        other_data = second_input[input_name]
+        if input_data.shape[1:] != other_data.shape[1:] or \
+                input_data.dtype != other_data.dtype:
+            return False
+    return True
+
+
+class RequestsBatch:
+    # Group of requests executed as a single inference. Inputs are
+    # concatenated along dimension 0 and padded with zeros up to
+    # target_batch_size. It exposes the same set_result interface as
+    # Request, so it can be handled by inference_callback directly.
+    # Outputs are copied for every member request, which allows the infer
+    # request to be released as soon as the results are scattered.
+
+    def __init__(self, requests: list, target_batch_size: int,
+                 release_ireq):
+        self.requests = requests
+        self.release_ireq = release_ireq
+        self.slices = []
+        begin = 0
+        for request in requests:
+            end = begin + get_batch_size(request.inference_input)
+            self.slices.append((request, begin, end))
+            begin = end
+        self.batch_size = begin
+        self.inference_input = self._merge_inputs(target_batch_size)
+
+    def _merge_inputs(self, target_batch_size):
+        merged_input = {}
+        for input_name in self.requests[0].inference_input.keys():
+            tensors = [request.inference_input[input_name] for request in
+                       self.requests]
+            padding = target_batch_size - self.batch_size
+            if padding > 0:
+                tensors.append(np.zeros((padding,) + tensors[0].shape[1:],
+                                        dtype=tensors[0].dtype))
+            merged_input[input_name] = np.concatenate(tensors, axis=0)
+        return merged_input
+
+    def set_result(self, ireq_index, result):
+        if type(result) is str:
+            for request in self.requests:
+                request.set_result(ireq_index=None, result=result)
+        else:
+            for request, begin, end in self.slices:
+                request.set_result(ireq_index=None, result={
+                    output_name: np.copy(output[begin:end]) for
+                    output_name, output in result.items()})
+        self.release_ireq(ireq_index)
+
+
+def split_inputs(inference_input: dict, shards_sizes: list):
+    # Splits all inputs along dimension 0 into consecutive shards
+    shards_inputs = []
+    begin = 0
+    for shard_size in shards_sizes:
+        end = begin + shard_size
+        shards_inputs.append({input_name: input_data[begin:end] for
+                              input_name, input_data in
+                              inference_input.items()})
+        begin = end
+    return shards_inputs
+
+
+class RequestShard:
+    # Part of a sharded request executed as a separate inference
+
+    def __init__(self, sharded_request, shard_index, inference_input):
+        self.sharded_request = sharded_request
+        self.shard_index = shard_index
+        self.inference_input = inference_input
+
+    def set_result(self, ireq_index, result):
+        self.sharded_request.set_shard_result(self.shard_index, result)
+
+
+class ShardedRequest:
+    # Request split along dimension 0 into shards, which are executed as
+    # independent inferences. Shard results are expected to be copied and
+    # their infer requests released (e.g. by RequestsBatch), so that shards
+    # do not hold infer requests while waiting for each other. Outputs are
+    # concatenated once all shards are completed.
+
+    def __init__(self, request, shards_sizes: list):
+        self.request = request
+        self.shards = [RequestShard(self, shard_index, shard_input) for
+                       shard_index, shard_input in
+                       enumerate(split_inputs(request.inference_input,
+                                              shards_sizes))]
+        self.results = [None] * len(self.shards)
+        self.remaining_shards = len(self.shards)
+        self.lock = Lock()
+
+    def set_shard_result(self, shard_index, result):
+        with self.lock:
+            self.results[shard_index] = result
+            self.remaining_shards -= 1
+            if self.remaining_shards > 0:
+                return
+        errors = [result for result in self.results if type(result) is str]
+        if errors:
+            self.request.set_result(ireq_index=None, result=errors[0])
+            return
+        self.request.set_result(ireq_index=None, result={
+            output_name: np.concatenate([result[output_name] for result in
+                                         self.results], axis=0)
+            for output_name in self.results[0].keys()})
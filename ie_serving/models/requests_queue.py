@@ -0,0 +1,159 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import collections
+import queue
+import time
+from threading import Condition, Lock
+
+from ie_serving.logger import get_logger
+
+logger = get_logger(__name__)
+
+STRICT_SCHEDULING = 'strict'
+WEIGHTED_SCHEDULING = 'weighted'
+
+
+def parse_lanes_weights(weights_param, lanes):
+    # Weights are given as comma separated integers, one for each lane.
+    # By default lanes are weighted linearly, from lanes number for the
+    # highest priority lane down to 1 for the lowest one.
+    default_weights = [lanes - lane for lane in range(lanes)]
+    if weights_param is None:
+        return default_weights
+    try:
+        weights = [int(weight) for weight in weights_param.split(',')]
+    except ValueError:
+        weights = []
+    if len(weights) != lanes or min(weights) < 1:
+        logger.warning("Invalid priority lanes weights: {}. Using default "
+                       "weights: {}".format(weights_param, default_weights))
+        return default_weights
+    return weights
+
+
+class RequestsQueue:
+    # Engine requests queue with priority lanes, compatible with the
+    # queue.Queue interface used by the inference thread. Lane 0 has
+    # the highest priority, requests are assigned to lanes by their
+    # priority attribute. With strict scheduling the highest priority
+    # non-empty lane is always served first. With weighted scheduling lanes
+    # are served in proportion to their weights, so lower priority requests
+    # are not starved. maxsize limits the number of requests in all lanes.
+
+    def __init__(self, maxsize=0, lanes=1, scheduling=STRICT_SCHEDULING,
+                 weights=None):
+        self.maxsize = maxsize or 0
+        self.lanes = [collections.deque() for _ in range(max(lanes, 1))]
+        if scheduling not in [STRICT_SCHEDULING, WEIGHTED_SCHEDULING]:
+            logger.warning("Unknown priority scheduling: {}. Using {} "
+                           "scheduling".format(scheduling,
+                                               STRICT_SCHEDULING))
+            scheduling = STRICT_SCHEDULING
+        self.scheduling = scheduling
+        if weights is None:
+            weights = parse_lanes_weights(None, len(self.lanes))
+        self.weights = weights
+        self.credits = list(self.weights)
+        self.mutex = Lock()
+        self.not_empty = Condition(self.mutex)
+        self.not_full = Condition(self.mutex)
+        self.lanes_stats = [{'dequeued': 0, 'total_wait': 0.0,
+                             'max_wait': 0.0} for _ in self.lanes]
+
+    def get_lane(self, priority):
+        return min(max(int(priority), 0), len(self.lanes) - 1)
+
+    def qsize(self):
+        with self.mutex:
+            return self._qsize()
+
+    def _qsize(self):
+        return sum(len(lane) for lane in self.lanes)
+
+    def empty(self):
+        return self.qsize() == 0
+
+    def full(self):
+        with self.mutex:
+            return 0 < self.maxsize <= self._qsize()
+
+    def put(self, request, block=True, timeout=None):
+        lane = self.get_lane(getattr(request, 'priority', 0))
+        with self.not_full:
+            if self.maxsize > 0:
+                if not block:
+                    if self._qsize() >= self.maxsize:
+                        raise queue.Full
+                elif not self.not_full.wait_for(
+                        lambda: self._qsize() < self.maxsize, timeout):
+                    raise queue.Full
+            self.lanes[lane].append((time.time(), request))
+            self.not_empty.notify()
+
+    def put_nowait(self, request):
+        return self.put(request, block=False)
+
+    def get(self, block=True, timeout=None):
+        with self.not_empty:
+            if not block:
+                if not self._qsize():
+                    raise queue.Empty
+            elif not self.not_empty.wait_for(self._qsize, timeout):
+                raise queue.Empty
+            lane = self._select_lane()
+            enqueue_time, request = self.lanes[lane].popleft()
+            wait_time = time.time() - enqueue_time
+            lane_stats = self.lanes_stats[lane]
+            lane_stats['dequeued'] += 1
+            lane_stats['total_wait'] += wait_time
+            lane_stats['max_wait'] = max(lane_stats['max_wait'], wait_time)
+            self.not_full.notify()
+        request.queue_wait = wait_time
+        return request
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def _select_lane(self):
+        non_empty_lanes = [lane for lane, requests in enumerate(self.lanes)
+                           if requests]
+        if self.scheduling == STRICT_SCHEDULING:
+            return non_empty_lanes[0]
+        # Weighted round robin - each lane can be served as many times as
+        # its weight before credits of all waiting lanes are renewed
+        eligible_lanes = [lane for lane in non_empty_lanes
+                          if self.credits[lane] > 0]
+        if not eligible_lanes:
+            self.credits = list(self.weights)
+            eligible_lanes = non_empty_lanes
+        lane = eligible_lanes[0]
+        self.credits[lane] -= 1
+        return lane
+
+    def get_stats(self):
+        # Returns current depth and wait time statistics for each lane
+        with self.mutex:
+            stats = []
+            for lane, lane_stats in enumerate(self.lanes_stats):
+                dequeued = lane_stats['dequeued']
+                stats.append({
+                    'depth': len(self.lanes[lane]),
+                    'dequeued': dequeued,
+                    'avg_wait_ms': lane_stats['total_wait'] / dequeued *
+                    1000 if dequeued else 0.0,
+                    'max_wait_ms': lane_stats['max_wait'] * 1000,
+                })
+            return stats
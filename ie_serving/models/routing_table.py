@@ -0,0 +1,40 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from types import MappingProxyType
+
+
+class RoutingTable:
+    # Immutable snapshot of the versions served by the model and their
+    # engines. A new snapshot is published with a single assignment on each
+    # change, so requests read consistent versions, default version and
+    # engines without locking.
+    def __init__(self, versions, engines):
+        self.versions = frozenset(versions)
+        self.default_version = max(self.versions, default=-1)
+        self.engines = MappingProxyType({
+            version: engine for version, engine in engines.items()
+            if version in self.versions})
+
+    def resolve_version(self, requested_version):
+        # Returns the version serving the request or None if it is not
+        # available. Version 0 stands for the default version.
+        if requested_version == 0:
+            if self.default_version == -1:
+                return None
+            return self.default_version
+        if requested_version in self.versions:
+            return requested_version
+        return None
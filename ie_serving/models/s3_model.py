@@ -14,8 +14,8 @@
 # limitations under the License.
 #
 import os
-import re
-from urllib.parse import urlparse, urlunparse
+import time
+from urllib.parse import urlparse
 
 import boto3
 from botocore import UNSIGNED
@@ -24,132 +24,220 @@ from botocore.client import Config
 
 from ie_serving.config import GLOBAL_CONFIG, S3_CONFIG
 from ie_serving.logger import get_logger
+from ie_serving.models.artifact_cache import artifact_cache
 from ie_serving.models.ir_engine import IrEngine
 from ie_serving.models.model import Model
+from ie_serving.models.ranged_download import ranged_downloader
+from ie_serving.models.remote_index import RemoteIndex, \
+    get_model_directory, load_manifest, remote_indexes
+from ie_serving.models.storage_clients import storage_clients
 
 logger = get_logger(__name__)
 
+NOT_MODIFIED_ERROR_CODES = ('304', 'NotModified')
+NOT_FOUND_ERROR_CODES = ('404', 'NoSuchKey')
+
 
 class S3Model(Model):
+    @staticmethod
+    def get_s3_client(anonymous=False):
+        # Clients are shared by all models and threads, boto3 clients are
+        # thread-safe and keep connections to the endpoint alive
+        signature = UNSIGNED if anonymous else S3_CONFIG['signature']
+        return storage_clients.get(
+            ('s3', S3_CONFIG['endpoint'], anonymous),
+            lambda: boto3.client(
+                's3', endpoint_url=S3_CONFIG['endpoint'],
+                aws_access_key_id=S3_CONFIG['access_key_id'],
+                aws_secret_access_key=S3_CONFIG['secret_access_key'],
+                config=Config(
+                    signature_version=signature,
+                    max_pool_connections=S3_CONFIG['max_pool_connections']),
+                region_name=S3_CONFIG['region']))
+
     @classmethod
-    def s3_list_content(cls, path):
-        s3_resource = boto3.resource(
-            's3', endpoint_url=S3_CONFIG['endpoint'],
-            aws_access_key_id=S3_CONFIG['access_key_id'],
-            aws_secret_access_key=S3_CONFIG['secret_access_key'],
-            config=Config(signature_version=S3_CONFIG['signature']),
-            region_name=S3_CONFIG['region'])
+    def s3_call(cls, bucket_name, function):
+        # Calls function with the S3 client. Buckets which can't be
+        # accessed with the credentials are accessed anonymously and the
+        # decision is kept for the following calls.
+        anonymous_key = ('s3', S3_CONFIG['endpoint'], bucket_name)
+        if storage_clients.is_anonymous(anonymous_key):
+            return function(cls.get_s3_client(anonymous=True))
+        try:
+            return function(cls.get_s3_client())
+        except (exceptions.ClientError, exceptions.NoCredentialsError) as e:
+            # Responses to conditional requests and requests of missing
+            # objects are not access errors
+            if isinstance(e, exceptions.ClientError) and \
+                    e.response['Error']['Code'] in \
+                    NOT_MODIFIED_ERROR_CODES + NOT_FOUND_ERROR_CODES:
+                raise
+            result = function(cls.get_s3_client(anonymous=True))
+            logger.info('Switching to anonymous access to S3 bucket '
+                        '{}'.format(bucket_name))
+            storage_clients.set_anonymous(anonymous_key)
+            return result
+
+    @classmethod
+    def s3_list_objects(cls, path):
+        # Returns (key, etag, size, md5) tuples of objects with the path
+        # prefix and the number of API calls made. ETags of objects uploaded
+        # in multiple parts, with '-' suffix, are not MD5 checksums.
         parsed_path = urlparse(path)
-        my_bucket = s3_resource.Bucket(parsed_path.netloc)
-        content_list = []
-        for object in my_bucket.objects.filter(Prefix=parsed_path.path[1:]):
-            content_list.append(object.key)
-        return content_list
+        bucket_name = parsed_path.netloc
+
+        def list_objects(s3_client):
+            objects = []
+            api_calls = 0
+            paginator = s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=bucket_name,
+                                           Prefix=parsed_path.path[1:]):
+                api_calls += 1
+                for object in page.get('Contents', []):
+                    etag = object['ETag'].strip('"')
+                    md5 = etag if S3_CONFIG['verify_etag_checksum'] and \
+                        '-' not in etag else None
+                    objects.append((object['Key'], etag, object['Size'],
+                                    md5))
+            return objects, api_calls
+        return cls.s3_call(bucket_name, list_objects)
 
     @classmethod
-    def s3_download_file(cls, path):
-        if path is None:
-            return None
+    def s3_download_file(cls, path, local_path):
         parsed_path = urlparse(path)
         bucket_name = parsed_path.netloc
         file_path = parsed_path.path[1:]
-        tmp_path = os.path.join('/tmp', file_path.split(os.sep)[-1])
-        try:
-            s3_client = boto3.client(
-                's3', endpoint_url=S3_CONFIG['endpoint'],
-                aws_access_key_id=S3_CONFIG['access_key_id'],
-                aws_secret_access_key=S3_CONFIG['secret_access_key'],
-                config=Config(signature_version=S3_CONFIG['signature']),
-                region_name=S3_CONFIG['region'])
-            s3_transfer = boto3.s3.transfer.S3Transfer(s3_client)
-            s3_transfer.download_file(bucket_name, file_path, tmp_path)
-        except exceptions.ClientError:
-            s3_client = boto3.client(
-                's3', endpoint_url=S3_CONFIG['endpoint'],
-                aws_access_key_id=S3_CONFIG['access_key_id'],
-                aws_secret_access_key=S3_CONFIG['secret_access_key'],
-                config=Config(signature_version=UNSIGNED),
-                region_name=S3_CONFIG['region'])
-            s3_transfer = boto3.s3.transfer.S3Transfer(s3_client)
-            s3_transfer.download_file(bucket_name, file_path, tmp_path)
-        return tmp_path
+        remote_object = remote_indexes.get_object(path)
+        if remote_object is None:
+            # Size of objects not found in the listing is not known
+            cls.s3_call(bucket_name,
+                        lambda s3_client: s3_client.download_file(
+                            bucket_name, file_path, local_path))
+            return
+
+        def read_range(start, end):
+            return cls.s3_call(bucket_name, lambda s3_client: s3_client.
+                               get_object(Bucket=bucket_name, Key=file_path,
+                                          Range='bytes={}-{}'.format(
+                                              start, end))['Body'].read())
+        ranged_downloader.download(path, local_path, remote_object['size'],
+                                   read_range, remote_object['md5'])
 
     @classmethod
     def get_versions(cls, model_directory):
+        # Model directory is listed once per update, unless it has
+        # a manifest, version files are looked up in the published index
         if model_directory[-1] != os.sep:
             model_directory += os.sep
-        parsed_model_dir = urlparse(model_directory)
-        content_list = cls.s3_list_content(model_directory)
-        pattern = re.compile('(' + parsed_model_dir.path[1:-1] + r'/\d+/).*$')
-        versions = set([m.group(1) for m in (pattern.match(element) for
-                                             element in content_list) if m])
+        index = cls._read_manifest_index(model_directory)
+        if index is None:
+            index = cls._list_index(model_directory, model_directory)
+        remote_indexes.publish(index)
+        return index.get_versions()
 
-        return [urlunparse((parsed_model_dir.scheme, parsed_model_dir.netloc,
-                            version, parsed_model_dir.params,
-                            parsed_model_dir.query, parsed_model_dir.fragment))
-                for version in versions]
+    @classmethod
+    def _read_manifest_index(cls, model_directory):
+        # Manifest is read again only when its ETag has changed, so
+        # an unchanged model costs a single request returning 304
+        manifest_name = GLOBAL_CONFIG['models_manifest_filename']
+        if manifest_name is None:
+            return None
+        parsed_path = urlparse(model_directory + manifest_name)
+        bucket_name = parsed_path.netloc
+        previous = remote_indexes.get(model_directory)
+        request = {'Bucket': bucket_name, 'Key': parsed_path.path[1:]}
+        if previous is not None and previous.manifest_version is not None:
+            request['IfNoneMatch'] = '"{}"'.format(previous.manifest_version)
+        start_time = time.time()
+        try:
+            response = cls.s3_call(bucket_name, lambda s3_client: s3_client.
+                                   get_object(**request))
+            content = response['Body'].read()
+        except exceptions.ClientError as e:
+            if e.response['Error']['Code'] in NOT_MODIFIED_ERROR_CODES:
+                return previous.get_unchanged(1, time.time() - start_time)
+            if e.response['Error']['Code'] in NOT_FOUND_ERROR_CODES:
+                logger.debug("Manifest of {} not found, the model directory "
+                             "is listed".format(model_directory))
+                return None
+            raise
+        return load_manifest(model_directory, content,
+                             response['ETag'].strip('"'), 1,
+                             time.time() - start_time)
+
+    @classmethod
+    def _list_index(cls, path, model_directory):
+        start_time = time.time()
+        objects, api_calls = cls.s3_list_objects(path)
+        return RemoteIndex(model_directory, objects, api_calls,
+                           time.time() - start_time)
+
+    @classmethod
+    def _get_index(cls, version):
+        # Version is listed if its model has not been listed yet
+        index = remote_indexes.get_for_version(version)
+        if index is None:
+            index = cls._list_index(version, get_model_directory(version))
+        return index
+
+    @classmethod
+    def get_listing_stats(cls, model_directory):
+        return remote_indexes.get_stats(model_directory)
 
     @classmethod
     def get_version_files(cls, version):
-        parsed_version_path = urlparse(version)
-        content_list = cls.s3_list_content(version)
-        xml_pattern = re.compile(
-            parsed_version_path.path[1:-1] + r'/[^/]+\.xml$')
-        bin_pattern = re.compile(
-            parsed_version_path.path[1:-1] + r'/[^/]+\.bin$')
-        xml_file = list(filter(xml_pattern.match, content_list))
-        bin_file = list(filter(bin_pattern.match, content_list))
-        if len(xml_file) != 0 and len(bin_file) != 0:
-            if os.path.splitext(xml_file[0])[0] == \
-                    os.path.splitext(bin_file[0])[0]:
-                xml_file[0] = urlunparse(
-                    (parsed_version_path.scheme, parsed_version_path.netloc,
-                     xml_file[0], parsed_version_path.params,
-                     parsed_version_path.query, parsed_version_path.fragment))
-                bin_file[0] = urlunparse(
-                    (parsed_version_path.scheme, parsed_version_path.netloc,
-                     bin_file[0], parsed_version_path.params,
-                     parsed_version_path.query, parsed_version_path.fragment))
-                mapping_config = cls._get_mapping_config(version)
-                return xml_file[0], bin_file[0], mapping_config
-        return None, None, None
+        xml_file, bin_file = cls._get_index(version).get_version_files(
+            version)
+        if xml_file is None or bin_file is None:
+            return None, None, None
+        return xml_file, bin_file, cls._get_mapping_config(version)
 
     @classmethod
     def _get_mapping_config(cls, version):
-        content_list = cls.s3_list_content(version)
-        mapping_config = urlparse(version).path[1:] + GLOBAL_CONFIG[
-            'mapping_config_filename']
-        if mapping_config in content_list:
-            return version + GLOBAL_CONFIG['mapping_config_filename']
-        else:
-            return None
+        return cls._get_index(version).get_file(
+            version, GLOBAL_CONFIG['mapping_config_filename'])
+
+    @classmethod
+    def _get_warmup_file(cls, version):
+        return cls._get_index(version).get_file(
+            version, GLOBAL_CONFIG['warmup_data_filename'])
 
     @classmethod
     def get_engine_for_version(cls, model_name, version_attributes):
-        version_attributes['xml_file'], version_attributes['bin_file'], \
-            version_attributes['mapping_config'] = cls.create_local_mirror(
-            version_attributes)
+        # Attributes are copied, so the version can be loaded again from
+        # the remote paths, e.g. on demand after it's unloaded
+        local_attributes = dict(version_attributes)
+        local_attributes['xml_file'], local_attributes['bin_file'], \
+            local_attributes['mapping_config'], \
+            local_attributes['warmup_file'] = cls.create_local_mirror(
+                version_attributes)
         logger.info('Downloaded files from S3')
 
-        engine_spec = cls._get_engine_spec(model_name, version_attributes)
-        engine = IrEngine.build(**engine_spec)
-
-        cls.delete_local_mirror([version_attributes['xml_file'],
-                                 version_attributes['bin_file'],
-                                 version_attributes['mapping_config']])
-        logger.info('Deleted temporary files')
+        try:
+            engine_spec = cls._get_engine_spec(model_name, local_attributes)
+            engine = IrEngine.build(**engine_spec)
+        finally:
+            cls.delete_local_mirror([local_attributes['xml_file'],
+                                     local_attributes['bin_file'],
+                                     local_attributes['mapping_config'],
+                                     local_attributes['warmup_file']])
+        logger.info('Released local files')
         return engine
 
     @classmethod
     def create_local_mirror(cls, version_attributes):
-        local_xml_file = cls.s3_download_file(version_attributes['xml_file'])
-        local_bin_file = cls.s3_download_file(version_attributes['bin_file'])
-        local_mapping_config = cls.s3_download_file(
-            version_attributes['mapping_config'])
-        return local_xml_file, local_bin_file, local_mapping_config
+        # Objects with ETags from the model listing are taken from the
+        # artifact cache and downloaded only when they are not cached.
+        # All files are fetched concurrently.
+        paths = [version_attributes.get(file_key) for file_key in
+                 ['xml_file', 'bin_file', 'mapping_config', 'warmup_file']]
+        return tuple(artifact_cache.fetch_all(
+            [(path, None if path is None else remote_indexes.get_etag(path))
+             for path in paths], cls.s3_download_file))
 
     @classmethod
     def delete_local_mirror(cls, files_paths):
+        # Cached files are kept for the following loads, temporary files
+        # are removed
         for file_path in files_paths:
-            if file_path is not None:
-                os.remove(file_path)
+            artifact_cache.release(file_path)
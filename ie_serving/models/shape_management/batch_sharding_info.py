@@ -0,0 +1,54 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from ie_serving.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BatchShardingInfo:
+    def __init__(self, batch_sharding_param, num_ireq=1):
+        # batch_sharding_param is either None (feature disabled) or
+        # a dictionary with max_shards and min_shard_size keys. By default
+        # batch is split across all infer requests of the engine.
+        self.enabled = False
+        self.max_shards = 1
+        self.min_shard_size = 1
+        if batch_sharding_param is not None:
+            self.max_shards = int(batch_sharding_param.get('max_shards',
+                                                           num_ireq))
+            self.min_shard_size = int(batch_sharding_param.get(
+                'min_shard_size', 1))
+            self.enabled = self.max_shards > 1
+
+    def disable(self, reason):
+        logger.warning("Batch sharding disabled: {}".format(reason))
+        self.enabled = False
+
+    def split(self, batch_size: int):
+        # Returns list of (shard_size, network_batch_size) pairs. All shards
+        # have equal size, so they are executed by the same network - the
+        # last shard is padded if batch is not divisible.
+        shards_number = min(self.max_shards,
+                            batch_size // self.min_shard_size)
+        if shards_number <= 1:
+            return [(batch_size, batch_size)]
+        network_batch_size = -(-batch_size // shards_number)
+        shards = []
+        while batch_size > 0:
+            shards.append((min(network_batch_size, batch_size),
+                           network_batch_size))
+            batch_size -= network_batch_size
+        return shards
@@ -0,0 +1,49 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+class BatchSizePool:
+
+    def __init__(self, batch_size_pool_param):
+        # batch_sizes field is a sorted list of batch sizes, for which
+        # networks are loaded at model start
+        self.batch_sizes = []
+        if batch_size_pool_param is not None:
+            self.batch_sizes = sorted(set(int(batch_size) for batch_size in
+                                          batch_size_pool_param))
+
+    @property
+    def enabled(self):
+        return len(self.batch_sizes) > 0
+
+    def find_batch_size(self, batch_size: int):
+        # Returns the smallest batch size from the pool fitting the input
+        for pool_batch_size in self.batch_sizes:
+            if pool_batch_size >= batch_size:
+                return pool_batch_size
+        return None
+
+    def split(self, batch_size: int):
+        # Returns list of (shard_size, network_batch_size) pairs. Batches
+        # exceeding the largest network are split into shards of its size,
+        # the remainder is handled by the smallest fitting network.
+        max_batch_size = self.batch_sizes[-1]
+        shards = []
+        while batch_size > max_batch_size:
+            shards.append((max_batch_size, max_batch_size))
+            batch_size -= max_batch_size
+        shards.append((batch_size, self.find_batch_size(batch_size)))
+        return shards
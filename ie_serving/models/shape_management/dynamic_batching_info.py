@@ -0,0 +1,38 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from ie_serving.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DynamicBatchingInfo:
+    def __init__(self, dynamic_batching_param):
+        # dynamic_batching_param is either None (feature disabled) or
+        # a dictionary with max_batch_size and max_delay_ms keys
+        self.enabled = False
+        self.max_batch_size = None
+        self.max_delay = 0
+        if dynamic_batching_param is not None:
+            self.max_batch_size = int(dynamic_batching_param.get(
+                'max_batch_size', 1))
+            # Delay is stored in seconds, as expected by queue.get timeout
+            self.max_delay = float(dynamic_batching_param.get(
+                'max_delay_ms', 0)) / 1000
+            self.enabled = self.max_batch_size > 1
+
+    def disable(self, reason):
+        logger.warning("Dynamic batching disabled: {}".format(reason))
+        self.enabled = False
@@ -0,0 +1,110 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import numpy as np
+
+from ie_serving.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ShapeBuckets:
+
+    def __init__(self, shape_buckets_param, net_inputs):
+        # buckets field is a list of dicts of input_name:shape pairs,
+        # sorted from the smallest to the largest one. Each bucket
+        # corresponds to a single network loaded at model start.
+        self.buckets = []
+        if shape_buckets_param is not None:
+            self.buckets = [self._bucket_as_dict(bucket, net_inputs) for
+                            bucket in shape_buckets_param]
+            self.buckets.sort(key=self._get_bucket_volume)
+
+    @property
+    def enabled(self):
+        return len(self.buckets) > 0
+
+    def _bucket_as_dict(self, bucket, net_inputs):
+        if type(bucket) is list:
+            if len(net_inputs) > 1:
+                raise Exception("Noname shape bucket specified for model "
+                                "with multiple inputs")
+            bucket = {list(net_inputs.keys())[0]: bucket}
+        shapes = {input_name: tuple(input_info.shape) for
+                  input_name, input_info in net_inputs.items()}
+        for input_name, shape in bucket.items():
+            if input_name not in shapes:
+                raise Exception("Shape bucket specified for unknown "
+                                "input {}".format(input_name))
+            shapes[input_name] = tuple(int(dim) for dim in shape)
+        return shapes
+
+    @staticmethod
+    def _get_bucket_volume(bucket):
+        return sum(int(np.prod(shape)) for shape in bucket.values())
+
+    def find_bucket(self, inference_input: dict):
+        # Returns the smallest bucket, which all inputs fit into
+        for bucket in self.buckets:
+            if all(self._fits(input_data.shape, bucket[input_name]) for
+                   input_name, input_data in inference_input.items()):
+                return bucket
+        return None
+
+    @staticmethod
+    def _fits(shape, bucket_shape):
+        return len(shape) == len(bucket_shape) and \
+            all(dim <= bucket_dim for dim, bucket_dim in
+                zip(shape, bucket_shape))
+
+    @staticmethod
+    def pad_inputs(inference_input: dict, bucket: dict):
+        padded_input = {}
+        for input_name, input_data in inference_input.items():
+            padding = [(0, bucket_dim - dim) for dim, bucket_dim in
+                       zip(input_data.shape, bucket[input_name])]
+            if any(after for _, after in padding):
+                input_data = np.pad(input_data, padding, mode='constant')
+            padded_input[input_name] = input_data
+        return padded_input
+
+    @staticmethod
+    def crop_outputs(outputs: dict, shape, bucket_shape):
+        # Outputs are cropped relative to the first input. Dimensions equal
+        # to the bucket dimension are cropped to the input dimension,
+        # dimensions scaled by an integer factor are cropped proportionally.
+        # Other dimensions are left untouched.
+        cropped_outputs = {}
+        for output_name, output in outputs.items():
+            if output.ndim != len(shape):
+                cropped_outputs[output_name] = output
+                continue
+            crop = []
+            for dim, bucket_dim, output_dim in zip(shape, bucket_shape,
+                                                   output.shape):
+                if dim == bucket_dim:
+                    crop.append(slice(None))
+                elif output_dim == bucket_dim:
+                    crop.append(slice(0, dim))
+                elif bucket_dim % output_dim == 0:
+                    stride = bucket_dim // output_dim
+                    crop.append(slice(0, -(-dim // stride)))
+                elif output_dim % bucket_dim == 0:
+                    scale = output_dim // bucket_dim
+                    crop.append(slice(0, dim * scale))
+                else:
+                    crop.append(slice(None))
+            cropped_outputs[output_name] = output[tuple(crop)]
+        return cropped_outputs
@@ -0,0 +1,59 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import threading
+
+
+class StorageClientsPool:
+    # Storage clients shared by all models, created once per key (backend,
+    # endpoint and credentials) and reused, so connections are kept alive
+    # and credentials are looked up once. Clients which are not thread-safe
+    # are created once per thread. Anonymous access decisions are cached
+    # per backend or bucket.
+    def __init__(self):
+        self.clients = {}
+        self.thread_clients = threading.local()
+        self.anonymous = set()
+        self.lock = threading.Lock()
+
+    def get(self, key, factory, per_thread=False):
+        if per_thread:
+            clients = getattr(self.thread_clients, 'clients', None)
+            if clients is None:
+                clients = self.thread_clients.clients = {}
+            if key not in clients:
+                clients[key] = factory()
+            return clients[key]
+        with self.lock:
+            if key not in self.clients:
+                self.clients[key] = factory()
+            return self.clients[key]
+
+    def is_anonymous(self, key):
+        with self.lock:
+            return key in self.anonymous
+
+    def set_anonymous(self, key):
+        with self.lock:
+            self.anonymous.add(key)
+
+    def clear(self):
+        with self.lock:
+            self.clients.clear()
+            self.anonymous.clear()
+        self.thread_clients = threading.local()
+
+
+storage_clients = StorageClientsPool()
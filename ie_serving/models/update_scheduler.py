@@ -0,0 +1,213 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ie_serving.config import GLOBAL_CONFIG
+from ie_serving.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Interval in seconds of checking which models are due for an update
+SCHEDULER_TICK = 0.1
+# Interval in seconds of unloading idle versions of lazily loaded models
+IDLE_SWEEP_INTERVAL = 1.0
+
+
+class ModelUpdateState:
+    def __init__(self, next_update, last_listing_time):
+        self.next_update = next_update
+        self.in_progress = False
+        # Set when a change in the watched model directory is reported
+        self.changed = False
+        self.failures = 0
+        self.updates_count = 0
+        self.listings_count = 0
+        self.last_listing_time = last_listing_time
+        self.last_update_time = None
+        self.last_update_duration = None
+        self.last_listing_duration = None
+        self.last_listing_api_calls = None
+
+
+class UpdateScheduler:
+    # Runs updates of all models in parallel on a bounded pool, so a slow
+    # storage listing or engine loading of one model doesn't delay change
+    # detection of the others. Each model is updated every interval seconds
+    # (the default or the one set for the model) with random jitter, a
+    # fraction of the interval. After failed updates the interval is
+    # doubled, up to max_backoff seconds.
+    # Storage of watched models is listed only when a change is reported
+    # or every rescan_interval seconds (0 - never).
+    # Idle versions are unloaded on their own schedule, also for models
+    # whose updates are disabled.
+    def __init__(self, max_workers, default_interval, jitter=0.0,
+                 max_backoff=0, rescan_interval=0):
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='models_update')
+        self.default_interval = default_interval
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.rescan_interval = rescan_interval
+        self.intervals = {}
+        self.watched = set()
+        self.states = {}
+        self.last_idle_sweep = 0.0
+        self.lock = threading.Lock()
+
+    def set_interval(self, model_name, interval):
+        # Interval set to None restores the default one, 0 disables updates
+        # of the model
+        with self.lock:
+            if interval is None:
+                self.intervals.pop(model_name, None)
+            else:
+                self.intervals[model_name] = interval
+
+    def set_watched(self, model_name):
+        with self.lock:
+            self.watched.add(model_name)
+
+    def request_update(self, model_name):
+        # Called when a change in the watched model directory is reported,
+        # the model is updated as soon as possible
+        with self.lock:
+            state = self.states.get(model_name)
+            if state is None:
+                return
+            state.changed = True
+            state.next_update = time.time()
+
+    def _is_listing_needed(self, model_name, state, now):
+        if model_name not in self.watched or state.changed:
+            return True
+        return self.rescan_interval > 0 and \
+            now - state.last_listing_time >= self.rescan_interval
+
+    def get_interval(self, model_name):
+        return self.intervals.get(model_name, self.default_interval)
+
+    def get_delay(self, interval, failures=0):
+        delay = interval * 2 ** failures
+        if failures:
+            delay = min(delay, max(self.max_backoff, interval))
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def schedule_updates(self, models):
+        # Submits updates of the models which are due and not being updated
+        now = time.time()
+        # Models are added to the dictionary while they're loading
+        for model_name in list(models):
+            with self.lock:
+                interval = self.get_interval(model_name)
+                if interval <= 0:
+                    continue
+                state = self.states.get(model_name)
+                if state is None:
+                    state = ModelUpdateState(now + self.get_delay(interval),
+                                             now)
+                    self.states[model_name] = state
+                if state.in_progress or now < state.next_update:
+                    continue
+                state.in_progress = True
+                list_versions = self._is_listing_needed(model_name, state,
+                                                        now)
+                state.changed = False
+            self.executor.submit(self._update, models, model_name, state,
+                                 list_versions)
+
+    def unload_idle_engines(self, models):
+        # Unloading only checks the engines and starts threads removing
+        # the idle ones, so it's done in the calling thread
+        now = time.time()
+        if now - self.last_idle_sweep < IDLE_SWEEP_INTERVAL:
+            return
+        self.last_idle_sweep = now
+        for model_name, model in list(models.items()):
+            try:
+                model.unload_idle_engines()
+            except Exception as e:
+                logger.error("Unexpected error occurred while unloading "
+                             "idle versions of model {}: {}".format(
+                                 model_name, str(e)))
+
+    def _update(self, models, model_name, state, list_versions=True):
+        start_time = time.time()
+        model = models.get(model_name)
+        try:
+            succeeded = model is None or \
+                model.update(list_versions=list_versions) is not False
+        except Exception as e:
+            logger.error("Unexpected error occurred while updating model "
+                         "{}: {}".format(model_name, str(e)))
+            succeeded = False
+        end_time = time.time()
+        with self.lock:
+            state.failures = 0 if succeeded else state.failures + 1
+            state.updates_count += 1
+            state.last_update_time = end_time
+            state.last_update_duration = end_time - start_time
+            if list_versions:
+                # Failed listing is repeated on the next update
+                state.changed = state.changed or not succeeded
+                state.listings_count += 1
+                state.last_listing_time = start_time
+                if model is not None:
+                    state.last_listing_duration = model.listing_duration
+                    state.last_listing_api_calls = model.listing_api_calls
+            state.next_update = end_time + self.get_delay(
+                self.get_interval(model_name), state.failures)
+            state.in_progress = False
+        if state.failures:
+            logger.warning("Update of model {} failed {} times in a row, "
+                           "next attempt in {:.1f} s".format(
+                               model_name, state.failures,
+                               state.next_update - end_time))
+        logger.debug("Model {} updated in {:.1f} ms".format(
+            model_name, state.last_update_duration * 1000))
+
+    def get_stats(self):
+        with self.lock:
+            return {model_name: {
+                'interval': self.get_interval(model_name),
+                'watched': model_name in self.watched,
+                'next_update': state.next_update,
+                'updates_count': state.updates_count,
+                'listings_count': state.listings_count,
+                'failures': state.failures,
+                'last_update_time': state.last_update_time,
+                'last_update_duration_ms': self._to_ms(
+                    state.last_update_duration),
+                'last_listing_duration_ms': self._to_ms(
+                    state.last_listing_duration),
+                'last_listing_api_calls': state.last_listing_api_calls,
+            } for model_name, state in self.states.items()}
+
+    @staticmethod
+    def _to_ms(duration):
+        if duration is None:
+            return None
+        return duration * 1000
+
+
+update_scheduler = UpdateScheduler(
+    max_workers=GLOBAL_CONFIG['models_update_workers'],
+    default_interval=GLOBAL_CONFIG['file_system_poll_wait_seconds'],
+    jitter=GLOBAL_CONFIG['models_update_jitter'],
+    max_backoff=GLOBAL_CONFIG['models_update_max_backoff_seconds'],
+    rescan_interval=GLOBAL_CONFIG['local_models_rescan_seconds'])
@@ -0,0 +1,111 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import time
+
+import numpy as np
+
+from ie_serving.logger import get_logger
+
+logger = get_logger(__name__)
+
+ZEROS = 'zeros'
+RANDOM = 'random'
+FILE = 'file'
+
+PRECISION_DTYPE = {
+    'FP32': np.float32,
+    'FP16': np.float16,
+    'I32': np.int32,
+    'I16': np.int16,
+    'I8': np.int8,
+    'U16': np.uint16,
+    'U8': np.uint8,
+}
+
+
+class WarmupInfo:
+    def __init__(self, warmup_param):
+        # warmup_param is either None (feature disabled) or a dictionary
+        # with data (zeros, random or file) and iterations keys
+        self.enabled = warmup_param is not None
+        self.data = ZEROS
+        self.iterations = 1
+        if warmup_param is not None:
+            self.data = warmup_param.get('data', ZEROS)
+            self.iterations = warmup_param.get('iterations', 1)
+
+
+def generate_inputs(net, data=RANDOM):
+    inputs = {}
+    for input_name, input_info in net.inputs.items():
+        dtype = PRECISION_DTYPE.get(input_info.precision, np.float32)
+        if data == ZEROS:
+            inputs[input_name] = np.zeros(input_info.shape, dtype=dtype)
+        elif np.issubdtype(dtype, np.integer):
+            # Integer inputs cover the whole range of their type
+            dtype_info = np.iinfo(dtype)
+            inputs[input_name] = np.random.randint(
+                dtype_info.min, dtype_info.max + 1, size=input_info.shape,
+                dtype=dtype)
+        else:
+            inputs[input_name] = np.random.rand(
+                *input_info.shape).astype(dtype)
+    return inputs
+
+
+def load_inputs(warmup_file):
+    # Recorded sample inputs are stored in npz file with arrays named
+    # after network inputs
+    with np.load(warmup_file) as warmup_data:
+        return {input_name: warmup_data[input_name] for input_name in
+                warmup_data.files}
+
+
+def get_warmup_inputs(model_name, model_version, net, warmup_info,
+                      recorded_inputs=None):
+    # Recorded inputs are used only if they match the shapes of all
+    # network inputs, otherwise zeros are used
+    if warmup_info.data == FILE:
+        if recorded_inputs is not None and all(
+                input_name in recorded_inputs and
+                list(recorded_inputs[input_name].shape) ==
+                list(input_info.shape) for input_name, input_info in
+                net.inputs.items()):
+            return {input_name: recorded_inputs[input_name] for input_name
+                    in net.inputs.keys()}
+        logger.warning("[Model: {}, version: {}] --- Warmup data file is "
+                       "missing or doesn't match network inputs, zeros will "
+                       "be used".format(model_name, model_version))
+        return generate_inputs(net, ZEROS)
+    return generate_inputs(net, warmup_info.data)
+
+
+def run_warmup(model_name, model_version, exec_net, num_ireq, inputs,
+               iterations):
+    # Runs the inputs through every infer request, so that the first
+    # requests don't pay for lazy allocations. Returns duration in ms.
+    start_time = time.time()
+    for _ in range(iterations):
+        for ireq_index in range(num_ireq):
+            exec_net.requests[ireq_index].async_infer(inputs)
+        for ireq_index in range(num_ireq):
+            exec_net.requests[ireq_index].wait(-1)
+    duration = (time.time() - start_time) * 1000
+    logger.info("[Model: {}, version: {}] --- Warmup with {} iterations on "
+                "{} infer requests completed in {:.1f} ms".format(
+                    model_name, model_version, iterations, num_ireq,
+                    duration))
+    return duration
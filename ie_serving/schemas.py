@@ -48,6 +48,134 @@ all_schema = {
     'properties': {'all': {'type': 'object'}},
 }
 
+dynamic_batching_schema = {
+    'type': 'object',
+    'required': ['max_batch_size'],
+    'properties': {
+        'max_batch_size': {
+            'type': 'integer',
+            'minimum': 1,
+        },
+        'max_delay_ms': {
+            'type': 'number',
+            'minimum': 0,
+        },
+    },
+}
+
+shape_schema = {
+    'type': 'array',
+    'items': {
+        'type': 'integer',
+        'minimum': 1,
+    },
+}
+
+shape_buckets_schema = {
+    'type': 'array',
+    'minItems': 1,
+    'items': {
+        'anyOf': [
+            shape_schema,
+            {
+                'type': 'object',
+                'additionalProperties': shape_schema,
+            },
+        ],
+    },
+}
+
+batch_size_pool_schema = {
+    'type': 'array',
+    'minItems': 1,
+    'items': {
+        'type': 'integer',
+        'minimum': 1,
+    },
+}
+
+batch_sharding_schema = {
+    'type': 'object',
+    'properties': {
+        'max_shards': {
+            'type': 'integer',
+            'minimum': 1,
+        },
+        'min_shard_size': {
+            'type': 'integer',
+            'minimum': 1,
+        },
+    },
+}
+
+admission_control_schema = {
+    'type': 'object',
+    'properties': {
+        'max_queue_depth': {
+            'type': 'integer',
+            'minimum': 1,
+        },
+        'max_estimated_wait_ms': {
+            'type': 'number',
+            'minimum': 0,
+        },
+    },
+}
+
+autotune_schema = {
+    'type': 'object',
+    'properties': {
+        'objective': {
+            'type': 'string',
+            'enum': ['latency', 'throughput'],
+        },
+        'nireq': {
+            'type': 'array',
+            'minItems': 1,
+            'items': {
+                'type': 'integer',
+                'minimum': 1,
+            },
+        },
+        'streams': {
+            'type': 'array',
+            'minItems': 1,
+            'items': {
+                'type': 'integer',
+                'minimum': 1,
+            },
+        },
+        'duration_ms': {
+            'type': 'number',
+            'minimum': 0,
+        },
+    },
+}
+
+lazy_loading_schema = {
+    'type': 'object',
+    'properties': {
+        'idle_timeout_s': {
+            'type': 'number',
+            'minimum': 0,
+        },
+    },
+}
+
+warmup_schema = {
+    'type': 'object',
+    'properties': {
+        'data': {
+            'type': 'string',
+            'enum': ['zeros', 'random', 'file'],
+        },
+        'iterations': {
+            'type': 'integer',
+            'minimum': 1,
+        },
+    },
+}
+
 models_config_schema = {
     'definitions': {
         'model_config': {
@@ -60,12 +188,23 @@ models_config_schema = {
                     'properties': {
                         'name': {'type': 'string'},
                         'base_path': {'type': 'string'},
+                        'load_priority': {'type': 'integer', 'minimum': 0},
+                        'update_interval_s': {'type': 'number',
+                                              'minimum': 0},
                         'batch_size': {'type': ['integer', 'string']},
                         'model_version_policy': {'type': 'object'},
                         'shape': {'type': ['object', 'string']},
                         'nireq': {'type': 'integer'},
                         'target_device': {'type': 'string'},
-                        'plugin_config': {'type': 'object'}
+                        'plugin_config': {'type': 'object'},
+                        'dynamic_batching': dynamic_batching_schema,
+                        'shape_buckets': shape_buckets_schema,
+                        'batch_size_pool': batch_size_pool_schema,
+                        'batch_sharding': batch_sharding_schema,
+                        'admission_control': admission_control_schema,
+                        'autotune': autotune_schema,
+                        'lazy_loading': lazy_loading_schema,
+                        'warmup': warmup_schema,
                     }
                 }
             }
@@ -78,3 +217,24 @@ models_config_schema = {
         'items': {"$ref": "#/definitions/model_config"},
     }},
 }
+
+manifest_schema = {
+    'type': 'object',
+    'required': ['versions'],
+    'properties': {'versions': {
+        'type': 'object',
+        'patternProperties': {r'^\d+$': {
+            'type': 'object',
+            'additionalProperties': {
+                'type': 'object',
+                'required': ['size', 'md5'],
+                'properties': {
+                    'size': {'type': 'integer', 'minimum': 0},
+                    'md5': {'type': 'string',
+                            'pattern': '^[0-9a-f]{32}$'},
+                },
+            },
+        }},
+        'additionalProperties': False,
+    }},
+}
@@ -15,6 +15,8 @@
 #
 
 WRONG_MODEL_SPEC = 'Servable not found for request: Specific({}, {})'
+VERSION_NOT_LOADED = 'Servable could not be loaded for request: ' \
+                     'Specific({}, {})'
 INVALID_INPUT_KEY = 'input tensor alias not found in signature: %s. ' \
                     'Inputs expected to be in the set {%s}.'
 INVALID_SHAPE = 'The input data is incorrect. Obtained shape {}, ' \
@@ -23,6 +25,8 @@ INVALID_METADATA_FIELD = 'Metadata field {} is not supported'
 
 INVALID_BATCHSIZE = 'Input batch size is incorrect. Obtained batch size {}, '\
                     'required batch size {}'
+INVALID_DYNAMIC_BATCHSIZE = 'Input batch size is incorrect. Obtained batch ' \
+                            'size {}, maximal batch size {}'
 CONFLICTING_PARAMS_WARNING = "Both shape and batch_size parameters " \
                               "are set for model: {}. Assuming that model is"\
                               " reshapable - batch_size will be ignored"
@@ -41,3 +45,16 @@ OUTPUT_REPRESENTATION = {
 
 GRPC = 0
 REST = 1
+
+# Name of gRPC metadata key and HTTP header with request priority
+PRIORITY_METADATA_KEY = 'x-priority'
+PRIORITY_HEADER = 'X-Priority'
+# Name of HTTP header with request timeout in milliseconds
+TIMEOUT_HEADER = 'X-Request-Timeout-Ms'
+# Name of gRPC trailing metadata key and HTTP header with the number of
+# seconds after which rejected request can be retried
+RETRY_AFTER_METADATA_KEY = 'retry-after'
+RETRY_AFTER_HEADER = 'Retry-After'
+
+DEADLINE_EXCEEDED = 'Deadline exceeded before the inference completion'
+REQUEST_CANCELLED = 'Request cancelled by the client'
@@ -25,7 +25,8 @@ from tensorflow.python.framework import tensor_util as tensor_util
 from ie_serving.config import GLOBAL_CONFIG
 from ie_serving.models.shape_management.utils import BatchingMode, ShapeMode
 from ie_serving.server.constants import \
-    INVALID_INPUT_KEY, INVALID_SHAPE, INVALID_BATCHSIZE, GRPC, REST
+    INVALID_INPUT_KEY, INVALID_SHAPE, INVALID_BATCHSIZE, \
+    INVALID_DYNAMIC_BATCHSIZE, DEADLINE_EXCEEDED, GRPC, REST
 from ie_serving.logger import get_logger
 from tensorflow import __version__ as tf_version
 if tf_version.split(".")[0] == "2":
@@ -38,15 +39,26 @@ logger = get_logger(__name__)
 statusCodes = {
     'invalid_arg': {GRPC: StatusCode.INVALID_ARGUMENT,
                     REST: falcon.HTTP_BAD_REQUEST},
+    'deadline_exceeded': {GRPC: StatusCode.DEADLINE_EXCEEDED,
+                          REST: falcon.HTTP_GATEWAY_TIMEOUT},
+    'resource_exhausted': {GRPC: StatusCode.RESOURCE_EXHAUSTED,
+                           REST: falcon.HTTP_TOO_MANY_REQUESTS},
 }
 
 
+def get_inference_error_code(error_message, service_type):
+    if error_message == DEADLINE_EXCEEDED:
+        return statusCodes['deadline_exceeded'][service_type]
+    return statusCodes['invalid_arg'][service_type]
+
+
 def prepare_input_data(target_engine, data, service_type):
     # returns:
     # inference_input, None on success
     # None, error_message on error
     model_inputs_in_input_request = list(dict(data).keys())
     input_keys = target_engine.input_key_names
+    dynamic_batching_info = target_engine.dynamic_batching_info
     inference_input = {}
 
     for requested_input_blob in model_inputs_in_input_request:
@@ -74,8 +86,9 @@ def prepare_input_data(target_engine, data, service_type):
 
             # For reshapable models check all dimensions,
             # for non-reshapable, check all starting from the second (omit
-            # batch size)
-            if target_engine.shape_info.mode == ShapeMode.DISABLED:
+            # batch size). Batch size is also omitted with dynamic batching.
+            if target_engine.shape_info.mode == ShapeMode.DISABLED or \
+                    dynamic_batching_info.enabled:
                 starting_dim = 1
             else:
                 starting_dim = 0
@@ -88,8 +101,21 @@ def prepare_input_data(target_engine, data, service_type):
                 logger.debug("PREDICT error: {}".format(message))
                 return None, message
 
+            # with dynamic batching requests smaller than the maximal batch
+            # size are merged and padded to the model batch size
+            if dynamic_batching_info.enabled:
+                if target_engine.batching_info.mode != BatchingMode.AUTO \
+                        and tensor_input.shape[0] > \
+                        dynamic_batching_info.max_batch_size:
+                    message = INVALID_DYNAMIC_BATCHSIZE.format(
+                        tensor_input.shape[0],
+                        dynamic_batching_info.max_batch_size)
+                    logger.debug("PREDICT error,Invalid batchsize:{}".format(
+                        message))
+                    return None, message
+
             # check if input batch size match the model only if not auto mode
-            if target_engine.batching_info.mode != \
+            elif target_engine.batching_info.mode != \
                 BatchingMode.AUTO and shape_required_in_model[0] != \
                     tensor_input.shape[0]:
                 message = INVALID_BATCHSIZE.format(
@@ -13,21 +13,60 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-from threading import Event
+import time
+from threading import Event, Lock
+
+from ie_serving.server.constants import DEADLINE_EXCEEDED
 
 
 class Request(Event):
-    def __init__(self, inference_input):
+    def __init__(self, inference_input, priority=0, deadline=None):
         super().__init__()
         self.inference_input = inference_input
         self.ireq_index = None
         self.result = None
+        # Optional function applied to successful inference results,
+        # e.g. cropping outputs of inputs padded to a shape bucket
+        self.process_result = None
+        # Priority lane of the engine requests queue, 0 is the highest.
+        # queue_wait is set to the time spent in the queue in seconds.
+        self.priority = priority
+        self.queue_wait = None
+        # Deadline is an absolute time (as returned by time.time()) after
+        # which the result is no longer awaited. Results of cancelled
+        # requests are dropped and their infer requests are returned with
+        # release_ireq function.
+        self.deadline = deadline
+        self.cancelled = False
+        self.release_ireq = None
+        self.result_lock = Lock()
+
+    def is_expired(self):
+        return self.cancelled or (self.deadline is not None and
+                                  time.time() > self.deadline)
 
-    def wait_for_result(self):
-        super().wait()
+    def wait_for_result(self, timeout=None):
+        if not super().wait(timeout):
+            self.cancel(DEADLINE_EXCEEDED)
         return self.result, self.ireq_index
 
     def set_result(self, ireq_index, result):
-        self.ireq_index = ireq_index
-        self.result = result
-        super().set()
+        if self.process_result is not None and type(result) is not str:
+            result = self.process_result(result)
+        with self.result_lock:
+            if not self.cancelled:
+                self.ireq_index = ireq_index
+                self.result = result
+                super().set()
+                return
+        if self.release_ireq is not None:
+            self.release_ireq(ireq_index)
+
+    def cancel(self, reason):
+        # Answers the request with reason, unless the result is already set
+        with self.result_lock:
+            if self.is_set():
+                return
+            self.cancelled = True
+            self.result = reason
+            super().set()
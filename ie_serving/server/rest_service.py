@@ -16,6 +16,7 @@
 
 import datetime
 import json
+import time
 
 import falcon
 from google.protobuf.json_format import MessageToJson
@@ -23,18 +24,25 @@ from tensorflow_serving.apis import get_model_metadata_pb2, \
     get_model_status_pb2
 
 from ie_serving.logger import get_logger
+from ie_serving.models.artifact_cache import artifact_cache
+from ie_serving.models.engines_registry import engines_registry
+from ie_serving.models.ranged_download import ranged_downloader
+from ie_serving.models.update_scheduler import update_scheduler
 from ie_serving.server.constants import WRONG_MODEL_SPEC, INVALID_FORMAT, \
-    OUTPUT_REPRESENTATION, REST
+    OUTPUT_REPRESENTATION, REST, PRIORITY_HEADER, TIMEOUT_HEADER, \
+    RETRY_AFTER_HEADER, VERSION_NOT_LOADED
 from ie_serving.server.get_model_metadata_utils import \
     prepare_get_metadata_output
-from ie_serving.server.predict_utils import prepare_input_data, statusCodes
+from ie_serving.server.predict_utils import prepare_input_data, \
+    statusCodes, get_inference_error_code
 from ie_serving.server.request import Request
 from ie_serving.server.rest_msg_processing import preprocess_json_request, \
     prepare_json_response
 from ie_serving.server.rest_msg_validation import get_input_format
 from ie_serving.server.service_utils import \
     check_availability_of_requested_model, \
-    check_availability_of_requested_status, add_status_to_response
+    check_availability_of_requested_status, add_status_to_response, \
+    get_request_priority, get_request_timeout
 
 logger = get_logger(__name__)
 
@@ -78,6 +86,98 @@ class GetModelStatus(object):
                                   including_default_value_fields=True)
 
 
+class GetModelReadiness(object):
+
+    def __init__(self, models):
+        self.models = models
+
+    def on_get(self, req, resp, model_name):
+        # Model is ready when at least one of its versions is available
+        if model_name not in self.models:
+            resp.status = falcon.HTTP_NOT_FOUND
+            resp.body = json.dumps({'error': WRONG_MODEL_SPEC.format(
+                model_name, 0)})
+            return
+        ready = self.models[model_name].is_ready()
+        resp.status = falcon.HTTP_200 if ready else \
+            falcon.HTTP_SERVICE_UNAVAILABLE
+        resp.body = json.dumps({'ready': ready})
+
+
+class GetEnginesStatus(object):
+
+    def __init__(self, models):
+        self.models = models
+
+    def on_get(self, req, resp):
+        # Memory usage of the inference engines of all models and recent
+        # unloads of idle versions done to fit in the memory budget
+        resp.status = falcon.HTTP_200
+        resp.body = json.dumps(engines_registry.get_stats())
+
+
+class GetUpdatesStatus(object):
+
+    def __init__(self, models):
+        self.models = models
+
+    def on_get(self, req, resp):
+        # Update intervals, failures and durations of the last update and
+        # storage listing of all models
+        resp.status = falcon.HTTP_200
+        resp.body = json.dumps(update_scheduler.get_stats())
+
+
+class GetDownloadsStatus(object):
+
+    def __init__(self, models):
+        self.models = models
+
+    def on_get(self, req, resp):
+        # Hits, misses and evictions of the cache of files downloaded from
+        # S3 and GCS and throughput of the ranged downloads
+        resp.status = falcon.HTTP_200
+        resp.body = json.dumps({
+            'artifact_cache': artifact_cache.get_stats(),
+            'ranged_downloads': ranged_downloader.get_stats()})
+
+
+class GetModelStats(object):
+
+    def __init__(self, models):
+        self.models = models
+
+    def on_get(self, req, resp, model_name, requested_version=0):
+        # Statistics of the loaded versions of the model, or of the
+        # requested version
+        model = self.models.get(model_name)
+        try:
+            requested_version = int(requested_version)
+        except ValueError:
+            model = None
+        if model is None:
+            resp.status = falcon.HTTP_NOT_FOUND
+            resp.body = json.dumps({'error': WRONG_MODEL_SPEC.format(
+                model_name, requested_version)})
+            return
+        engines = model.routing_table.engines
+        if requested_version:
+            if requested_version not in engines:
+                resp.status = falcon.HTTP_NOT_FOUND
+                resp.body = json.dumps({'error': WRONG_MODEL_SPEC.format(
+                    model_name, requested_version)})
+                return
+            engines = {requested_version: engines[requested_version]}
+        versions_stats = []
+        for version, engine in sorted(engines.items()):
+            version_stats = {'version': version}
+            version_stats.update(engine.get_stats())
+            versions_stats.append(version_stats)
+        resp.status = falcon.HTTP_200
+        resp.body = json.dumps({'model_name': model_name,
+                                'versions': versions_stats})
+
+
 class GetModelMetadata(object):
 
     def __init__(self, models):
@@ -100,7 +200,13 @@ class GetModelMetadata(object):
             resp.body = json.dumps(err_out_json)
             return
 
-        target_engine = self.models[model_name].engines[version]
+        target_engine = self.models[model_name].get_engine(version)
+        if target_engine is None:
+            resp.status = falcon.HTTP_SERVICE_UNAVAILABLE
+            logger.debug("MODEL_METADATA, version could not be loaded")
+            resp.body = json.dumps({'error': VERSION_NOT_LOADED.format(
+                model_name, version)})
+            return
 
         inputs = target_engine.net.inputs
         outputs = target_engine.net.outputs
@@ -149,7 +255,28 @@ class Predict():
             resp.body = json.dumps({'error': 'Invalid JSON in request body'})
             return
 
-        target_engine = self.models[model_name].engines[version]
+        # Version and engine are resolved again from a single routing table
+        # snapshot, so the default version being replaced is not used
+        resolved_version, target_engine = self.models[model_name]. \
+            resolve_engine(int(requested_version), acquire=True)
+        if target_engine is None:
+            resp.status = falcon.HTTP_SERVICE_UNAVAILABLE
+            logger.debug("PREDICT, version could not be loaded, {} - {}"
+                         .format(model_name, version))
+            resp.body = json.dumps({'error': VERSION_NOT_LOADED.format(
+                model_name, version)})
+            return
+        version = resolved_version
+        # Engine is released after the response is ready, so the version
+        # being replaced is drained before it is unloaded
+        try:
+            self._predict(req, resp, model_name, version, body,
+                          target_engine)
+        finally:
+            target_engine.release()
+
+    @staticmethod
+    def _predict(req, resp, model_name, version, body, target_engine):
         input_format = get_input_format(body, target_engine.input_key_names)
         if input_format == INVALID_FORMAT:
             resp.status = falcon.HTTP_400
@@ -175,14 +302,30 @@ class Predict():
                          .format(code))
             resp.body = json.dumps(err_out_json)
             return
-        inference_request = Request(inference_input)
-        target_engine.requests_queue.put(inference_request)
-        inference_output, used_ireq_index = inference_request.wait_for_result()
+        priority = get_request_priority(req.get_header(PRIORITY_HEADER))
+        timeout = get_request_timeout(req.get_header(TIMEOUT_HEADER))
+        deadline = None
+        if timeout is not None:
+            deadline = time.time() + timeout
+        inference_request = Request(inference_input, priority=priority,
+                                    deadline=deadline)
+        inference_request.release_ireq = target_engine.release_ireq
+        error_message, retry_after = target_engine.enqueue_request(
+            inference_request)
+        if error_message is not None:
+            resp.status = code = statusCodes['resource_exhausted'][REST]
+            resp.set_header(RETRY_AFTER_HEADER, str(retry_after))
+            logger.debug("PREDICT, request rejected. Exit code {}"
+                         .format(code))
+            resp.body = json.dumps({'error': error_message})
+            return
+        inference_output, used_ireq_index = \
+            inference_request.wait_for_result(timeout=timeout)
         if type(inference_output) is str:
-            resp.status = falcon.HTTP_400
+            resp.status = get_inference_error_code(inference_output, REST)
             err_out_json = {'error': inference_output}
             resp.body = json.dumps(err_out_json)
-            target_engine.free_ireq_index_queue.put(used_ireq_index)
+            target_engine.release_ireq(used_ireq_index)
             return
         serialization_start_time = datetime.datetime.now()
         for key, value in inference_output.items():
@@ -197,7 +340,7 @@ class Predict():
                     serialization_start_time).total_seconds() * 1000
         logger.debug("PREDICT; inference results serialization completed;"
                      " {}; {}; {} ms".format(model_name, version, duration))
-        target_engine.free_ireq_index_queue.put(used_ireq_index)
+        target_engine.release_ireq(used_ireq_index)
         return
 
 
@@ -205,6 +348,11 @@ def create_rest_api(models):
     app = falcon.API()
     get_model_status = GetModelStatus(models)
     get_model_meta = GetModelMetadata(models)
+    get_model_readiness = GetModelReadiness(models)
+    get_engines_status = GetEnginesStatus(models)
+    get_updates_status = GetUpdatesStatus(models)
+    get_downloads_status = GetDownloadsStatus(models)
+    get_model_stats = GetModelStats(models)
     predict = Predict(models)
 
     app.add_route('/v1/models/{model_name}', get_model_status)
@@ -212,6 +360,15 @@ def create_rest_api(models):
                   'versions/{requested_version}',
                   get_model_status)
 
+    app.add_route('/v1/models/{model_name}/ready', get_model_readiness)
+    app.add_route('/v1/models/{model_name}/stats', get_model_stats)
+    app.add_route('/v1/models/{model_name}/'
+                  'versions/{requested_version}/stats',
+                  get_model_stats)
+    app.add_route('/v1/engines', get_engines_status)
+    app.add_route('/v1/updates', get_updates_status)
+    app.add_route('/v1/downloads', get_downloads_status)
+
     app.add_route('/v1/models/{model_name}/metadata', get_model_meta)
     app.add_route('/v1/models/{model_name}/'
                   'versions/{requested_version}/metadata',
@@ -15,6 +15,7 @@
 #
 
 import datetime
+import time
 
 from tensorflow_serving.apis import get_model_metadata_pb2
 from tensorflow_serving.apis import get_model_status_pb2
@@ -24,15 +25,17 @@ from tensorflow_serving.apis import prediction_service_pb2_grpc, \
 
 from ie_serving.logger import get_logger
 from ie_serving.server.constants import WRONG_MODEL_SPEC, \
-    INVALID_METADATA_FIELD, SIGNATURE_NAME, GRPC
+    INVALID_METADATA_FIELD, SIGNATURE_NAME, GRPC, PRIORITY_METADATA_KEY, \
+    REQUEST_CANCELLED, RETRY_AFTER_METADATA_KEY, VERSION_NOT_LOADED
 from ie_serving.server.get_model_metadata_utils import \
     prepare_get_metadata_output
 from ie_serving.server.predict_utils import prepare_output, \
-    prepare_input_data, StatusCode, statusCodes
+    prepare_input_data, StatusCode, statusCodes, get_inference_error_code
 from ie_serving.server.request import Request
 from ie_serving.server.service_utils import \
     check_availability_of_requested_model, \
-    check_availability_of_requested_status, add_status_to_response
+    check_availability_of_requested_status, add_status_to_response, \
+    get_request_priority
 
 logger = get_logger(__name__)
 
@@ -63,8 +66,28 @@ class PredictionServiceServicer(prediction_service_pb2_grpc.
                          .format(model_name, requested_version))
             return predict_pb2.PredictResponse()
 
-        target_engine = self.models[model_name].engines[version]
-
+        # Version and engine are resolved again from a single routing table
+        # snapshot, so the default version being replaced is not used
+        resolved_version, target_engine = self.models[model_name]. \
+            resolve_engine(int(requested_version), acquire=True)
+        if target_engine is None:
+            context.set_code(StatusCode.UNAVAILABLE)
+            context.set_details(VERSION_NOT_LOADED.format(model_name,
+                                                          version))
+            logger.debug("PREDICT, version could not be loaded, {} - {}"
+                         .format(model_name, version))
+            return predict_pb2.PredictResponse()
+        version = resolved_version
+        # Engine is released after the response is ready, so the version
+        # being replaced is drained before it is unloaded
+        try:
+            return self._predict(request, context, model_name, version,
+                                 target_engine)
+        finally:
+            target_engine.release()
+
+    def _predict(self, request, context, model_name, version,
+                 target_engine):
         deserialization_start_time = datetime.datetime.now()
         inference_input, error_message = \
             prepare_input_data(target_engine=target_engine,
@@ -82,17 +105,37 @@ class PredictionServiceServicer(prediction_service_pb2_grpc.
                          .format(code))
             return predict_pb2.PredictResponse()
 
-        target_engine = self.models[model_name].engines[version]
-        inference_request = Request(inference_input)
-        target_engine.requests_queue.put(inference_request)
-        inference_output, used_ireq_index = inference_request.wait_for_result()
+        priority = get_request_priority(dict(
+            context.invocation_metadata()).get(PRIORITY_METADATA_KEY))
+        time_remaining = context.time_remaining()
+        deadline = None
+        if time_remaining is not None:
+            deadline = time.time() + time_remaining
+        inference_request = Request(inference_input, priority=priority,
+                                    deadline=deadline)
+        inference_request.release_ireq = target_engine.release_ireq
+        context.add_callback(
+            lambda: inference_request.cancel(REQUEST_CANCELLED))
+        error_message, retry_after = target_engine.enqueue_request(
+            inference_request)
+        if error_message is not None:
+            code = statusCodes['resource_exhausted'][GRPC]
+            context.set_code(code)
+            context.set_details(error_message)
+            context.set_trailing_metadata(
+                ((RETRY_AFTER_METADATA_KEY, str(retry_after)),))
+            logger.debug("PREDICT, request rejected. Exit code {}"
+                         .format(code))
+            return predict_pb2.PredictResponse()
+        inference_output, used_ireq_index = \
+            inference_request.wait_for_result(timeout=time_remaining)
         if type(inference_output) is str:
-            code = statusCodes['invalid_arg'][GRPC]
+            code = get_inference_error_code(inference_output, GRPC)
             context.set_code(code)
             context.set_details(inference_output)
             logger.debug("PREDICT, problem during inference execution. Exit "
                          "code {}".format(code))
-            target_engine.free_ireq_index_queue.put(used_ireq_index)
+            target_engine.release_ireq(used_ireq_index)
             return predict_pb2.PredictResponse()
         serialization_start_time = datetime.datetime.now()
         response = prepare_output(inference_output=inference_output,
@@ -105,7 +148,7 @@ class PredictionServiceServicer(prediction_service_pb2_grpc.
                     serialization_start_time).total_seconds() * 1000
         logger.debug("PREDICT; inference results serialization completed;"
                      " {}; {}; {} ms".format(model_name, version, duration))
-        target_engine.free_ireq_index_queue.put(used_ireq_index)
+        target_engine.release_ireq(used_ireq_index)
         return response
 
     def GetModelMetadata(self, request, context):
@@ -125,7 +168,13 @@ class PredictionServiceServicer(prediction_service_pb2_grpc.
                                                         requested_version))
             logger.debug("MODEL_METADATA, invalid model spec from request")
             return get_model_metadata_pb2.GetModelMetadataResponse()
-        target_engine = self.models[model_name].engines[version]
+        target_engine = self.models[model_name].get_engine(version)
+        if target_engine is None:
+            context.set_code(StatusCode.UNAVAILABLE)
+            context.set_details(VERSION_NOT_LOADED.format(model_name,
+                                                          version))
+            logger.debug("MODEL_METADATA, version could not be loaded")
+            return get_model_metadata_pb2.GetModelMetadataResponse()
         metadata_signature_requested = request.metadata_field[0]
         if 'signature_def' != metadata_signature_requested:
             context.set_code(StatusCode.INVALID_ARGUMENT)
@@ -15,6 +15,8 @@
 #
 from tensorflow_serving.util import status_pb2
 
+from ie_serving.config import GLOBAL_CONFIG
+
 
 def check_availability_of_requested_model(models, model_name,
                                           requested_version):
@@ -26,12 +28,14 @@ def check_availability_of_requested_model(models, model_name,
     except ValueError:
         return valid_model_spec, version
 
-    if model_name in models:
-        if requested_version == 0 and models[model_name].default_version != -1:
-            version = models[model_name].default_version
-            valid_model_spec = True
-        elif requested_version in models[model_name].versions:
-            version = requested_version
+    # Routing table snapshot is read once, so the version is resolved
+    # consistently even if the model is being updated
+    model = models.get(model_name)
+    if model is not None:
+        resolved_version = model.routing_table.resolve_version(
+            requested_version)
+        if resolved_version is not None:
+            version = resolved_version
             valid_model_spec = True
     return valid_model_spec, version
 
@@ -57,3 +61,21 @@ def add_status_to_response(version_status, response):
     response.model_version_status.add(version=version_status.version,
                                       state=version_status.state,
                                       status=status_proto)
+
+
+def get_request_priority(priority):
+    # Priority is passed as a string in gRPC metadata or HTTP header.
+    # Missing or invalid values are replaced with the default priority.
+    try:
+        return int(priority)
+    except (TypeError, ValueError):
+        return GLOBAL_CONFIG['requests_default_priority']
+
+
+def get_request_timeout(timeout_ms):
+    # Timeout is passed in milliseconds as a string in HTTP header.
+    # Returns timeout in seconds or None if it is missing or invalid.
+    try:
+        return max(float(timeout_ms), 0) / 1000
+    except (TypeError, ValueError):
+        return None
@@ -26,6 +26,8 @@ import time
 
 from ie_serving.config import GLOBAL_CONFIG
 from ie_serving.logger import get_logger
+from ie_serving.models.update_scheduler import SCHEDULER_TICK, \
+    update_scheduler
 from ie_serving.server.rest_service import create_rest_api
 from ie_serving.server.service import PredictionServiceServicer, \
     ModelServiceServicer
@@ -39,7 +41,6 @@ else:  # TF version 1.x
 
 logger = get_logger(__name__)
 
-_ONE_DAY_IN_SECONDS = 60 * 60 * 24
 GIGABYTE = 1024 ** 3
 
 
@@ -67,11 +68,11 @@ def serve(models, max_workers: int=1, port: int=9000):
     try:
         while True:
             if GLOBAL_CONFIG['file_system_poll_wait_seconds'] > 0:
-                time.sleep(GLOBAL_CONFIG['file_system_poll_wait_seconds'])
-                for model in models:
-                    models[model].update()
-            else:
-                time.sleep(_ONE_DAY_IN_SECONDS)
+                # Models are updated in parallel in the scheduler workers
+                update_scheduler.schedule_updates(models)
+            # Idle versions are unloaded also when updates are disabled
+            update_scheduler.unload_idle_engines(models)
+            time.sleep(SCHEDULER_TICK)
     except KeyboardInterrupt:
         server.stop(0)
         sys.exit(0)
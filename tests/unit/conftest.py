@@ -28,6 +28,7 @@ from tensorflow_serving.apis import prediction_service_pb2, \
 from ie_serving.models.ir_engine import IrEngine
 from ie_serving.models.local_model import LocalModel
 from ie_serving.models.model_version_status import ModelVersionStatus
+from ie_serving.models.requests_queue import RequestsQueue
 from ie_serving.models.shape_management.batching_info import BatchingInfo
 from ie_serving.models.shape_management.shape_info import ShapeInfo
 from ie_serving.server.rest_service import create_rest_api
@@ -49,9 +50,24 @@ class MockedIOInfo:
 
 
 class MockedNet:
-    def __init__(self, inputs: dict, outputs: dict):
+    def __init__(self, inputs: dict, outputs: dict, batch_size=1):
         self.inputs = inputs
         self.outputs = outputs
+        self._batch_size = batch_size
+
+    @property
+    def batch_size(self):
+        return self._batch_size
+
+    @batch_size.setter
+    def batch_size(self, batch_size):
+        # Like in IENetwork, first dimension of inputs and outputs which
+        # represent the batch is changed
+        for io_info in list(self.inputs.values()) + \
+                list(self.outputs.values()):
+            if io_info.shape and io_info.shape[0] == self._batch_size:
+                io_info.shape = [batch_size] + list(io_info.shape[1:])
+        self._batch_size = batch_size
 
 
 class MockedExecNet:
@@ -82,7 +98,7 @@ def get_fake_model():
     shape_info = ShapeInfo(None, net.inputs)
     new_engines = {}
     available_versions = [1, 2, 3]
-    requests_queue = queue.Queue()
+    requests_queue = RequestsQueue()
     free_ireq_index_queue = queue.Queue(maxsize=1)
     free_ireq_index_queue.put(0)
     for version in available_versions:
@@ -123,7 +139,7 @@ def get_fake_ir_engine():
     plugin = None
     batching_info = BatchingInfo(None)
     shape_info = ShapeInfo(None, net.inputs)
-    requests_queue = queue.Queue()
+    requests_queue = RequestsQueue()
     free_ireq_index_queue = queue.Queue(maxsize=1)
     free_ireq_index_queue.put(0)
     engine = IrEngine(model_name='test', model_version=1,
@@ -0,0 +1,50 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import pytest
+
+from ie_serving.models.admission_control import AdmissionControl
+
+
+def test_admission_control_disabled():
+    admission_control = AdmissionControl(None)
+    assert not admission_control.enabled
+    assert admission_control.check(1000) == (None, None)
+
+
+def test_record_inference_time():
+    admission_control = AdmissionControl(None)
+    admission_control.record_inference_time(1.0)
+    assert admission_control.inference_time == 1.0
+    admission_control.record_inference_time(2.0)
+    assert admission_control.inference_time == pytest.approx(1.1)
+
+
+@pytest.mark.parametrize("param, queue_depth, expected_rejection, "
+                         "expected_retry_after", [
+                             ({'max_queue_depth': 4}, 3, False, None),
+                             ({'max_queue_depth': 4}, 4, True, 1),
+                             ({'max_queue_depth': 4}, 10, True, 4),
+                             ({'max_estimated_wait_ms': 3000}, 6, False,
+                              None),
+                             ({'max_estimated_wait_ms': 3000}, 11, True, 3),
+                         ])
+def test_check(param, queue_depth, expected_rejection,
+               expected_retry_after):
+    admission_control = AdmissionControl(param, num_ireq=2)
+    admission_control.record_inference_time(1.0)
+    error_message, retry_after = admission_control.check(queue_depth)
+    assert (error_message is not None) == expected_rejection
+    assert retry_after == expected_retry_after
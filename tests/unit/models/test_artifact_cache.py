@@ -0,0 +1,179 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import os
+
+import pytest
+
+from ie_serving.models.artifact_cache import ArtifactCache
+
+PATH = 's3://bucket/model/1/model.bin'
+
+
+class FakeDownload:
+    def __init__(self, content=b'content', error=None):
+        self.content = content
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, path, local_path):
+        self.calls += 1
+        with open(local_path, 'wb') as f:
+            f.write(self.content)
+        if self.error is not None:
+            raise self.error
+
+
+def test_get_path(tmpdir):
+    cache = ArtifactCache(str(tmpdir), 0)
+    local_path = cache.get_path(PATH, 'etag')
+    assert os.path.dirname(local_path) == str(tmpdir)
+    assert local_path.endswith('model.bin')
+    assert local_path == cache.get_path(PATH, 'etag')
+    assert local_path != cache.get_path(PATH, 'new_etag')
+    assert local_path != cache.get_path('s3://other/model/1/model.bin',
+                                        'etag')
+
+
+def test_fetch_cached(tmpdir):
+    cache = ArtifactCache(str(tmpdir), 0)
+    download = FakeDownload()
+    local_path = cache.fetch(PATH, 'etag', download)
+    cache.release(local_path)
+    assert cache.fetch(PATH, 'etag', download) == local_path
+    cache.release(local_path)
+    assert download.calls == 1
+    assert os.listdir(str(tmpdir)) == [os.path.basename(local_path)]
+
+    # Cache is kept on disk after restart
+    restarted_cache = ArtifactCache(str(tmpdir), 0)
+    assert restarted_cache.fetch(PATH, 'etag', download) == local_path
+    assert download.calls == 1
+    assert restarted_cache.get_stats()['hits'] == 1
+
+    restarted_cache.fetch(PATH, 'new_etag', download)
+    assert download.calls == 2
+
+
+@pytest.mark.parametrize("cache_dir, etag", [(None, 'etag'),
+                                             ('cache', None)])
+def test_fetch_temporary(tmpdir, cache_dir, etag):
+    cache = ArtifactCache(cache_dir and str(tmpdir.join(cache_dir)), 0)
+    download = FakeDownload()
+    first_path = cache.fetch(PATH, etag, download)
+    second_path = cache.fetch(PATH, etag, download)
+    assert first_path != second_path
+    assert os.path.basename(first_path) == 'model.bin'
+    for local_path in [first_path, second_path]:
+        with open(local_path, 'rb') as f:
+            assert f.read() == b'content'
+        cache.release(local_path)
+        assert not os.path.exists(os.path.dirname(local_path))
+    assert download.calls == 2
+
+
+def test_fetch_download_error(tmpdir):
+    cache = ArtifactCache(str(tmpdir), 0)
+    with pytest.raises(IOError):
+        cache.fetch(PATH, 'etag', FakeDownload(error=IOError('failed')))
+    assert os.listdir(str(tmpdir)) == []
+    assert cache.in_use == {}
+
+
+def test_fetch_all(tmpdir):
+    cache = ArtifactCache(str(tmpdir), 0)
+    local_paths = cache.fetch_all(
+        [(PATH, 'etag'), ('s3://bucket/model/1/model.xml', None),
+         (None, None)], FakeDownload())
+    assert local_paths[0] == cache.get_path(PATH, 'etag')
+    assert os.path.isfile(local_paths[1])
+    assert local_paths[2] is None
+    for local_path in local_paths:
+        cache.release(local_path)
+    assert cache.in_use == {}
+    assert not os.path.exists(local_paths[1])
+
+
+def test_fetch_all_error(tmpdir):
+    cache = ArtifactCache(str(tmpdir), 0)
+
+    def download(path, local_path):
+        if path.endswith('.xml'):
+            raise IOError('failed')
+        FakeDownload()(path, local_path)
+    with pytest.raises(IOError):
+        cache.fetch_all([(PATH, 'etag'),
+                         ('s3://bucket/model/1/model.xml', 'etag')],
+                        download)
+    assert cache.in_use == {}
+
+
+def test_evict_least_recently_used(tmpdir):
+    cache = ArtifactCache(str(tmpdir), 20)
+    local_paths = []
+    for path in ['s3://bucket/model/1/model.xml',
+                 's3://bucket/model/1/model.bin',
+                 's3://bucket/model/2/model.xml']:
+        local_path = cache.fetch(path, 'etag', FakeDownload(b'0123456789'))
+        cache.release(local_path)
+        local_paths.append(local_path)
+        # First file is used more recently than the second one
+        if len(local_paths) == 2:
+            os.utime(local_paths[0], (2, 2))
+            os.utime(local_paths[1], (1, 1))
+    assert sorted(os.listdir(str(tmpdir))) == sorted(
+        os.path.basename(local_path) for local_path in
+        [local_paths[0], local_paths[2]])
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_evict_files_in_use(tmpdir):
+    cache = ArtifactCache(str(tmpdir), 5)
+    local_path = cache.fetch(PATH, 'etag', FakeDownload(b'0123456789'))
+    assert os.path.isfile(local_path)
+    cache.release(local_path)
+    cache.evict()
+    assert not os.path.isfile(local_path)
+
+
+def test_release_twice(tmpdir):
+    cache = ArtifactCache(str(tmpdir.join('cache')), 0)
+    local_path = cache.fetch(PATH, 'etag', FakeDownload())
+    cache.release(local_path)
+    cache.release(local_path)
+    assert os.path.isfile(local_path)
+
+    temporary_path = cache.fetch(PATH, None, FakeDownload())
+    cache.release(temporary_path)
+    cache.release(temporary_path)
+    assert os.path.isdir(str(tmpdir.join('cache')))
+    assert cache.temporary_directories == set()
+
+
+def test_release_evicted(tmpdir):
+    cache = ArtifactCache(str(tmpdir), 5)
+    local_path = cache.fetch(PATH, 'etag', FakeDownload(b'0123456789'))
+    cache.release(local_path)
+    cache.evict()
+    cache.release(local_path)
+    assert os.path.isdir(str(tmpdir))
+
+
+def test_fetch_eviction_error(tmpdir, mocker):
+    cache = ArtifactCache(str(tmpdir), 5)
+    mocker.patch.object(cache, 'evict', side_effect=OSError('failed'))
+    with pytest.raises(OSError):
+        cache.fetch(PATH, 'etag', FakeDownload())
+    assert cache.in_use == {}
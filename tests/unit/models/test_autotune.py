@@ -0,0 +1,105 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import json
+
+import pytest
+
+from ie_serving.config import GLOBAL_CONFIG
+from ie_serving.models.autotune import AutotuneInfo, get_plugin_config, \
+    load_autotune_result, run_benchmark, save_autotune_result, STREAMS_KEY
+
+
+def test_autotune_info_disabled():
+    autotune_info = AutotuneInfo(None, 'CPU')
+    assert not autotune_info.enabled
+
+
+@pytest.mark.parametrize("target_device, expected_configurations", [
+    ('CPU', [{'nireq': 1, 'streams': 1}, {'nireq': 1, 'streams': 2},
+             {'nireq': 2, 'streams': 1}, {'nireq': 2, 'streams': 2}]),
+    ('GPU', [{'nireq': 1, 'streams': None}, {'nireq': 2, 'streams': None}]),
+])
+def test_autotune_info_configurations(target_device,
+                                      expected_configurations):
+    autotune_info = AutotuneInfo({'nireq': [1, 2], 'streams': [1, 2],
+                                  'duration_ms': 500}, target_device)
+    assert autotune_info.enabled
+    assert autotune_info.duration == 0.5
+    assert autotune_info.get_configurations() == expected_configurations
+
+
+@pytest.mark.parametrize("objective, expected_nireq", [
+    ('throughput', 4),
+    ('latency', 1),
+])
+def test_select_best(objective, expected_nireq):
+    autotune_info = AutotuneInfo({'objective': objective}, 'CPU')
+    results = [{'nireq': 1, 'streams': 1, 'throughput': 100, 'latency': 10},
+               {'nireq': 2, 'streams': 1, 'throughput': 150, 'latency': 13},
+               {'nireq': 4, 'streams': 1, 'throughput': 200, 'latency': 20}]
+    assert autotune_info.select_best(results)['nireq'] == expected_nireq
+
+
+def test_get_plugin_config():
+    plugin_config = {'CPU_THREADS_NUM': '4'}
+    assert get_plugin_config(plugin_config, None) == plugin_config
+    assert get_plugin_config(plugin_config, 2) == {'CPU_THREADS_NUM': '4',
+                                                   STREAMS_KEY: '2'}
+    assert plugin_config == {'CPU_THREADS_NUM': '4'}
+    assert get_plugin_config(None, 1) == {STREAMS_KEY: '1'}
+
+
+def test_autotune_results_persistence(tmpdir, monkeypatch):
+    results_path = str(tmpdir.join('autotune.json'))
+    monkeypatch.setitem(GLOBAL_CONFIG, 'autotune_results_path', results_path)
+    assert load_autotune_result('key') is None
+    result = {'nireq': 2, 'streams': 1, 'throughput': 150, 'latency': 13}
+    save_autotune_result('key', result)
+    save_autotune_result('other_key', result)
+    assert load_autotune_result('key') == result
+    with open(results_path) as f:
+        assert set(json.load(f).keys()) == {'key', 'other_key'}
+
+
+def test_autotune_results_not_stored(monkeypatch):
+    monkeypatch.setitem(GLOBAL_CONFIG, 'autotune_results_path', None)
+    save_autotune_result('key', {'nireq': 1})
+    assert load_autotune_result('key') is None
+
+
+class FakeInferRequest:
+    def __init__(self):
+        self.infer_count = 0
+
+    def async_infer(self, inputs):
+        self.infer_count += 1
+
+    def wait(self, timeout):
+        return 0
+
+
+class FakeExecNet:
+    def __init__(self, num_ireq):
+        self.requests = [FakeInferRequest() for _ in range(num_ireq)]
+
+
+def test_run_benchmark():
+    exec_net = FakeExecNet(2)
+    throughput, latency = run_benchmark(exec_net, {'input': None}, 2, 0)
+    assert exec_net.requests[0].infer_count == 1
+    assert exec_net.requests[1].infer_count == 1
+    assert throughput > 0
+    assert latency >= 0
@@ -0,0 +1,47 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import pytest
+
+from ie_serving.models.shape_management.batch_sharding_info import \
+    BatchShardingInfo
+
+
+@pytest.mark.parametrize("batch_sharding_param, num_ireq, expected_enabled, "
+                         "expected_max_shards", [
+                             (None, 4, False, 1),
+                             ({}, 4, True, 4),
+                             ({}, 1, False, 1),
+                             ({'max_shards': 2}, 4, True, 2),
+                         ])
+def test_batch_sharding_info(batch_sharding_param, num_ireq,
+                             expected_enabled, expected_max_shards):
+    batch_sharding_info = BatchShardingInfo(batch_sharding_param, num_ireq)
+    assert batch_sharding_info.enabled == expected_enabled
+    assert batch_sharding_info.max_shards == expected_max_shards
+
+
+@pytest.mark.parametrize("batch_size, max_shards, min_shard_size, "
+                         "expected_shards", [
+                             (64, 8, 1, [(8, 8)] * 8),
+                             (10, 4, 1, [(3, 3), (3, 3), (3, 3), (1, 3)]),
+                             (3, 8, 1, [(1, 1), (1, 1), (1, 1)]),
+                             (10, 8, 4, [(5, 5), (5, 5)]),
+                             (3, 8, 4, [(3, 3)]),
+                         ])
+def test_split(batch_size, max_shards, min_shard_size, expected_shards):
+    batch_sharding_info = BatchShardingInfo(
+        {'max_shards': max_shards, 'min_shard_size': min_shard_size})
+    assert batch_sharding_info.split(batch_size) == expected_shards
@@ -0,0 +1,51 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import pytest
+
+from ie_serving.models.shape_management.batch_size_pool import \
+    BatchSizePool
+
+
+def test_batch_size_pool_disabled():
+    assert not BatchSizePool(None).enabled
+
+
+def test_batch_size_pool_sorted():
+    batch_size_pool = BatchSizePool([8, 1, 4, 4])
+    assert batch_size_pool.enabled
+    assert batch_size_pool.batch_sizes == [1, 4, 8]
+
+
+@pytest.mark.parametrize("batch_size, expected_batch_size", [
+    (1, 1),
+    (3, 4),
+    (8, 8),
+    (9, None),
+])
+def test_find_batch_size(batch_size, expected_batch_size):
+    batch_size_pool = BatchSizePool([1, 4, 8])
+    assert batch_size_pool.find_batch_size(batch_size) == expected_batch_size
+
+
+@pytest.mark.parametrize("batch_size, expected_shards", [
+    (4, [(4, 4)]),
+    (5, [(5, 8)]),
+    (17, [(8, 8), (8, 8), (1, 1)]),
+    (19, [(8, 8), (8, 8), (3, 4)]),
+])
+def test_split(batch_size, expected_shards):
+    batch_size_pool = BatchSizePool([1, 4, 8])
+    assert batch_size_pool.split(batch_size) == expected_shards
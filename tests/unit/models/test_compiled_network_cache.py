@@ -0,0 +1,84 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import os
+
+from ie_serving.models.compiled_network_cache import CompiledNetworkCache
+
+SHAPE_SIGNATURE = (('input', (1, 3, 224, 224)),)
+
+
+class FakeExecNet:
+    def __init__(self, export_supported=True):
+        self.export_supported = export_supported
+
+    def export(self, model_file):
+        if not self.export_supported:
+            raise RuntimeError("Export is not supported")
+        with open(model_file, 'wb') as f:
+            f.write(b'blob')
+
+
+def test_compiled_network_cache_disabled():
+    cache = CompiledNetworkCache(None)
+    assert not cache.enabled
+    assert not cache.is_export_supported('CPU')
+
+
+def test_get_blob_path(tmpdir):
+    cache = CompiledNetworkCache(str(tmpdir))
+    blob_path = cache.get_blob_path('hash', 'CPU', None, SHAPE_SIGNATURE)
+    assert os.path.dirname(blob_path) == str(tmpdir)
+    assert blob_path == cache.get_blob_path('hash', 'CPU', None,
+                                            SHAPE_SIGNATURE)
+    different_keys = [
+        ('other_hash', 'CPU', None, SHAPE_SIGNATURE),
+        ('hash', 'MYRIAD', None, SHAPE_SIGNATURE),
+        ('hash', 'CPU', {'CPU_THROUGHPUT_STREAMS': '2'}, SHAPE_SIGNATURE),
+        ('hash', 'CPU', None, (('input', (2, 3, 224, 224)),)),
+    ]
+    for key in different_keys:
+        assert blob_path != cache.get_blob_path(*key)
+
+
+def test_save_and_find(tmpdir):
+    cache = CompiledNetworkCache(str(tmpdir.join('cache')))
+    blob_path = cache.get_blob_path('hash', 'MYRIAD', None, SHAPE_SIGNATURE)
+    assert cache.find(blob_path) is None
+    cache.save(FakeExecNet(), blob_path, 'MYRIAD')
+    assert cache.find(blob_path) == blob_path
+    assert os.listdir(str(tmpdir.join('cache'))) == \
+        [os.path.basename(blob_path)]
+    cache.invalidate(blob_path)
+    assert cache.find(blob_path) is None
+
+
+def test_save_export_not_supported(tmpdir):
+    cache = CompiledNetworkCache(str(tmpdir))
+    blob_path = cache.get_blob_path('hash', 'CPU', None, SHAPE_SIGNATURE)
+    cache.save(FakeExecNet(export_supported=False), blob_path, 'CPU')
+    assert cache.find(blob_path) is None
+    assert not cache.is_export_supported('CPU')
+    assert cache.is_export_supported('MYRIAD')
+    assert os.listdir(str(tmpdir)) == []
+
+
+def test_get_stats(tmpdir):
+    cache = CompiledNetworkCache(str(tmpdir))
+    cache.record_miss(10.0)
+    cache.record_hit(1.0)
+    cache.record_hit(2.0)
+    assert cache.get_stats() == {'hits': 2, 'misses': 1,
+                                 'import_time': 3.0, 'compile_time': 10.0}
@@ -0,0 +1,79 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import threading
+
+from ie_serving.models import engines_loading_pool as loading_pool_module
+from ie_serving.models.engines_loading_pool import EnginesLoadingPool, \
+    get_available_memory
+
+
+def test_loads_run_in_parallel():
+    pool = EnginesLoadingPool(max_workers=2)
+    barrier = threading.Barrier(2, timeout=5)
+    futures = [pool.submit(barrier.wait) for _ in range(2)]
+    assert sorted(future.result() for future in futures) == [0, 1]
+
+
+def test_loads_bounded_by_workers():
+    pool = EnginesLoadingPool(max_workers=1)
+    running = []
+    max_running = []
+    lock = threading.Lock()
+
+    def load(engine):
+        with lock:
+            running.append(engine)
+            max_running.append(len(running))
+        with lock:
+            running.remove(engine)
+        return engine
+
+    futures = [pool.submit(load, engine) for engine in range(4)]
+    assert [future.result() for future in futures] == [0, 1, 2, 3]
+    assert max(max_running) == 1
+
+
+def test_load_exception_propagated():
+    pool = EnginesLoadingPool(max_workers=1)
+
+    def load():
+        raise ValueError("test")
+
+    future = pool.submit(load)
+    assert isinstance(future.exception(), ValueError)
+    assert pool.loads_in_progress == 0
+
+
+def test_memory_guard(mocker):
+    mocker.patch.object(loading_pool_module, 'get_available_memory',
+                        return_value=100)
+    pool = EnginesLoadingPool(max_workers=2, min_free_memory=1000)
+    assert pool._is_memory_available()
+    pool.loads_in_progress = 1
+    assert not pool._is_memory_available()
+    pool.min_free_memory = 100
+    assert pool._is_memory_available()
+
+
+def test_get_available_memory(tmpdir, monkeypatch):
+    meminfo = tmpdir.join('meminfo')
+    meminfo.write("MemTotal:       16000000 kB\n"
+                  "MemAvailable:    8000000 kB\n")
+    monkeypatch.setattr(loading_pool_module, 'MEMINFO_PATH', str(meminfo))
+    assert get_available_memory() == 8000000 * 1024
+    monkeypatch.setattr(loading_pool_module, 'MEMINFO_PATH',
+                        str(tmpdir.join('missing')))
+    assert get_available_memory() is None
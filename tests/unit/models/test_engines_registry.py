@@ -0,0 +1,102 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from ie_serving.models.engines_registry import EnginesRegistry
+from ie_serving.models.executable_network_cache import ExecutableNetworkCache
+
+
+class FakeEngine:
+    def __init__(self, memory_usage):
+        self.network_cache = ExecutableNetworkCache(capacity=1)
+        self.network_cache.put('shape', object(), memory_usage)
+
+
+class FakeUnloadCallback:
+    def __init__(self, registry, model_name, version, idle=True):
+        self.registry = registry
+        self.key = (model_name, version)
+        self.idle = idle
+        self.called = False
+
+    def __call__(self):
+        self.called = True
+        if self.idle:
+            self.registry.unregister(*self.key)
+        return self.idle
+
+
+def register(registry, model_name, version, memory_usage, idle=True,
+             last_used=None):
+    callback = FakeUnloadCallback(registry, model_name, version, idle)
+    registry.register(model_name, version, FakeEngine(memory_usage),
+                      callback, last_used)
+    return callback
+
+
+def test_memory_usage():
+    registry = EnginesRegistry(memory_budget=0)
+    register(registry, 'a', 1, 100)
+    register(registry, 'b', 1, 200)
+    assert registry.get_memory_usage() == 300
+    registry.unregister('a', 1)
+    assert registry.get_memory_usage() == 200
+    assert registry.estimate_memory_usage('a', 1) == 100
+    assert registry.estimate_memory_usage('c', 1, 50) == 50
+
+
+def test_make_room_unlimited():
+    registry = EnginesRegistry(memory_budget=0)
+    callback = register(registry, 'a', 1, 100)
+    assert registry.make_room(10 ** 12) == []
+    assert not callback.called
+
+
+def test_make_room_evicts_least_recently_used():
+    registry = EnginesRegistry(memory_budget=300)
+    last_used = {'a': 3, 'b': 1, 'c': 2}
+    callback_a = register(registry, 'a', 1, 100,
+                          last_used=lambda: last_used['a'])
+    callback_b = register(registry, 'b', 1, 100,
+                          last_used=lambda: last_used['b'])
+    callback_c = register(registry, 'c', 1, 100,
+                          last_used=lambda: last_used['c'])
+    assert registry.make_room(100) == [('b', 1)]
+    assert not callback_a.called
+    assert callback_b.called
+    assert not callback_c.called
+    assert registry.get_memory_usage() == 200
+    stats = registry.get_stats()
+    assert stats['evictions_count'] == 1
+    assert stats['recent_evictions'][0]['model_name'] == 'b'
+    assert [engine['model_name'] for engine in stats['engines']] == \
+        ['c', 'a']
+
+
+def test_make_room_skips_busy_and_excluded():
+    registry = EnginesRegistry(memory_budget=250)
+    callback_a = register(registry, 'a', 1, 100, idle=False)
+    callback_b = register(registry, 'b', 1, 100)
+    register(registry, 'c', 1, 100)
+    assert registry.make_room(exclude=('b', 1)) == [('c', 1)]
+    assert callback_a.called
+    assert not callback_b.called
+    assert registry.get_memory_usage() == 200
+
+
+def test_make_room_nothing_to_evict():
+    registry = EnginesRegistry(memory_budget=100)
+    register(registry, 'a', 1, 200, idle=False)
+    assert registry.make_room() == []
+    assert registry.get_memory_usage() == 200
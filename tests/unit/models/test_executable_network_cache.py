@@ -0,0 +1,88 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import pytest
+
+from ie_serving.models.executable_network_cache import \
+    ExecutableNetworkCache, get_shape_signature, estimate_network_memory
+
+
+class MockedLayer:
+    def __init__(self, shape, precision='FP32'):
+        self.shape = shape
+        self.precision = precision
+
+
+class MockedNet:
+    def __init__(self, inputs, outputs):
+        self.inputs = inputs
+        self.outputs = outputs
+
+
+def test_get_shape_signature():
+    net = MockedNet(inputs={'b': MockedLayer([1, 3]),
+                            'a': MockedLayer([1, 2])}, outputs={})
+    assert get_shape_signature(net) == (('a', (1, 2)), ('b', (1, 3)))
+
+
+def test_estimate_network_memory():
+    net = MockedNet(inputs={'input': MockedLayer([2, 3])},
+                    outputs={'output': MockedLayer([2, 5], 'FP16')})
+    assert estimate_network_memory(net, num_ireq=2, weights_size=100) == \
+        100 + (2 * 3 * 4 + 2 * 5 * 2) * 2
+
+
+def test_cache_hit_and_miss():
+    cache = ExecutableNetworkCache(capacity=2)
+    assert cache.get('shape_1') is None
+    cache.put('shape_1', 'exec_net_1', 10)
+    assert cache.get('shape_1') == 'exec_net_1'
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ExecutableNetworkCache(capacity=2)
+    cache.put('shape_1', 'exec_net_1', 10)
+    cache.put('shape_2', 'exec_net_2', 10)
+    cache.get('shape_1')
+    evicted = cache.put('shape_3', 'exec_net_3', 10)
+    assert evicted == ['exec_net_2']
+    assert list(cache.networks.keys()) == ['shape_1', 'shape_3']
+    assert cache.evictions == 1
+
+
+@pytest.mark.parametrize("memory_budget, expected_networks", [
+    (0, 3),
+    (25, 2),
+    (5, 1),
+])
+def test_cache_memory_budget(memory_budget, expected_networks):
+    cache = ExecutableNetworkCache(capacity=3, memory_budget=memory_budget)
+    for index in range(3):
+        cache.put('shape_{}'.format(index), 'exec_net', 10)
+    assert len(cache.networks) == expected_networks
+    assert 'shape_2' in cache.networks
+
+
+def test_cache_keeps_pinned_networks():
+    cache = ExecutableNetworkCache(capacity=1)
+    cache.put('bucket_1', 'exec_net_1', 10, pinned=True)
+    cache.put('bucket_2', 'exec_net_2', 10, pinned=True)
+    cache.put('shape_1', 'exec_net_3', 10)
+    evicted = cache.put('shape_2', 'exec_net_4', 10)
+    assert evicted == ['exec_net_3']
+    assert list(cache.networks.keys()) == ['bucket_1', 'bucket_2',
+                                           'shape_2']
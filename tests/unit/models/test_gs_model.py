@@ -13,9 +13,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import json
+
 import pytest
 
 from ie_serving.models.gs_model import GSModel
+from ie_serving.models.remote_index import remote_indexes
+
+MD5 = '0123456789abcdef0123456789abcdef'
+
+
+@pytest.fixture(autouse=True)
+def clear_remote_indexes():
+    remote_indexes.indexes.clear()
+
+
+def get_listing(keys):
+    return [(key, 'etag', 0, None) for key in keys], 1
 
 
 @pytest.mark.parametrize("content_list, versions", [
@@ -30,8 +44,8 @@ from ie_serving.models.gs_model import GSModel
 ])
 def test_get_versions(mocker, content_list, versions):
     list_content_mocker = mocker.patch('ie_serving.models.gs_model.GSModel.'
-                                       'gs_list_content')
-    list_content_mocker.return_value = content_list
+                                       'gs_list_objects')
+    list_content_mocker.return_value = get_listing(content_list)
 
     output = GSModel.get_versions('gs://bucket/model')
     assert set(output) == set(versions)
@@ -57,8 +71,8 @@ def test_get_versions(mocker, content_list, versions):
 ])
 def test_get_versions_files(mocker, content_list, version_files):
     list_content_mocker = mocker.patch('ie_serving.models.gs_model.GSModel.'
-                                       'gs_list_content')
-    list_content_mocker.return_value = content_list
+                                       'gs_list_objects')
+    list_content_mocker.return_value = get_listing(content_list)
 
     xml, bin, mapping = GSModel.get_version_files('gs://bucket/model/3/')
     assert (xml, bin, mapping) == version_files
@@ -66,11 +80,10 @@ def test_get_versions_files(mocker, content_list, version_files):
 
 def test_get_mapping_config(mocker):
     list_content_mocker = mocker.patch('ie_serving.models.gs_model.GSModel.'
-                                       'gs_list_content')
-    list_content_mocker.return_value = ['model/3/doc.doc',
-                                        'model/3/mapping_config.json',
-                                        'model/3/model.xml',
-                                        'model/3/model.bin']
+                                       'gs_list_objects')
+    list_content_mocker.return_value = get_listing([
+        'model/3/doc.doc', 'model/3/mapping_config.json', 'model/3/model.xml',
+        'model/3/model.bin'])
 
     mapping = GSModel._get_mapping_config('gs://bucket/model/3/')
     assert mapping == 'gs://bucket/model/3/mapping_config.json'
@@ -78,11 +91,59 @@ def test_get_mapping_config(mocker):
 
 def test_not_get_mapping_config(mocker):
     list_content_mocker = mocker.patch('ie_serving.models.gs_model.GSModel.'
-                                       'gs_list_content')
-    list_content_mocker.return_value = ['model/3/doc.doc',
-                                        'model/3/config.json',
-                                        'model/3/model.xml',
-                                        'model/3/model.bin']
+                                       'gs_list_objects')
+    list_content_mocker.return_value = get_listing([
+        'model/3/doc.doc', 'model/3/config.json', 'model/3/model.xml',
+        'model/3/model.bin'])
 
     mapping = GSModel._get_mapping_config('gs://bucket/model/3/')
     assert mapping is None
+
+
+def test_single_listing_per_update(mocker):
+    list_content_mocker = mocker.patch('ie_serving.models.gs_model.GSModel.'
+                                       'gs_list_objects')
+    list_content_mocker.return_value = get_listing([
+        'model/3/model.xml', 'model/3/model.bin',
+        'model/3/mapping_config.json', 'model/3/warmup_data.npz'])
+
+    assert GSModel.get_versions('gs://bucket/model') == \
+        ['gs://bucket/model/3/']
+    assert GSModel.get_version_files('gs://bucket/model/3/') == (
+        'gs://bucket/model/3/model.xml', 'gs://bucket/model/3/model.bin',
+        'gs://bucket/model/3/mapping_config.json')
+    assert GSModel._get_warmup_file('gs://bucket/model/3/') == \
+        'gs://bucket/model/3/warmup_data.npz'
+    list_content_mocker.assert_called_once_with('gs://bucket/model/')
+    assert GSModel.get_listing_stats(
+        'gs://bucket/model')['last_api_calls'] == 1
+
+
+def test_get_versions_from_manifest(mocker):
+    mocker.patch.dict('ie_serving.models.gs_model.GLOBAL_CONFIG',
+                      {'models_manifest_filename': 'manifest.json'})
+    list_content_mocker = mocker.patch('ie_serving.models.gs_model.GSModel.'
+                                       'gs_list_objects')
+    list_content_mocker.return_value = get_listing(['model/3/model.xml'])
+    blob = mocker.MagicMock(generation=1)
+    blob.download_as_string.return_value = json.dumps({'versions': {'1': {
+        'model.xml': {'size': 10, 'md5': MD5},
+        'model.bin': {'size': 20, 'md5': MD5}}}}).encode()
+    bucket = mocker.MagicMock()
+    bucket.get_blob.return_value = blob
+    mocker.patch.object(GSModel, 'get_gs_bucket', return_value=bucket)
+
+    for _ in range(2):
+        assert GSModel.get_versions('gs://bucket/model') == \
+            ['gs://bucket/model/1/']
+    blob.download_as_string.assert_called_once()
+
+    blob.generation = 2
+    GSModel.get_versions('gs://bucket/model')
+    assert blob.download_as_string.call_count == 2
+    list_content_mocker.assert_not_called()
+
+    bucket.get_blob.return_value = None
+    assert GSModel.get_versions('gs://bucket/model') == \
+        ['gs://bucket/model/3/']
+    list_content_mocker.assert_called_once_with('gs://bucket/model/')
@@ -16,17 +16,35 @@
 import datetime
 import json
 import queue
+import threading
+import time
 from unittest import mock
 
+import numpy as np
 import pytest
 from config import RESHAPE_TEST_CASES, \
     SCAN_INPUT_SHAPES_TEST_CASES, DETECT_SHAPES_INCOMPATIBILITY_TEST_CASES
-from conftest import MockedNet, MockedIOInfo
+from conftest import MockedNet, MockedIOInfo, MockedExecNet
 
 from ie_serving.models import InferenceStatus
+from ie_serving.models.admission_control import AdmissionControl
+from ie_serving.models.compiled_network_cache import CompiledNetworkCache
+from ie_serving.models.executable_network_cache import \
+    ExecutableNetworkCache
 from ie_serving.models.ir_engine import IrEngine, inference_callback
+from ie_serving.models.requests_batch import RequestsBatch, \
+    get_batch_size
+from ie_serving.models.shape_management.batch_sharding_info import \
+    BatchShardingInfo
+from ie_serving.models.shape_management.batch_size_pool import \
+    BatchSizePool
 from ie_serving.models.shape_management.batching_info import BatchingInfo
+from ie_serving.models.shape_management.dynamic_batching_info import \
+    DynamicBatchingInfo
 from ie_serving.models.shape_management.shape_info import ShapeInfo
+from ie_serving.models.shape_management.utils import BatchingMode
+from ie_serving.server.constants import DEADLINE_EXCEEDED, REST
+from ie_serving.server.predict_utils import prepare_input_data
 from ie_serving.server.request import Request
 
 
@@ -34,6 +52,7 @@ from ie_serving.server.request import Request
 def test_inference_callback(get_fake_ir_engine, status):
     py_data = {
         'ir_engine': get_fake_ir_engine,
+        'exec_net': get_fake_ir_engine.exec_net,
         'request': Request({}),
         'ireq_index': 0,
         'start_time': datetime.datetime.now()
@@ -108,6 +127,39 @@ def test_build_device_other(mocker):
         assert not cpu_extension_mock.assert_called_once_with()
 
 
+def test_load_executable_network_cached(mocker, tmpdir):
+    compiled_network_cache = CompiledNetworkCache(str(tmpdir))
+    mocker.patch("ie_serving.models.ir_engine.compiled_network_cache",
+                 compiled_network_cache)
+    ie_core_mock = mocker.patch("ie_serving.models.ir_engine.IECore")
+    plugin = mock.Mock()
+    plugin.load.return_value.export.side_effect = \
+        lambda model_file: open(model_file, 'w').close()
+    net = MockedNet(inputs={'input': MockedIOInfo('FP32', [1, 1], 'NC')},
+                    outputs={})
+
+    exec_net = IrEngine._load_executable_network(
+        'test', 1, plugin, net, 2, 'MYRIAD', None, 'hash')
+    assert exec_net == plugin.load.return_value
+    ie_core_mock.return_value.import_network.assert_not_called()
+
+    exec_net = IrEngine._load_executable_network(
+        'test', 1, plugin, net, 2, 'MYRIAD', None, 'hash')
+    assert exec_net == ie_core_mock.return_value.import_network.return_value
+    plugin.load.assert_called_once()
+    assert compiled_network_cache.get_stats()['hits'] == 1
+    assert compiled_network_cache.get_stats()['misses'] == 1
+
+
+def test_load_executable_network_cache_disabled(mocker):
+    mocker.patch("ie_serving.models.ir_engine.compiled_network_cache",
+                 CompiledNetworkCache(None))
+    plugin = mock.Mock()
+    exec_net = IrEngine._load_executable_network(
+        'test', 1, plugin, mock.Mock(), 2, 'CPU', None, None)
+    assert exec_net == plugin.load.return_value
+
+
 def test_mapping_config_not_exists(get_fake_ir_engine):
     engine = get_fake_ir_engine
     output = engine._get_mapping_data_if_exists('mapping_config.json')
@@ -263,3 +315,212 @@ def test_reshape(get_fake_ir_engine, mocker, reshape_param, calls_config,
     for method_name, is_called in calls_config.items():
         assert methods_mocks[method_name].called == is_called
     assert output == expected_output
+
+
+@pytest.mark.parametrize("batch_sizes, max_batch_size, expected_merged, "
+                         "expected_pending", [
+                             ([1, 1, 1], 4, 3, False),
+                             ([1, 2, 2], 4, 3, True),
+                             ([2, 2], 4, 4, False),
+                         ])
+def test_collect_requests_batch(get_fake_ir_engine, batch_sizes,
+                                max_batch_size, expected_merged,
+                                expected_pending):
+    engine = get_fake_ir_engine
+    engine.stop_inference_service()
+    engine.dynamic_batching_info = DynamicBatchingInfo(
+        {'max_batch_size': max_batch_size, 'max_delay_ms': 10})
+    requests = [Request({'input': np.ones((batch_size, 1, 1))})
+                for batch_size in batch_sizes]
+    for request in requests[1:]:
+        engine.requests_queue.put(request)
+
+    output = engine._collect_requests_batch(requests[0])
+
+    assert isinstance(output, RequestsBatch)
+    assert output.batch_size == expected_merged
+    assert output.inference_input['input'].shape[0] == max_batch_size
+    assert (engine.pending_request is not None) == expected_pending
+
+
+def test_collect_requests_batch_single_request(get_fake_ir_engine):
+    engine = get_fake_ir_engine
+    engine.stop_inference_service()
+    engine.dynamic_batching_info = DynamicBatchingInfo(
+        {'max_batch_size': 4, 'max_delay_ms': 1})
+    engine.batching_info.mode = BatchingMode.AUTO
+    request = Request({'input': np.ones((1, 1, 1))})
+
+    output = engine._collect_requests_batch(request)
+    assert output is request
+
+
+def test_is_idle(get_fake_ir_engine):
+    engine = get_fake_ir_engine
+    engine.stop_inference_service()
+    assert engine.is_idle()
+
+    assert engine.acquire()
+    assert not engine.is_idle()
+    engine.release()
+
+    engine.requests_queue.put(Request({}))
+    assert not engine.is_idle()
+    engine.requests_queue.get()
+
+    ireq_index = engine.free_ireq_index_queue.get()
+    engine.in_progress_ireqs[ireq_index] = engine.exec_net
+    assert not engine.is_idle()
+    engine.release_ireq(ireq_index)
+    assert engine.is_idle()
+
+
+def test_suppress_inference_waits_for_release(get_fake_ir_engine):
+    engine = get_fake_ir_engine
+    engine.stop_inference_service()
+    ireq_index = engine.free_ireq_index_queue.get()
+    engine.in_progress_ireqs[ireq_index] = engine.exec_net
+
+    assert engine.suppress_inference(timeout=0.01) is False
+    release_timer = threading.Timer(0.01, engine.release_ireq,
+                                    args=(ireq_index,))
+    release_timer.start()
+    assert engine.suppress_inference(timeout=5) is True
+    assert engine.free_ireq_index_queue.full()
+
+
+def test_suppress_inference_selected_networks(get_fake_ir_engine):
+    engine = get_fake_ir_engine
+    engine.stop_inference_service()
+    engine.in_progress_ireqs[0] = engine.exec_net
+
+    assert engine.suppress_inference(timeout=0.01,
+                                     exec_nets=[MockedExecNet()]) is True
+    assert engine.suppress_inference(timeout=0.01,
+                                     exec_nets=[engine.exec_net]) is False
+
+
+def test_drain_waits_for_active_requests(get_fake_ir_engine):
+    engine = get_fake_ir_engine
+    engine.stop_inference_service()
+    assert engine.acquire() is True
+
+    assert engine.drain(timeout=0.01) is False
+    assert engine.acquire() is False
+    release_timer = threading.Timer(0.01, engine.release)
+    release_timer.start()
+    assert engine.drain(timeout=5) is True
+    assert engine.active_requests == 0
+
+
+@pytest.mark.parametrize("batch_size, batch_size_pool, batch_sharding, "
+                         "expected_batch_sizes", [
+                             (4, [1, 2, 4, 8], None, [4]),
+                             (3, [1, 2, 4, 8], None, [4]),
+                             (10, [1, 2, 4, 8], None, [8, 2]),
+                             (8, None, {'max_shards': 4}, [2, 2, 2, 2]),
+                             (7, None, {'max_shards': 4}, [2, 2, 2, 2]),
+                             (6, None, {'max_shards': 4,
+                                        'min_shard_size': 3}, [3, 3]),
+                             (7, [1, 2, 4], {'max_shards': 2}, [4, 4]),
+                         ])
+def test_split_request(get_fake_ir_engine, batch_size, batch_size_pool,
+                       batch_sharding, expected_batch_sizes):
+    engine = get_fake_ir_engine
+    engine.stop_inference_service()
+    engine.batch_size_pool = BatchSizePool(batch_size_pool)
+    engine.batch_sharding_info = BatchShardingInfo(batch_sharding)
+    request = Request({'input': np.ones((batch_size, 1, 1))})
+
+    output = engine._split_request(request)
+
+    assert [get_batch_size(inference_request.inference_input) for
+            inference_request in output] == expected_batch_sizes
+
+
+def test_get_queued_request_expired(get_fake_ir_engine):
+    engine = get_fake_ir_engine
+    engine.stop_inference_service()
+    request = Request({'input': np.ones((1, 1, 1))},
+                      deadline=time.time() - 1)
+    engine.requests_queue.put(request)
+
+    assert engine._get_queued_request(timeout=1) is None
+    assert request.wait_for_result(timeout=0) == (DEADLINE_EXCEEDED, None)
+
+
+def test_enqueue_request(get_fake_ir_engine):
+    engine = get_fake_ir_engine
+    engine.stop_inference_service()
+    engine.admission_control = AdmissionControl({'max_queue_depth': 1})
+
+    assert engine.enqueue_request(Request({})) == (None, None)
+    error_message, retry_after = engine.enqueue_request(Request({}))
+    assert error_message is not None
+    assert retry_after == 1
+    assert engine.requests_queue.qsize() == 1
+
+
+def test_enqueue_request_queue_full(get_fake_ir_engine):
+    engine = get_fake_ir_engine
+    engine.stop_inference_service()
+    engine.requests_queue = queue.Queue(maxsize=1)
+
+    assert engine.enqueue_request(Request({})) == (None, None)
+    error_message, retry_after = engine.enqueue_request(Request({}))
+    assert error_message == "Requests queue is full"
+    assert retry_after == 1
+
+
+def test_get_stats_reshapes(get_fake_ir_engine, mocker):
+    engine = get_fake_ir_engine
+    engine.network_cache = ExecutableNetworkCache(capacity=2)
+    mocker.patch.object(IrEngine, '_load_executable_network',
+                        return_value=mocker.MagicMock())
+    assert engine.reshape(2) is None
+    stats = engine.get_stats()
+    assert stats['reshape_count'] == 1
+    assert stats['load_count'] == 1
+    assert stats['network_cache']['misses'] == 1
+    assert stats['network_cache']['hits'] == 0
+
+    assert engine.reshape(1) is None
+    assert engine.reshape(2) is None
+    stats = engine.get_stats()
+    assert stats['reshape_count'] == 3
+    assert stats['load_count'] == 2
+    assert stats['network_cache']['misses'] == 2
+    assert stats['network_cache']['hits'] == 1
+
+
+def test_build_dynamic_batching_non_batch_output(mocker, tmpdir):
+    model_xml = tmpdir.join('model.xml')
+    model_bin = tmpdir.join('model.bin')
+    model_xml.write('xml')
+    model_bin.write('bin')
+    net = MockedNet(
+        inputs={'input': MockedIOInfo('FP32', [1, 3, 4, 4], 'NCHW')},
+        outputs={'output': MockedIOInfo('FP32', [1, 10], 'NC'),
+                 'anchors': MockedIOInfo('FP32', [10, 4], 'NC')})
+    mocker.patch("ie_serving.models.ir_engine.IEPlugin")
+    mocker.patch("ie_serving.models.ir_engine.IENetwork", return_value=net)
+    mocker.patch.object(IrEngine, '_load_executable_network',
+                        return_value=MockedExecNet())
+    engine = IrEngine.build(model_name='test', model_version=1,
+                            model_xml=str(model_xml),
+                            model_bin=str(model_bin), mapping_config=None,
+                            batch_size_param=None, shape_param=None,
+                            num_ireq=1, target_device='CPU',
+                            plugin_config=None,
+                            dynamic_batching={'max_batch_size': 4,
+                                              'max_delay_ms': 1})
+    engine.stop_inference_service()
+    assert not engine.dynamic_batching_info.enabled
+    assert net.batch_size == 1
+    assert net.inputs['input'].shape == [1, 3, 4, 4]
+    assert engine.batching_info.batch_size == 1
+
+    inference_input, error_message = prepare_input_data(
+        engine, {'input': np.ones((1, 3, 4, 4))}, REST)
+    assert error_message is None
+    assert inference_input['input'].shape == (1, 3, 4, 4)
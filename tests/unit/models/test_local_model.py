@@ -93,19 +93,37 @@ def test_get_engines_for_model(mocker, is_error):
     engines_mocker = mocker.patch('ie_serving.models.ir_engine.IrEngine.'
                                   'build')
 
-    engines_mocker.side_effect = ['modelv2', 'modelv4']
+    # Versions are loaded in parallel, so engines are matched by version
+    engines_mocker.side_effect = lambda **engine_spec: \
+        engine_spec['model_xml'].split('.')[0]
     available_versions = [{'xml_file': 'modelv2.xml',
                            'bin_file': 'modelv2.bin',
                            'mapping_config': 'mapping_config.json',
                            'version_number': 2, 'batch_size_param': None,
                            'shape_param': None, 'num_ireq': 1,
-                           'target_device': 'CPU', 'plugin_config': None},
+                           'target_device': 'CPU', 'plugin_config': None,
+                           'dynamic_batching': None,
+                           'shape_buckets': None,
+                           'batch_size_pool': None,
+                           'batch_sharding': None,
+                           'admission_control': None,
+                           'autotune': None,
+                           'warmup': None,
+                           'warmup_file': None},
                           {'xml_file': 'modelv4.xml',
                            'bin_file': 'modelv4.bin',
                            'mapping_config': 'mapping_config.json',
                            'version_number': 4, 'batch_size_param': None,
                            'shape_param': None, 'num_ireq': 1,
-                           'target_device': 'CPU', 'plugin_config': None}]
+                           'target_device': 'CPU', 'plugin_config': None,
+                           'dynamic_batching': None,
+                           'shape_buckets': None,
+                           'batch_size_pool': None,
+                           'batch_sharding': None,
+                           'admission_control': None,
+                           'autotune': None,
+                           'warmup': None,
+                           'warmup_file': None}]
     versions_statuses = {}
     for version in available_versions:
         version_number = version['version_number']
@@ -140,25 +158,55 @@ def test_get_engines_for_model(mocker, is_error):
 def test_get_engines_for_model_with_ir_raises(mocker):
     engines_mocker = mocker.patch('ie_serving.models.ir_engine.IrEngine.'
                                   'build')
-    engines_mocker.side_effect = ['modelv2', 'modelv4', Exception("test")]
+
+    def build_engine(**engine_spec):
+        if engine_spec['model_version'] == 4:
+            raise Exception("test")
+        return engine_spec['model_xml'].split('.')[0]
+
+    engines_mocker.side_effect = build_engine
     available_versions = [{'xml_file': 'modelv2.xml',
                            'bin_file': 'modelv2.bin',
                            'mapping_config': 'mapping_config.json',
                            'version_number': 2, 'batch_size_param': None,
                            'shape_param': None, 'num_ireq': 1,
-                           'target_device': 'CPU', 'plugin_config': None},
+                           'target_device': 'CPU', 'plugin_config': None,
+                           'dynamic_batching': None,
+                           'shape_buckets': None,
+                           'batch_size_pool': None,
+                           'batch_sharding': None,
+                           'admission_control': None,
+                           'autotune': None,
+                           'warmup': None,
+                           'warmup_file': None},
                           {'xml_file': 'modelv4.xml',
                            'bin_file': 'modelv4.bin',
                            'mapping_config': 'mapping_config.json',
                            'version_number': 3, 'batch_size_param': None,
                            'shape_param': None, 'num_ireq': 1,
-                           'target_device': 'CPU', 'plugin_config': None},
+                           'target_device': 'CPU', 'plugin_config': None,
+                           'dynamic_batching': None,
+                           'shape_buckets': None,
+                           'batch_size_pool': None,
+                           'batch_sharding': None,
+                           'admission_control': None,
+                           'autotune': None,
+                           'warmup': None,
+                           'warmup_file': None},
                           {'xml_file': 'modelv4.xml',
                            'bin_file': 'modelv4.bin',
                            'mapping_config': 'mapping_config.json',
                            'version_number': 4, 'batch_size_param': None,
                            'shape_param': None, 'num_ireq': 1,
-                           'target_device': 'CPU', 'plugin_config': None}]
+                           'target_device': 'CPU', 'plugin_config': None,
+                           'dynamic_batching': None,
+                           'shape_buckets': None,
+                           'batch_size_pool': None,
+                           'batch_sharding': None,
+                           'admission_control': None,
+                           'autotune': None,
+                           'warmup': None,
+                           'warmup_file': None}]
     versions_statuses = {}
     for version in available_versions:
         version_number = version['version_number']
@@ -0,0 +1,80 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import os
+import queue
+import shutil
+import struct
+
+from ie_serving.models.local_repository_watcher import IN_CREATE, \
+    IN_ISDIR, LocalRepositoryWatcher, parse_events
+
+
+def test_parse_events():
+    data = struct.pack('iIII', 1, IN_CREATE | IN_ISDIR, 0, 8) + \
+        b'2\0\0\0\0\0\0\0' + struct.pack('iIII', 2, IN_CREATE, 0, 0)
+    assert parse_events(data) == [(1, IN_CREATE | IN_ISDIR, '2'),
+                                  (2, IN_CREATE, '')]
+
+
+def test_pop_settled_models():
+    watcher = LocalRepositoryWatcher(debounce=1, on_change=None)
+    watcher.last_events = {'settled': 10, 'changing': 10.5}
+    assert watcher._pop_settled_models(11) == ['settled']
+    assert watcher.last_events == {'changing': 10.5}
+
+
+def test_watch_model_directory(tmpdir):
+    changed_models = queue.Queue()
+    watcher = LocalRepositoryWatcher(debounce=0.2,
+                                     on_change=changed_models.put)
+    model_directory = tmpdir.mkdir('model')
+    model_directory.mkdir('1')
+    if not watcher.watch('test', str(model_directory)):
+        assert watcher.inotify_unavailable
+        return
+    version_directory = model_directory.mkdir('2')
+    assert changed_models.get(timeout=5) == 'test'
+
+    with open(os.path.join(str(version_directory), 'model.xml'), 'w') as f:
+        f.write('test')
+    assert changed_models.get(timeout=5) == 'test'
+    assert changed_models.empty()
+
+
+def test_watch_missing_directory(tmpdir):
+    watcher = LocalRepositoryWatcher(debounce=0.2, on_change=None)
+    assert not watcher.watch('test', str(tmpdir.join('missing')))
+
+
+def test_watch_recreated_model_directory(tmpdir):
+    changed_models = queue.Queue()
+    watcher = LocalRepositoryWatcher(debounce=0.2,
+                                     on_change=changed_models.put)
+    model_directory = tmpdir.mkdir('model')
+    if not watcher.watch('test', str(model_directory)):
+        assert watcher.inotify_unavailable
+        return
+    shutil.rmtree(str(model_directory))
+    assert changed_models.get(timeout=5) == 'test'
+    assert str(model_directory) in watcher.removed_directories
+
+    tmpdir.mkdir('model').mkdir('1')
+    assert changed_models.get(timeout=5) == 'test'
+    assert str(model_directory) in watcher.models_directories
+    assert watcher.removed_directories == {}
+
+    tmpdir.join('model').mkdir('2')
+    assert changed_models.get(timeout=5) == 'test'
@@ -53,8 +53,9 @@ def test_mark_differences(get_fake_model, new_versions, expected_to_delete,
     for new_version in to_create:
         assert model.versions_statuses[new_version].state == \
                ModelVersionState.START
+    # Removed versions keep serving until new versions are loaded
     for old_version in to_delete:
-        assert model.versions_statuses[old_version].state == \
+        assert model.versions_statuses[old_version].state != \
                ModelVersionState.UNLOADING
 
     assert expected_to_create == to_create
@@ -74,6 +75,121 @@ def test_delete_engine(get_fake_model):
     assert model.versions_statuses[version].state == ModelVersionState.END
 
 
+def test_get_engine_lazy_loading(get_fake_model, mocker):
+    model = get_fake_model
+    model.lazy_loading = True
+    model.update_locks = {version: threading.Lock() for version in
+                          model.versions}
+    model.versions_attributes = {2: {'version_number': 2}}
+    engine = model.engines.pop(2)
+    model._publish_routing_table()
+    get_engine_mock = mocker.patch.object(model, 'get_engine_for_version',
+                                          return_value=engine)
+    assert model.is_ready()
+    assert model.get_engine(2) is engine
+    assert model.get_engine(2) is engine
+    get_engine_mock.assert_called_once_with('test', {'version_number': 2})
+    assert model.engines[2] is engine
+    assert 2 in model.engines_last_used
+    assert model.versions_statuses[2].state == ModelVersionState.AVAILABLE
+    assert model.get_engine(5) is None
+
+
+def test_get_engine_acquire(get_fake_model):
+    model = get_fake_model
+    model.update_locks = {version: threading.Lock() for version in
+                          model.versions}
+    engine = model.get_engine(2, acquire=True)
+    assert engine.active_requests == 1
+    assert not model._is_engine_idle(2, 0)
+    engine.release()
+    engine.draining = True
+    assert model.get_engine(2, acquire=True) is None
+
+
+def test_resolve_engine_default_version_drained(get_fake_model, mocker):
+    model = get_fake_model
+    model.update_locks = {version: threading.Lock() for version in
+                          model.versions}
+    old_engine = model.engines[3]
+
+    def switch_to_previous_version():
+        # Version 3 is replaced and drained after the request read
+        # the routing table
+        model.versions = [1, 2]
+        model._publish_routing_table()
+        return False
+    mocker.patch.object(old_engine, 'acquire',
+                        side_effect=switch_to_previous_version)
+    version, engine = model.resolve_engine(0, acquire=True)
+    assert version == 2
+    assert engine is model.engines[2]
+    assert engine.active_requests == 1
+
+
+def test_resolve_engine_specific_version_drained(get_fake_model):
+    model = get_fake_model
+    model.update_locks = {version: threading.Lock() for version in
+                          model.versions}
+    model.engines[2].draining = True
+    assert model.resolve_engine(2, acquire=True) == (2, None)
+    assert model.resolve_engine(5) == (None, None)
+
+
+def test_get_engine_lazy_loading_error(get_fake_model, mocker):
+    model = get_fake_model
+    model.lazy_loading = True
+    model.update_locks = {2: threading.Lock()}
+    model.versions_attributes = {2: {'version_number': 2}}
+    del model.engines[2]
+    model._publish_routing_table()
+    mocker.patch.object(model, 'get_engine_for_version',
+                        side_effect=Exception("test"))
+    assert model.get_engine(2) is None
+    assert 2 not in model.engines
+    assert model.versions_statuses[2].state == ModelVersionState.LOADING
+
+
+def test_delete_engine_unload_idle(get_fake_model):
+    model = get_fake_model
+    model.lazy_loading = True
+    model.idle_timeout = 60
+    version = 2
+    update_locks = {version: threading.Lock()}
+    model.versions_statuses[version].set_available()
+    model.engines_last_used[version] = time.time()
+    assert not model._delete_engine(version, update_locks,
+                                    model.idle_timeout)
+    assert version in model.engines
+
+    model.engines_last_used[version] = time.time() - 120
+    assert model._delete_engine(version, update_locks, model.idle_timeout)
+    assert version not in model.engines
+    assert version not in model.routing_table.engines
+    assert model.routing_table.resolve_version(version) == version
+    assert version in model.versions
+    assert model.versions_statuses[version].state == ModelVersionState.START
+
+
+def test_unload_idle_engines(get_fake_model):
+    model = get_fake_model
+    model.lazy_loading = True
+    model.idle_timeout = 60
+    model.update_locks = {version: threading.Lock() for version in
+                          model.versions}
+    for version in model.versions:
+        model.versions_statuses[version].set_available()
+        model.engines_last_used[version] = time.time()
+    model.engines_last_used[2] = time.time() - 120
+    model.unload_idle_engines()
+    for _ in range(100):
+        if 2 not in model.engines:
+            break
+        time.sleep(0.05)
+    assert sorted(model.engines) == [1, 3]
+    assert model.versions_statuses[2].state == ModelVersionState.START
+
+
 @pytest.mark.parametrize("input, expected_output", [
     ('/test/test/2/', 2),
     ('/test/test/test/', -1)
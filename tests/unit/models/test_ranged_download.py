@@ -0,0 +1,67 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import hashlib
+
+import pytest
+
+from ie_serving.models.ranged_download import RangedDownloader
+
+CONTENT = bytes(range(256)) * 4
+
+
+def read_range(start, end):
+    return CONTENT[start:end + 1]
+
+
+@pytest.mark.parametrize("size, part_size, parts", [
+    (0, 10, []),
+    (10, 10, [(0, 9)]),
+    (25, 10, [(0, 9), (10, 19), (20, 24)]),
+])
+def test_get_parts(size, part_size, parts):
+    assert RangedDownloader(part_size, 4).get_parts(size) == parts
+
+
+@pytest.mark.parametrize("part_size, concurrency", [
+    (100, 4), (100, 1), (2048, 4)])
+def test_download(tmpdir, part_size, concurrency):
+    downloader = RangedDownloader(part_size, concurrency)
+    local_path = str(tmpdir.join('model.bin'))
+    downloader.download('s3://bucket/model/1/model.bin', local_path,
+                        len(CONTENT), read_range,
+                        hashlib.md5(CONTENT).hexdigest())
+    with open(local_path, 'rb') as f:
+        assert f.read() == CONTENT
+    stats = downloader.get_stats()
+    assert stats['files_count'] == 1
+    assert stats['bytes_count'] == len(CONTENT)
+
+
+def test_download_checksum_mismatch(tmpdir):
+    downloader = RangedDownloader(100, 4)
+    with pytest.raises(ValueError):
+        downloader.download('s3://bucket/model/1/model.bin',
+                            str(tmpdir.join('model.bin')), len(CONTENT),
+                            read_range, hashlib.md5(b'other').hexdigest())
+    assert downloader.get_stats()['files_count'] == 0
+
+
+def test_download_incomplete_range(tmpdir):
+    downloader = RangedDownloader(100, 4)
+    with pytest.raises(ValueError):
+        downloader.download('s3://bucket/model/1/model.bin',
+                            str(tmpdir.join('model.bin')), len(CONTENT),
+                            lambda start, end: CONTENT[start:end])
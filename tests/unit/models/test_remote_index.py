@@ -0,0 +1,134 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import json
+
+import pytest
+
+from ie_serving.models.remote_index import RemoteIndex, RemoteIndexes, \
+    get_model_directory, load_manifest
+
+MD5 = '0123456789abcdef0123456789abcdef'
+MANIFEST = json.dumps({'versions': {'1': {
+    'model.xml': {'size': 10, 'md5': MD5},
+    'model.bin': {'size': 20, 'md5': MD5}}}})
+
+
+def get_objects(keys, etag='etag'):
+    return [(key, etag, 0, None) for key in keys]
+
+
+@pytest.mark.parametrize("keys, versions", [
+    (['model/3/', 'model/3.txt', 'model/sub/2/', 'model/one'],
+     ['s3://bucket/model/3/']),
+    (['model/3/something.xml', 'model/3/something.bin', 'model/2/4/3/file',
+      'model/1/'],
+     ['s3://bucket/model/1/', 's3://bucket/model/2/',
+      's3://bucket/model/3/']),
+    (['model/dir1/', 'model/3.txt', 'model/dir2/2/', 'model/one/file'], []),
+])
+def test_get_versions(keys, versions):
+    index = RemoteIndex('s3://bucket/model/', get_objects(keys))
+    assert sorted(index.get_versions()) == versions
+
+
+@pytest.mark.parametrize("keys, version_files", [
+    (['model/3/', 'model/3/2/'], (None, None)),
+    (['model/3/model.xml', 'model/3/model.bin', 'model/3/sub/file'],
+     ('s3://bucket/model/3/model.xml', 's3://bucket/model/3/model.bin')),
+    (['model/3//file.bin', 'model/3//file.xml'], (None, None)),
+    (['model/3/somefile.bin', 'model/3/otherfile.xml'], (None, None)),
+])
+def test_get_version_files(keys, version_files):
+    index = RemoteIndex('s3://bucket/model/', get_objects(keys))
+    assert index.get_version_files('s3://bucket/model/3/') == version_files
+
+
+def test_get_file():
+    index = RemoteIndex('s3://bucket/model/', get_objects(
+        ['model/3/model.xml', 'model/3/mapping_config.json']))
+    assert index.get_file('s3://bucket/model/3/', 'mapping_config.json') == \
+        's3://bucket/model/3/mapping_config.json'
+    assert index.get_file('s3://bucket/model/3/', 'warmup_data.npz') is None
+    assert index.get_file('s3://bucket/model/4/', 'model.xml') is None
+
+
+def test_diff():
+    previous = RemoteIndex('s3://bucket/model/', get_objects(
+        ['model/1/model.bin', 'model/2/model.bin']))
+    index = RemoteIndex('s3://bucket/model/', get_objects(
+        ['model/3/model.bin']) + get_objects(['model/2/model.bin'],
+                                             etag='new_etag'))
+    assert index.diff(previous) == {'added': ['s3://bucket/model/3/'],
+                                    'removed': ['s3://bucket/model/1/'],
+                                    'modified': ['s3://bucket/model/2/']}
+
+
+def test_publish_stats():
+    indexes = RemoteIndexes()
+    index = RemoteIndex('s3://bucket/model/', get_objects(
+        ['model/1/model.bin']), api_calls=2, latency=0.5)
+    changes = indexes.publish(index)
+    assert changes['added'] == ['s3://bucket/model/1/']
+    indexes.publish(index)
+    assert indexes.get_for_version('s3://bucket/model/1/') is index
+    assert indexes.get_stats('s3://bucket/model') == {
+        'listings_count': 2, 'api_calls': 4, 'last_api_calls': 2,
+        'last_latency_ms': 500, 'objects_count': 1, 'manifest': False}
+
+
+def test_get_etag():
+    indexes = RemoteIndexes()
+    assert indexes.get_etag('s3://bucket/model/1/model.bin') is None
+    indexes.publish(RemoteIndex('s3://bucket/model/', get_objects(
+        ['model/1/model.bin'], etag='bin_etag')))
+    assert indexes.get_etag('s3://bucket/model/1/model.bin') == 'bin_etag'
+    assert indexes.get_object('s3://bucket/model/1/model.bin') == {
+        'etag': 'bin_etag', 'size': 0, 'md5': None}
+    assert indexes.get_etag('s3://bucket/model/1/model.xml') is None
+    assert indexes.get_etag('s3://bucket/model/2/model.bin') is None
+
+
+def test_load_manifest():
+    index = load_manifest('s3://bucket/model/', MANIFEST, 'manifest_etag',
+                          api_calls=1)
+    assert index.manifest_version == 'manifest_etag'
+    assert index.get_versions() == ['s3://bucket/model/1/']
+    assert index.get_version_files('s3://bucket/model/1/') == (
+        's3://bucket/model/1/model.xml', 's3://bucket/model/1/model.bin')
+    assert index.versions['s3://bucket/model/1/']['model.bin'] == {
+        'etag': MD5, 'size': 20, 'md5': MD5}
+
+    unchanged = index.get_unchanged(1, 0.1)
+    assert unchanged.versions is index.versions
+    assert unchanged.manifest_version == 'manifest_etag'
+    assert unchanged.latency == 0.1
+
+
+@pytest.mark.parametrize("content", [
+    'not json',
+    json.dumps({'model.xml': {'size': 10, 'md5': MD5}}),
+    json.dumps({'versions': {'one': {'model.xml': {'size': 10,
+                                                   'md5': MD5}}}}),
+    json.dumps({'versions': {'1': {'model.xml': {'size': 10}}}}),
+    json.dumps({'versions': {'1': {'model.xml': {'size': 10,
+                                                 'md5': 'md5'}}}}),
+])
+def test_load_invalid_manifest(content):
+    assert load_manifest('s3://bucket/model/', content, 'etag') is None
+
+
+def test_get_model_directory():
+    assert get_model_directory('s3://bucket/model/3/') == 's3://bucket/model/'
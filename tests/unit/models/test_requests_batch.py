@@ -0,0 +1,109 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import numpy as np
+import pytest
+
+from ie_serving.models.requests_batch import RequestsBatch, \
+    ShardedRequest, are_inputs_compatible, split_inputs
+from ie_serving.server.request import Request
+
+
+@pytest.mark.parametrize("first_input, second_input, expected_output", [
+    ({'input': np.ones((1, 3))}, {'input': np.ones((2, 3))}, True),
+    ({'input': np.ones((1, 3))}, {'input': np.ones((1, 4))}, False),
+    ({'input': np.ones((1, 3))}, {'other': np.ones((1, 3))}, False),
+    ({'input': np.ones((1, 3), dtype=np.float32)},
+     {'input': np.ones((1, 3), dtype=np.int32)}, False),
+])
+def test_are_inputs_compatible(first_input, second_input, expected_output):
+    assert are_inputs_compatible(first_input, second_input) == \
+        expected_output
+
+
+@pytest.mark.parametrize("batch_sizes, target_batch_size", [
+    ([1, 1, 1], 3),
+    ([1, 2], 4),
+    ([3], 8),
+])
+def test_requests_batch_merge_inputs(batch_sizes, target_batch_size):
+    requests = [Request({'input': np.full((batch_size, 2), index)})
+                for index, batch_size in enumerate(batch_sizes)]
+    requests_batch = RequestsBatch(requests, target_batch_size,
+                                   release_ireq=lambda ireq_index: None)
+    merged_input = requests_batch.inference_input['input']
+    assert merged_input.shape == (target_batch_size, 2)
+    assert requests_batch.batch_size == sum(batch_sizes)
+    assert not merged_input[sum(batch_sizes):].any()
+
+
+def test_requests_batch_set_result():
+    released = []
+    requests = [Request({'input': np.ones((1, 2))}),
+                Request({'input': np.ones((2, 2))})]
+    requests_batch = RequestsBatch(requests, 4,
+                                   release_ireq=released.append)
+    output = np.arange(4).reshape((4, 1))
+    requests_batch.set_result(ireq_index=0, result={'output': output})
+
+    assert released == [0]
+    first_result, first_ireq_index = requests[0].wait_for_result()
+    second_result, second_ireq_index = requests[1].wait_for_result()
+    assert first_ireq_index is None and second_ireq_index is None
+    assert first_result['output'].tolist() == [[0]]
+    assert second_result['output'].tolist() == [[1], [2]]
+
+
+def test_requests_batch_set_error():
+    released = []
+    requests = [Request({'input': np.ones((1, 2))}),
+                Request({'input': np.ones((1, 2))})]
+    requests_batch = RequestsBatch(requests, 2,
+                                   release_ireq=released.append)
+    requests_batch.set_result(ireq_index=None, result="error")
+    assert released == [None]
+    for request in requests:
+        assert request.wait_for_result() == ("error", None)
+
+
+def test_split_inputs():
+    inference_input = {'input': np.arange(5).reshape((5, 1))}
+    shards_inputs = split_inputs(inference_input, [2, 2, 1])
+    assert [shard_input['input'].tolist() for shard_input in
+            shards_inputs] == [[[0], [1]], [[2], [3]], [[4]]]
+
+
+def test_sharded_request_set_result():
+    request = Request({'input': np.arange(5).reshape((5, 1))})
+    sharded_request = ShardedRequest(request, [4, 1])
+    shards_batches = [RequestsBatch([shard], 4, release_ireq=lambda x: None)
+                      for shard in sharded_request.shards]
+    for ireq_index, shard_batch in reversed(list(enumerate(shards_batches))):
+        assert not request.is_set()
+        shard_batch.set_result(ireq_index=ireq_index, result={
+            'output': shard_batch.inference_input['input'] * 2})
+    result, ireq_index = request.wait_for_result()
+    assert ireq_index is None
+    assert result['output'].tolist() == [[0], [2], [4], [6], [8]]
+
+
+def test_sharded_request_set_error():
+    request = Request({'input': np.ones((2, 1))})
+    sharded_request = ShardedRequest(request, [1, 1])
+    sharded_request.shards[0].set_result(ireq_index=None, result="error")
+    assert not request.is_set()
+    sharded_request.shards[1].set_result(ireq_index=None,
+                                         result={'output': np.ones((1, 1))})
+    assert request.wait_for_result() == ("error", None)
@@ -0,0 +1,85 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import queue
+
+import pytest
+
+from ie_serving.models.requests_queue import RequestsQueue, \
+    parse_lanes_weights, WEIGHTED_SCHEDULING
+from ie_serving.server.request import Request
+
+
+def put_requests(requests_queue, priorities):
+    for index, priority in enumerate(priorities):
+        request = Request({'index': index}, priority=priority)
+        requests_queue.put(request)
+
+
+def get_indexes(requests_queue, number):
+    return [requests_queue.get(timeout=1).inference_input['index'] for _ in
+            range(number)]
+
+
+def test_requests_queue_fifo():
+    requests_queue = RequestsQueue()
+    put_requests(requests_queue, [0, 5, 0])
+    assert get_indexes(requests_queue, 3) == [0, 1, 2]
+    with pytest.raises(queue.Empty):
+        requests_queue.get(timeout=0.01)
+
+
+def test_requests_queue_strict_scheduling():
+    requests_queue = RequestsQueue(lanes=3)
+    put_requests(requests_queue, [2, 1, 0, 2, 0])
+    assert get_indexes(requests_queue, 5) == [2, 4, 1, 0, 3]
+
+
+def test_requests_queue_weighted_scheduling():
+    requests_queue = RequestsQueue(lanes=2, scheduling=WEIGHTED_SCHEDULING,
+                                   weights=[2, 1])
+    put_requests(requests_queue, [1, 1, 1, 0, 0, 0, 0])
+    assert get_indexes(requests_queue, 7) == [3, 4, 0, 5, 6, 1, 2]
+
+
+def test_requests_queue_maxsize():
+    requests_queue = RequestsQueue(maxsize=1)
+    requests_queue.put(Request({}))
+    assert requests_queue.full()
+    with pytest.raises(queue.Full):
+        requests_queue.put(Request({}), block=False)
+    with pytest.raises(queue.Full):
+        requests_queue.put(Request({}), timeout=0.01)
+
+
+def test_requests_queue_stats():
+    requests_queue = RequestsQueue(lanes=2)
+    put_requests(requests_queue, [0, 1, 1])
+    request = requests_queue.get()
+    assert request.queue_wait is not None
+    stats = requests_queue.get_stats()
+    assert [lane_stats['depth'] for lane_stats in stats] == [0, 2]
+    assert [lane_stats['dequeued'] for lane_stats in stats] == [1, 0]
+
+
+@pytest.mark.parametrize("weights_param, lanes, expected_weights", [
+    (None, 3, [3, 2, 1]),
+    ('8,4,1', 3, [8, 4, 1]),
+    ('8,4', 3, [3, 2, 1]),
+    ('8,x', 2, [2, 1]),
+    ('1,0', 2, [2, 1]),
+])
+def test_parse_lanes_weights(weights_param, lanes, expected_weights):
+    assert parse_lanes_weights(weights_param, lanes) == expected_weights
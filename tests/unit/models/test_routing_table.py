@@ -0,0 +1,42 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import pytest
+
+from ie_serving.models.routing_table import RoutingTable
+
+
+@pytest.mark.parametrize("versions, requested_version, expected_version", [
+    ([1, 2, 8], 0, 8),
+    ([1, 2, 8], 2, 2),
+    ([1, 2, 8], 5, None),
+    ([], 0, None),
+])
+def test_resolve_version(versions, requested_version, expected_version):
+    routing_table = RoutingTable(versions, {})
+    assert routing_table.resolve_version(requested_version) == \
+        expected_version
+
+
+def test_routing_table_is_snapshot():
+    versions = [1, 2]
+    engines = {1: 'engine_1', 2: 'engine_2', 3: 'engine_3'}
+    routing_table = RoutingTable(versions, engines)
+    versions.append(3)
+    del engines[1]
+    assert routing_table.default_version == 2
+    assert dict(routing_table.engines) == {1: 'engine_1', 2: 'engine_2'}
+    with pytest.raises(TypeError):
+        routing_table.engines[3] = 'engine_3'
@@ -13,9 +13,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import hashlib
+import io
+import json
+
 import pytest
+from botocore import exceptions
 
 from ie_serving.models.s3_model import S3Model
+from ie_serving.models.remote_index import RemoteIndex, remote_indexes
+from ie_serving.models.storage_clients import storage_clients
+
+MD5 = '0123456789abcdef0123456789abcdef'
+
+
+@pytest.fixture(autouse=True)
+def clear_remote_indexes():
+    remote_indexes.indexes.clear()
+
+
+def get_listing(keys):
+    return [(key, 'etag', 0, None) for key in keys], 1
 
 
 @pytest.mark.parametrize("content_list, versions", [
@@ -30,8 +48,8 @@ from ie_serving.models.s3_model import S3Model
 ])
 def test_get_versions(mocker, content_list, versions):
     list_content_mocker = mocker.patch('ie_serving.models.s3_model.S3Model.'
-                                       's3_list_content')
-    list_content_mocker.return_value = content_list
+                                       's3_list_objects')
+    list_content_mocker.return_value = get_listing(content_list)
 
     output = S3Model.get_versions('s3://bucket/model')
     assert set(output) == set(versions)
@@ -57,8 +75,8 @@ def test_get_versions(mocker, content_list, versions):
 ])
 def test_get_versions_files(mocker, content_list, version_files):
     list_content_mocker = mocker.patch('ie_serving.models.s3_model.S3Model.'
-                                       's3_list_content')
-    list_content_mocker.return_value = content_list
+                                       's3_list_objects')
+    list_content_mocker.return_value = get_listing(content_list)
 
     xml, bin, mapping = S3Model.get_version_files('s3://bucket/model/3/')
     assert (xml, bin, mapping) == version_files
@@ -66,11 +84,10 @@ def test_get_versions_files(mocker, content_list, version_files):
 
 def test_get_mapping_config(mocker):
     list_content_mocker = mocker.patch('ie_serving.models.s3_model.S3Model.'
-                                       's3_list_content')
-    list_content_mocker.return_value = ['model/3/doc.doc',
-                                        'model/3/mapping_config.json',
-                                        'model/3/model.xml',
-                                        'model/3/model.bin']
+                                       's3_list_objects')
+    list_content_mocker.return_value = get_listing([
+        'model/3/doc.doc', 'model/3/mapping_config.json', 'model/3/model.xml',
+        'model/3/model.bin'])
 
     mapping = S3Model._get_mapping_config('s3://bucket/model/3/')
     assert mapping == 's3://bucket/model/3/mapping_config.json'
@@ -78,11 +95,133 @@ def test_get_mapping_config(mocker):
 
 def test_not_mapping_config(mocker):
     list_content_mocker = mocker.patch('ie_serving.models.s3_model.S3Model.'
-                                       's3_list_content')
-    list_content_mocker.return_value = ['model/3/doc.doc',
-                                        'model/3/config.json',
-                                        'model/3/model.xml',
-                                        'model/3/model.bin']
+                                       's3_list_objects')
+    list_content_mocker.return_value = get_listing([
+        'model/3/doc.doc', 'model/3/config.json', 'model/3/model.xml',
+        'model/3/model.bin'])
 
     mapping = S3Model._get_mapping_config('s3://bucket/model/3/')
     assert mapping is None
+
+
+def test_single_listing_per_update(mocker):
+    list_content_mocker = mocker.patch('ie_serving.models.s3_model.S3Model.'
+                                       's3_list_objects')
+    list_content_mocker.return_value = get_listing([
+        'model/3/model.xml', 'model/3/model.bin',
+        'model/3/mapping_config.json', 'model/3/warmup_data.npz'])
+
+    assert S3Model.get_versions('s3://bucket/model') == \
+        ['s3://bucket/model/3/']
+    assert S3Model.get_version_files('s3://bucket/model/3/') == (
+        's3://bucket/model/3/model.xml', 's3://bucket/model/3/model.bin',
+        's3://bucket/model/3/mapping_config.json')
+    assert S3Model._get_warmup_file('s3://bucket/model/3/') == \
+        's3://bucket/model/3/warmup_data.npz'
+    list_content_mocker.assert_called_once_with('s3://bucket/model/')
+    assert S3Model.get_listing_stats(
+        's3://bucket/model')['last_api_calls'] == 1
+
+
+def test_s3_call_anonymous_fallback(mocker):
+    storage_clients.clear()
+    signed_client = mocker.MagicMock()
+    signed_client.download_file.side_effect = exceptions.ClientError(
+        {'Error': {'Code': '403'}}, 'GetObject')
+    anonymous_client = mocker.MagicMock()
+    mocker.patch.object(S3Model, 'get_s3_client',
+                        side_effect=lambda anonymous=False: anonymous_client
+                        if anonymous else signed_client)
+
+    S3Model.s3_download_file('s3://bucket/model/1/model.bin', 'model.bin')
+    S3Model.s3_download_file('s3://bucket/model/1/model.xml', 'model.xml')
+    signed_client.download_file.assert_called_once()
+    assert anonymous_client.download_file.call_count == 2
+    storage_clients.clear()
+
+
+@pytest.mark.parametrize("verify_etag_checksum, md5", [
+    (False, None), (True, MD5)])
+def test_s3_list_objects_checksums(mocker, verify_etag_checksum, md5):
+    mocker.patch.dict('ie_serving.models.s3_model.S3_CONFIG',
+                      {'verify_etag_checksum': verify_etag_checksum})
+    s3_client = mocker.MagicMock()
+    s3_client.get_paginator.return_value.paginate.return_value = [
+        {'Contents': [{'Key': 'model/1/model.bin', 'ETag': '"' + MD5 + '"',
+                       'Size': 20},
+                      {'Key': 'model/1/model.xml', 'ETag': '"' + MD5 + '-2"',
+                       'Size': 10}]}]
+    mocker.patch.object(S3Model, 'get_s3_client', return_value=s3_client)
+
+    objects, api_calls = S3Model.s3_list_objects('s3://bucket/model/')
+    assert objects == [('model/1/model.bin', MD5, 20, md5),
+                       ('model/1/model.xml', MD5 + '-2', 10, None)]
+    assert api_calls == 1
+
+
+def test_s3_download_file_ranges(mocker, tmpdir):
+    content = b'0123456789' * 10
+    remote_indexes.publish(RemoteIndex('s3://bucket/model/', [
+        ('model/1/model.bin', 'etag', len(content),
+         hashlib.md5(content).hexdigest())]))
+    s3_client = mocker.MagicMock()
+
+    def get_object(Bucket, Key, Range):
+        start, end = Range[len('bytes='):].split('-')
+        return {'Body': io.BytesIO(content[int(start):int(end) + 1])}
+    s3_client.get_object.side_effect = get_object
+    mocker.patch.object(S3Model, 'get_s3_client', return_value=s3_client)
+    mocker.patch('ie_serving.models.s3_model.ranged_downloader.part_size',
+                 30)
+
+    local_path = str(tmpdir.join('model.bin'))
+    S3Model.s3_download_file('s3://bucket/model/1/model.bin', local_path)
+    with open(local_path, 'rb') as f:
+        assert f.read() == content
+    assert s3_client.get_object.call_count == 4
+    s3_client.download_file.assert_not_called()
+
+
+def test_get_versions_from_manifest(mocker):
+    mocker.patch.dict('ie_serving.models.s3_model.GLOBAL_CONFIG',
+                      {'models_manifest_filename': 'manifest.json'})
+    list_content_mocker = mocker.patch('ie_serving.models.s3_model.S3Model.'
+                                       's3_list_objects')
+    manifest = json.dumps({'versions': {'1': {
+        'model.xml': {'size': 10, 'md5': MD5},
+        'model.bin': {'size': 20, 'md5': MD5}}}}).encode()
+    s3_client = mocker.MagicMock()
+    s3_client.get_object.return_value = {'Body': io.BytesIO(manifest),
+                                         'ETag': '"manifest_etag"'}
+    mocker.patch.object(S3Model, 'get_s3_client', return_value=s3_client)
+
+    assert S3Model.get_versions('s3://bucket/model') == \
+        ['s3://bucket/model/1/']
+    s3_client.get_object.assert_called_once_with(
+        Bucket='bucket', Key='model/manifest.json')
+
+    s3_client.get_object.side_effect = exceptions.ClientError(
+        {'Error': {'Code': '304'}}, 'GetObject')
+    assert S3Model.get_versions('s3://bucket/model') == \
+        ['s3://bucket/model/1/']
+    s3_client.get_object.assert_called_with(
+        Bucket='bucket', Key='model/manifest.json',
+        IfNoneMatch='"manifest_etag"')
+    list_content_mocker.assert_not_called()
+    assert S3Model.get_listing_stats('s3://bucket/model')['manifest']
+
+
+def test_get_versions_manifest_not_found(mocker):
+    mocker.patch.dict('ie_serving.models.s3_model.GLOBAL_CONFIG',
+                      {'models_manifest_filename': 'manifest.json'})
+    list_content_mocker = mocker.patch('ie_serving.models.s3_model.S3Model.'
+                                       's3_list_objects')
+    list_content_mocker.return_value = get_listing(['model/3/model.xml'])
+    s3_client = mocker.MagicMock()
+    s3_client.get_object.side_effect = exceptions.ClientError(
+        {'Error': {'Code': 'NoSuchKey'}}, 'GetObject')
+    mocker.patch.object(S3Model, 'get_s3_client', return_value=s3_client)
+
+    assert S3Model.get_versions('s3://bucket/model') == \
+        ['s3://bucket/model/3/']
+    list_content_mocker.assert_called_once_with('s3://bucket/model/')
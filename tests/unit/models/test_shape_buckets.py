@@ -0,0 +1,89 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import numpy as np
+import pytest
+
+from ie_serving.models.shape_management.shape_buckets import ShapeBuckets
+
+
+class MockedIOInfo:
+    def __init__(self, shape):
+        self.shape = shape
+
+
+NET_INPUTS = {'input': MockedIOInfo([1, 3, 10, 10])}
+
+
+def test_shape_buckets_disabled():
+    shape_buckets = ShapeBuckets(None, NET_INPUTS)
+    assert not shape_buckets.enabled
+
+
+def test_shape_buckets_sorted():
+    shape_buckets = ShapeBuckets([[1, 3, 64, 64], [1, 3, 32, 32]],
+                                 NET_INPUTS)
+    assert shape_buckets.buckets == [{'input': (1, 3, 32, 32)},
+                                     {'input': (1, 3, 64, 64)}]
+
+
+def test_noname_bucket_multiple_inputs():
+    net_inputs = {'input1': MockedIOInfo([1, 1]),
+                  'input2': MockedIOInfo([1, 1])}
+    with pytest.raises(Exception):
+        ShapeBuckets([[1, 2]], net_inputs)
+
+
+def test_bucket_unknown_input():
+    with pytest.raises(Exception):
+        ShapeBuckets([{'wrong': [1, 3, 32, 32]}], NET_INPUTS)
+
+
+@pytest.mark.parametrize("input_shape, expected_bucket", [
+    ((1, 3, 20, 20), (1, 3, 32, 32)),
+    ((1, 3, 32, 32), (1, 3, 32, 32)),
+    ((1, 3, 20, 40), (1, 3, 64, 64)),
+    ((1, 3, 65, 10), None),
+    ((1, 3, 10), None),
+])
+def test_find_bucket(input_shape, expected_bucket):
+    shape_buckets = ShapeBuckets([[1, 3, 32, 32], [1, 3, 64, 64]],
+                                 NET_INPUTS)
+    bucket = shape_buckets.find_bucket({'input': np.ones(input_shape)})
+    if expected_bucket is None:
+        assert bucket is None
+    else:
+        assert bucket['input'] == expected_bucket
+
+
+def test_pad_inputs():
+    padded = ShapeBuckets.pad_inputs({'input': np.ones((1, 2, 3))},
+                                     {'input': (1, 4, 4)})
+    assert padded['input'].shape == (1, 4, 4)
+    assert padded['input'].sum() == 6
+
+
+@pytest.mark.parametrize("output_shape, expected_shape", [
+    ((1, 5, 32, 32), (1, 5, 20, 24)),
+    ((1, 5, 16, 16), (1, 5, 10, 12)),
+    ((1, 5, 64, 64), (1, 5, 40, 48)),
+    ((1, 5, 30, 30), (1, 5, 30, 30)),
+    ((1, 100), (1, 100)),
+])
+def test_crop_outputs(output_shape, expected_shape):
+    cropped = ShapeBuckets.crop_outputs({'output': np.ones(output_shape)},
+                                        shape=(1, 3, 20, 24),
+                                        bucket_shape=(1, 3, 32, 32))
+    assert cropped['output'].shape == expected_shape
@@ -0,0 +1,58 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import threading
+
+from ie_serving.models.storage_clients import StorageClientsPool
+
+
+def test_get_shared_client():
+    pool = StorageClientsPool()
+    created_clients = []
+
+    def factory():
+        created_clients.append(object())
+        return created_clients[-1]
+
+    client = pool.get(('s3', None, False), factory)
+    assert pool.get(('s3', None, False), factory) is client
+    assert pool.get(('s3', None, True), factory) is not client
+    assert len(created_clients) == 2
+
+
+def test_get_per_thread_client():
+    pool = StorageClientsPool()
+    clients = []
+
+    def get_client():
+        clients.append(pool.get('gs', object, per_thread=True))
+        clients.append(pool.get('gs', object, per_thread=True))
+
+    get_client()
+    thread = threading.Thread(target=get_client)
+    thread.start()
+    thread.join()
+    assert clients[0] is clients[1]
+    assert clients[2] is clients[3]
+    assert clients[0] is not clients[2]
+
+
+def test_anonymous_decision():
+    pool = StorageClientsPool()
+    assert not pool.is_anonymous('gs')
+    pool.set_anonymous('gs')
+    assert pool.is_anonymous('gs')
+    pool.clear()
+    assert not pool.is_anonymous('gs')
@@ -0,0 +1,159 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import threading
+import time
+
+import pytest
+
+from ie_serving.models.update_scheduler import UpdateScheduler
+
+
+class FakeModel:
+    def __init__(self, result=True, delay=0):
+        self.result = result
+        self.delay = delay
+        self.updates_count = 0
+        self.listings_count = 0
+        self.listing_duration = 0.01
+        self.listing_api_calls = 1
+        self.updated = threading.Event()
+        self.idle_sweeps_count = 0
+
+    def update(self, list_versions=True):
+        time.sleep(self.delay)
+        self.updates_count += 1
+        self.listings_count += list_versions
+        self.updated.set()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+    def unload_idle_engines(self):
+        self.idle_sweeps_count += 1
+
+
+def wait_for_update(scheduler, model_name):
+    state = scheduler.states[model_name]
+    while state.in_progress:
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize("failures, expected_delay", [
+    (0, 2), (1, 4), (3, 10), (10, 10),
+])
+def test_get_delay_backoff(failures, expected_delay):
+    scheduler = UpdateScheduler(max_workers=1, default_interval=2,
+                                max_backoff=10)
+    assert scheduler.get_delay(2, failures) == expected_delay
+
+
+def test_get_delay_jitter():
+    scheduler = UpdateScheduler(max_workers=1, default_interval=10,
+                                jitter=0.1)
+    for _ in range(20):
+        assert 9 <= scheduler.get_delay(10) <= 11
+
+
+def test_schedule_updates_per_model_interval():
+    scheduler = UpdateScheduler(max_workers=2, default_interval=0.01)
+    scheduler.set_interval('disabled', 0)
+    scheduler.set_interval('rare', 3600)
+    models = {'default': FakeModel(), 'disabled': FakeModel(),
+              'rare': FakeModel()}
+    scheduler.schedule_updates(models)
+    time.sleep(0.02)
+    scheduler.schedule_updates(models)
+    assert models['default'].updated.wait(5)
+    wait_for_update(scheduler, 'default')
+    assert models['disabled'].updates_count == 0
+    assert models['rare'].updates_count == 0
+    assert 'disabled' not in scheduler.states
+    stats = scheduler.get_stats()
+    assert stats['default']['updates_count'] == 1
+    assert stats['default']['last_listing_duration_ms'] == 10
+    assert stats['rare']['updates_count'] == 0
+
+
+def test_schedule_updates_in_parallel():
+    scheduler = UpdateScheduler(max_workers=2, default_interval=0.01)
+    models = {'slow': FakeModel(delay=0.5), 'fast': FakeModel()}
+    scheduler.schedule_updates(models)
+    time.sleep(0.02)
+    scheduler.schedule_updates(models)
+    assert models['fast'].updated.wait(0.3)
+    assert models['slow'].updates_count == 0
+    scheduler.schedule_updates(models)
+    assert scheduler.states['slow'].in_progress
+
+
+@pytest.mark.parametrize("result", [False, Exception("test")])
+def test_schedule_updates_failure_backoff(result):
+    scheduler = UpdateScheduler(max_workers=1, default_interval=0.01,
+                                max_backoff=60)
+    models = {'test': FakeModel(result=result)}
+    scheduler.schedule_updates(models)
+    time.sleep(0.02)
+    scheduler.schedule_updates(models)
+    assert models['test'].updated.wait(5)
+    wait_for_update(scheduler, 'test')
+    state = scheduler.states['test']
+    assert state.failures == 1
+    assert state.next_update - state.last_update_time == \
+        pytest.approx(0.02)
+
+
+def run_update(scheduler, models, model_name):
+    models[model_name].updated.clear()
+    scheduler.states[model_name].next_update = 0
+    scheduler.schedule_updates(models)
+    assert models[model_name].updated.wait(5)
+    wait_for_update(scheduler, model_name)
+
+
+def test_schedule_updates_watched_model():
+    scheduler = UpdateScheduler(max_workers=1, default_interval=0.01,
+                                rescan_interval=3600)
+    scheduler.set_watched('test')
+    models = {'test': FakeModel()}
+    scheduler.schedule_updates(models)
+    run_update(scheduler, models, 'test')
+    assert models['test'].listings_count == 0
+
+    scheduler.request_update('test')
+    assert scheduler.states['test'].changed
+    run_update(scheduler, models, 'test')
+    assert models['test'].listings_count == 1
+    assert scheduler.get_stats()['test']['listings_count'] == 1
+
+    scheduler.states['test'].last_listing_time -= 3600
+    run_update(scheduler, models, 'test')
+    assert models['test'].listings_count == 2
+    run_update(scheduler, models, 'test')
+    assert models['test'].listings_count == 2
+
+
+def test_unload_idle_engines_updates_disabled():
+    scheduler = UpdateScheduler(max_workers=1, default_interval=0)
+    models = {'test': FakeModel()}
+    scheduler.schedule_updates(models)
+    scheduler.unload_idle_engines(models)
+    scheduler.unload_idle_engines(models)
+    assert models['test'].updates_count == 0
+    assert models['test'].idle_sweeps_count == 1
+
+    scheduler.last_idle_sweep = 0.0
+    scheduler.unload_idle_engines(models)
+    assert models['test'].idle_sweeps_count == 2
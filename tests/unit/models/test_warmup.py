@@ -0,0 +1,113 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import numpy as np
+import pytest
+
+from ie_serving.models.warmup import WarmupInfo, generate_inputs, \
+    get_warmup_inputs, load_inputs, run_warmup
+
+
+class FakeInputInfo:
+    def __init__(self, shape, precision='FP32'):
+        self.shape = shape
+        self.precision = precision
+
+
+class FakeNetwork:
+    def __init__(self, inputs):
+        self.inputs = inputs
+
+
+class FakeInferRequest:
+    def __init__(self):
+        self.inputs = []
+
+    def async_infer(self, inputs):
+        self.inputs.append(inputs)
+
+    def wait(self, timeout):
+        return 0
+
+
+class FakeExecNet:
+    def __init__(self, num_ireq):
+        self.requests = [FakeInferRequest() for _ in range(num_ireq)]
+
+
+@pytest.mark.parametrize("warmup_param, enabled, data, iterations", [
+    (None, False, 'zeros', 1),
+    ({}, True, 'zeros', 1),
+    ({'data': 'random', 'iterations': 3}, True, 'random', 3),
+    ({'data': 'file'}, True, 'file', 1),
+])
+def test_warmup_info(warmup_param, enabled, data, iterations):
+    warmup_info = WarmupInfo(warmup_param)
+    assert warmup_info.enabled == enabled
+    assert warmup_info.data == data
+    assert warmup_info.iterations == iterations
+
+
+def test_generate_inputs():
+    net = FakeNetwork({'input': FakeInputInfo([1, 3, 4, 4], 'U8')})
+    inputs = generate_inputs(net, 'zeros')
+    assert inputs['input'].shape == (1, 3, 4, 4)
+    assert inputs['input'].dtype == np.uint8
+    assert not inputs['input'].any()
+    inputs = generate_inputs(net, 'random')
+    assert inputs['input'].shape == (1, 3, 4, 4)
+    assert inputs['input'].dtype == np.uint8
+    assert inputs['input'].any()
+
+
+@pytest.mark.parametrize("precision, dtype", [
+    ('I32', np.int32), ('I8', np.int8), ('U16', np.uint16),
+    ('FP16', np.float16)])
+def test_generate_random_inputs(precision, dtype):
+    net = FakeNetwork({'input': FakeInputInfo([16, 16], precision)})
+    inputs = generate_inputs(net, 'random')
+    assert inputs['input'].dtype == dtype
+    assert len(np.unique(inputs['input'])) > 1
+
+
+def test_get_warmup_inputs_from_file(tmpdir):
+    warmup_file = str(tmpdir.join('warmup_data.npz'))
+    np.savez(warmup_file, input=np.ones((1, 3), dtype=np.float32))
+    recorded_inputs = load_inputs(warmup_file)
+    net = FakeNetwork({'input': FakeInputInfo([1, 3])})
+    inputs = get_warmup_inputs('test', 1, net, WarmupInfo({'data': 'file'}),
+                               recorded_inputs)
+    assert (inputs['input'] == 1).all()
+
+
+@pytest.mark.parametrize("recorded_inputs", [
+    None,
+    {'input': np.ones((2, 3), dtype=np.float32)},
+    {'other_input': np.ones((1, 3), dtype=np.float32)},
+])
+def test_get_warmup_inputs_file_mismatch(recorded_inputs):
+    net = FakeNetwork({'input': FakeInputInfo([1, 3])})
+    inputs = get_warmup_inputs('test', 1, net, WarmupInfo({'data': 'file'}),
+                               recorded_inputs)
+    assert inputs['input'].shape == (1, 3)
+    assert not inputs['input'].any()
+
+
+def test_run_warmup():
+    exec_net = FakeExecNet(2)
+    duration = run_warmup('test', 1, exec_net, 2, {'input': None}, 3)
+    assert len(exec_net.requests[0].inputs) == 3
+    assert len(exec_net.requests[1].inputs) == 3
+    assert duration >= 0
@@ -0,0 +1,40 @@
+#
+# Copyright (c) 2019 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import json
+
+from ie_serving.models.artifact_cache import artifact_cache
+from ie_serving.models.ranged_download import ranged_downloader
+
+
+def test_get_downloads_status(client, mocker):
+    mocker.patch.object(artifact_cache, 'hits', 3)
+    mocker.patch.object(artifact_cache, 'misses', 1)
+    response = client.simulate_request(method='GET', path='/v1/downloads')
+    assert response.status_code == 200
+    stats = json.loads(response.text)
+    assert stats['artifact_cache']['hits'] == 3
+    assert stats['artifact_cache']['misses'] == 1
+
+
+def test_get_downloads_status_ranged_downloads(client, mocker):
+    mocker.patch.object(ranged_downloader, 'files_count', 2)
+    mocker.patch.object(ranged_downloader, 'bytes_count', 4 * 1024 ** 2)
+    mocker.patch.object(ranged_downloader, 'download_time', 2.0)
+    response = client.simulate_request(method='GET', path='/v1/downloads')
+    assert response.status_code == 200
+    stats = json.loads(response.text)
+    assert stats['ranged_downloads']['files_count'] == 2
+    assert stats['ranged_downloads']['throughput_mbps'] == 2.0
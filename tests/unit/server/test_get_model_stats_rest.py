@@ -0,0 +1,69 @@
+#
+# Copyright (c) 2019 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import json
+
+import pytest
+from falcon import testing
+
+from ie_serving.models.loading_model import LoadingModel
+from ie_serving.models.requests_queue import RequestsQueue
+from ie_serving.server.request import Request
+from ie_serving.server.rest_service import create_rest_api
+
+
+def test_get_model_stats(client):
+    response = client.simulate_request(method='GET',
+                                       path='/v1/models/test/stats')
+    assert response.status_code == 200
+    stats = json.loads(response.text)
+    assert stats['model_name'] == 'test'
+    assert [version_stats['version'] for version_stats in
+            stats['versions']] == [1, 2, 3]
+    assert stats['versions'][0]['requests_queue'] == [
+        {'depth': 0, 'dequeued': 0, 'avg_wait_ms': 0.0, 'max_wait_ms': 0.0}]
+
+
+def test_get_model_stats_queued_request(get_fake_model):
+    engine = get_fake_model.engines[2]
+    engine.stop_inference_service()
+    engine.requests_queue = RequestsQueue()
+    engine.requests_queue.put(Request({}))
+    client = testing.TestClient(create_rest_api(
+        models={"test": get_fake_model}))
+    response = client.simulate_request(
+        method='GET', path='/v1/models/test/versions/2/stats')
+    assert response.status_code == 200
+    stats = json.loads(response.text)
+    assert len(stats['versions']) == 1
+    assert stats['versions'][0]['version'] == 2
+    assert stats['versions'][0]['requests_queue'][0]['depth'] == 1
+
+
+@pytest.mark.parametrize("path", ['/v1/models/fake_model/stats',
+                                  '/v1/models/test/versions/5/stats',
+                                  '/v1/models/test/versions/x/stats'])
+def test_get_model_stats_wrong_model_spec(client, path):
+    response = client.simulate_request(method='GET', path=path)
+    assert response.status_code == 404
+
+
+def test_get_model_stats_loading_model():
+    client = testing.TestClient(create_rest_api(
+        models={"test": LoadingModel("test")}))
+    response = client.simulate_request(method='GET',
+                                       path='/v1/models/test/stats')
+    assert response.status_code == 200
+    assert json.loads(response.text)['versions'] == []
@@ -13,6 +13,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+from falcon import testing
+
+from ie_serving.models.loading_model import LoadingModel
+from ie_serving.server.rest_service import create_rest_api
 
 
 def test_get_model_status_successful(client):
@@ -49,3 +53,29 @@ def test_get_model_status_wrong_version(client):
                                            "Content-Type":
                                                "application/json"})
     assert response.status_code == 404
+
+
+def test_get_model_status_loading_model():
+    client = testing.TestClient(create_rest_api(
+        models={"test": LoadingModel("test")}))
+    response = client.simulate_request(method='GET',
+                                       path='/v1/models/test')
+    assert response.status_code == 200
+    assert response.json['model_version_status'][0]['state'] == 'LOADING'
+
+
+def test_get_model_readiness(get_fake_model):
+    get_fake_model.versions_statuses[1].set_available()
+    client = testing.TestClient(create_rest_api(
+        models={"test": get_fake_model, "loading": LoadingModel("loading")}))
+    response = client.simulate_request(method='GET',
+                                       path='/v1/models/test/ready')
+    assert response.status_code == 200
+    assert response.json == {'ready': True}
+    response = client.simulate_request(method='GET',
+                                       path='/v1/models/loading/ready')
+    assert response.status_code == 503
+    assert response.json == {'ready': False}
+    response = client.simulate_request(method='GET',
+                                       path='/v1/models/fake_model/ready')
+    assert response.status_code == 404
@@ -0,0 +1,46 @@
+#
+# Copyright (c) 2020 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import time
+
+from ie_serving.server.constants import DEADLINE_EXCEEDED, \
+    REQUEST_CANCELLED
+from ie_serving.server.request import Request
+
+
+def test_request_is_expired():
+    assert not Request({}).is_expired()
+    assert not Request({}, deadline=time.time() + 60).is_expired()
+    assert Request({}, deadline=time.time() - 1).is_expired()
+
+
+def test_wait_for_result_timeout():
+    released = []
+    request = Request({})
+    request.release_ireq = released.append
+    assert request.wait_for_result(timeout=0.01) == (DEADLINE_EXCEEDED, None)
+    assert request.is_expired()
+
+    request.set_result(ireq_index=1, result={'output': None})
+    assert request.result == DEADLINE_EXCEEDED
+    assert released == [1]
+
+
+def test_cancel_after_result():
+    request = Request({})
+    request.set_result(ireq_index=0, result={})
+    request.cancel(REQUEST_CANCELLED)
+    assert request.wait_for_result() == ({}, 0)
+    assert not request.cancelled
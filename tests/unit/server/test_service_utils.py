@@ -14,6 +14,7 @@
 # limitations under the License.
 #
 
+from ie_serving.models.routing_table import RoutingTable
 from ie_serving.server import service_utils
 import pytest
 
@@ -40,8 +41,7 @@ def test_check_availability_of_requested_model(mocker, requested_model,
     available_models = {"resnet": None, 'inception': None, 'Xception': None}
     for x in models:
         model_mocker = mocker.patch('ie_serving.models.model.Model')
-        model_mocker.versions = x['versions']
-        model_mocker.default_version = x['default_version']
+        model_mocker.routing_table = RoutingTable(x['versions'], {})
         available_models[x['name']] = model_mocker
 
     validation, version = service_utils.check_availability_of_requested_model(
@@ -49,3 +49,16 @@ def test_check_availability_of_requested_model(mocker, requested_model,
         requested_version=requested_ver)
     assert expected_validation == validation
     assert expected_ver == version
+
+
+@pytest.mark.parametrize("priority, expected_priority",
+                         [('1', 1), ('0', 0), (None, 0), ('high', 0)])
+def test_get_request_priority(priority, expected_priority):
+    assert service_utils.get_request_priority(priority) == expected_priority
+
+
+@pytest.mark.parametrize("timeout_ms, expected_timeout",
+                         [('1500', 1.5), ('-1', 0), (None, None),
+                          ('soon', None)])
+def test_get_request_timeout(timeout_ms, expected_timeout):
+    assert service_utils.get_request_timeout(timeout_ms) == expected_timeout
@@ -25,7 +25,11 @@ from config import PARSE_CONFIG_TEST_CASES
 class MockedArgs:
     def __init__(self, model_name, model_path, batch_size, shape,
                  model_version_policy, port, rest_port, grpc_workers,
-                 rest_workers, nireq, target_device, plugin_config):
+                 rest_workers, nireq, target_device, plugin_config,
+                 dynamic_batching=None, shape_buckets=None,
+                 batch_size_pool=None, batch_sharding=None,
+                 admission_control=None, autotune=None, lazy_loading=None,
+                 warmup=None):
         self.model_name = model_name
         self.model_path = model_path
         self.batch_size = batch_size
@@ -38,6 +42,14 @@ class MockedArgs:
         self.nireq = nireq
         self.target_device = target_device
         self.plugin_config = plugin_config
+        self.dynamic_batching = dynamic_batching
+        self.shape_buckets = shape_buckets
+        self.batch_size_pool = batch_size_pool
+        self.batch_sharding = batch_sharding
+        self.admission_control = admission_control
+        self.autotune = autotune
+        self.lazy_loading = lazy_loading
+        self.warmup = warmup
 
 
 class MockedArgsConfig:
@@ -125,7 +137,7 @@ def test_parse_config(mocker, should_fail, config):
         'ie_serving.main.open_config')
     open_config_mocker.return_value = config
     start_server_mocker = mocker.patch('ie_serving.main.start_server')
-    builder_mocker = mocker.patch('ie_serving.main.ModelBuilder.build')
+    load_models_mocker = mocker.patch('ie_serving.main.load_models')
 
     if should_fail:
         with pytest.raises(main.ValidationError):
@@ -133,7 +145,31 @@ def test_parse_config(mocker, should_fail, config):
     else:
         main.parse_config(arguments)
         assert start_server_mocker.called
-        assert builder_mocker.called
+        load_models_mocker.assert_called_once()
+        models = start_server_mocker.call_args[1]['models']
+        for model in models.values():
+            assert not model.is_ready()
+
+
+def test_load_models(mocker):
+    model_configs = [
+        {'config': {'name': 'cold', 'base_path': 'cold', 'load_priority': 1}},
+        {'config': {'name': 'hot', 'base_path': 'hot'}},
+        {'config': {'name': 'failing', 'base_path': 'failing'}}]
+    models = {config['config']['name']: main.LoadingModel(
+        config['config']['name']) for config in model_configs}
+    built_models = []
+
+    def build(**model_spec):
+        built_models.append(model_spec['model_name'])
+        if model_spec['model_name'] == 'failing':
+            return None
+        return model_spec['model_name']
+
+    mocker.patch('ie_serving.main.ModelBuilder.build', side_effect=build)
+    main.load_models(models, model_configs)
+    assert built_models[-1] == 'cold'
+    assert models == {'cold': 'cold', 'hot': 'hot'}
 
 
 @pytest.mark.parametrize("args, should_fail", [